@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# Benchmarks for the mount engine against bench/fake_rclone.py.
+#
+#   python bench/bench.py [--sizes 1,10,100,1000] [--engines rcd,process]
+#                         [--delay 0.05] [--fail-every 0] [--output FILE]
+#
+# Prints one JSON document: {"meta": {...}, "results": [{bench, n, ...}]}
+# so runs can be diffed or loaded into a notebook.
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def setup_fake(workdir, delay, fail):
+    bindir = os.path.join(workdir, "bin")
+    os.makedirs(bindir)
+    shim = os.path.join(bindir, "rclone")
+    with open(shim, "w") as f:
+        f.write(f"#!/bin/sh\nexec {sys.executable} {os.path.join(HERE, 'fake_rclone.py')} \"$@\"\n")
+    os.chmod(shim, 0o755)
+    os.environ["PATH"] = bindir + os.pathsep + os.environ["PATH"]
+    os.environ["CATMOUNT_MOUNTINFO"] = os.path.join(workdir, "mountinfo")
+    os.environ["CATMOUNT_MOUNT_ROOT"] = os.path.join(workdir, "mnt")
+    # shutdown() wipes the cache root; keep it away from a running instance's
+    os.environ["CATMOUNT_CACHE_ROOT"] = os.path.join(workdir, "cache")
+    os.environ["FAKE_RCLONE_MOUNT_DELAY"] = str(delay)
+    os.environ["FAKE_RCLONE_FAIL"] = ",".join(fail)
+    open(os.environ["CATMOUNT_MOUNTINFO"], "w").close()
+
+
+def make_config(n):
+    from catmount import RamConfig
+    config = RamConfig()
+    for i in range(n):
+        config.add_remote(f"r{i}", "s3", provider="AWS", region="eu-west-1", bucket=f"bucket{i}")
+    return config
+
+
+def bench_config(n):
+    from catmount import RamConfig
+    config = RamConfig()
+    t0 = time.perf_counter()
+    for i in range(n):
+        config.add_remote(f"r{i}", "s3", provider="AWS", region="eu-west-1", bucket=f"bucket{i}")
+    t1 = time.perf_counter()
+    text = config.get()
+    t2 = time.perf_counter()
+    config.get()
+    t3 = time.perf_counter()
+    for i in range(n):
+        f"r{i}" in config
+    t4 = time.perf_counter()
+    return {"bench": "config", "n": n, "add_s": t1 - t0, "serialize_cold_s": t2 - t1,
+            "serialize_cached_s": t3 - t2, "lookup_s": t4 - t3, "bytes": len(text)}
+
+
+def bench_mounts(n, engine, workers):
+    from catmount import MountScheduler, RcloneBackend
+    backend = RcloneBackend(make_config(n), engine=engine)
+    names = [f"r{i}" for i in range(n)]
+    t0 = time.perf_counter()
+    try:
+        backend.mount_now(names[0])
+        first_ok = True
+    except Exception:
+        first_ok = False
+    t1 = time.perf_counter()
+    results = MountScheduler(backend, workers=workers, deadline=600).run_now(
+        [(name, i) for i, name in enumerate(names[1:])])
+    t2 = time.perf_counter()
+    report = backend.shutdown()
+    t3 = time.perf_counter()
+    ok = sum(1 for r in results if r.ok) + first_ok
+    return {"bench": "mount", "n": n, "engine": engine,
+            "mount_first_s": t1 - t0, "mount_all_s": t2 - t1, "unmount_all_s": t3 - t2,
+            "mounted": ok, "failed": n - ok, "killed": report.killed,
+            "latency_max_s": max(backend.latency.values(), default=0.0)}
+
+
+def bench_ui(n, updates=10):
+    """Rows through the real frontend: worker threads post, UiDispatcher coalesces, flush_visible paints"""
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+    except Exception as e:
+        return {"bench": "ui", "n": n, "skipped": str(e)}
+    import threading
+    import mounterhdrv0
+    app = mounterhdrv0.CatsCloudMounter()
+    app.root.withdraw()
+    frames, apply = [], app.ui.apply
+
+    def counted(batch):
+        frames.append(len(batch))
+        apply(batch)
+    app.ui.apply = counted
+    t0 = time.perf_counter()
+    for i in range(n):
+        mounterhdrv0.config.add_remote(f"r{i}", "s3", provider="AWS", bucket=f"bucket{i}")
+        app.add_row(f"r{i}")
+    app.root.update()
+    t1 = time.perf_counter()
+
+    def post():
+        for k in range(updates):
+            for i in range(n):
+                app.ui.post(f"r{i}", status=f"Mounted /mnt/r{i} • {k} MB/s")
+    worker = threading.Thread(target=post)
+    worker.start()
+    worker.join()
+    t2 = time.perf_counter()
+    last = f"Mounted /mnt/r{n - 1} • {updates - 1} MB/s"
+    while app.rows.get(f"r{n - 1}") != last:
+        app.root.update()
+    app.root.update_idletasks()
+    t3 = time.perf_counter()
+    for part in (app.supervisor, app.tuner, app.reaper, app.transfers, app.metrics, app.ui):
+        part.stop()
+    app.backend.shutdown()
+    app.root.destroy()
+    mounterhdrv0.config.clear()
+    return {"bench": "ui", "n": n, "insert_s": t1 - t0, "post_s": t2 - t1, "drain_s": t3 - t2,
+            "posted": n * updates, "frames": len(frames), "rows_per_frame_max": max(frames, default=0)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark catmount against a fake rclone")
+    parser.add_argument("--sizes", default="1,10,100,1000")
+    parser.add_argument("--engines", default="rcd,process")
+    parser.add_argument("--delay", type=float, default=0.05, help="fake mount startup delay (s)")
+    parser.add_argument("--fail-every", type=int, default=0, help="make every Nth remote fail")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--skip", default="", help="comma list of config,mount,ui to skip")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    skip = set(args.skip.split(","))
+
+    workdir = tempfile.mkdtemp(prefix="catbench-")
+    fail = [f"r{i}" for i in range(max(sizes))
+            if args.fail_every and i % args.fail_every == args.fail_every - 1]
+    setup_fake(workdir, args.delay, fail)
+    sys.path.insert(0, ROOT)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    results = []
+    try:
+        for n in sizes:
+            if "config" not in skip:
+                results.append(bench_config(n))
+            if "mount" not in skip:
+                for engine in args.engines.split(","):
+                    results.append(bench_mounts(n, engine, args.workers))
+            if "ui" not in skip:
+                results.append(bench_ui(n))
+            print(f"n={n} done", file=sys.stderr, flush=True)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    doc = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "delay": args.delay,
+                    "workers": args.workers, "fail_every": args.fail_every},
+           "results": results}
+    out = json.dumps(doc, indent=1)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(out + "\n")
+    else:
+        print(out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
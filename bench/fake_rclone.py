@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# Stub rclone for benchmarks: no FUSE, no network.
+#
+#   rclone mount REMOTE: MOUNTPOINT [--rc --rc-addr=H:P] ...
+#   rclone rcd --rc-addr=H:P ...
+#   rclone lsjson --max-depth 1 REMOTE:
+#   rclone version
+#
+# "Mounting" sleeps FAKE_RCLONE_MOUNT_DELAY seconds and then appends a
+# fuse.rclone line to the file named by CATMOUNT_MOUNTINFO, which the
+# readiness probe reads instead of /proc/self/mountinfo. Remotes listed in
+# FAKE_RCLONE_FAIL exit with code 5 (or fail mount/mount in rcd mode);
+# listing them fails the same way.
+
+import fcntl
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOUNTINFO = os.environ.get("CATMOUNT_MOUNTINFO")
+DELAY = float(os.environ.get("FAKE_RCLONE_MOUNT_DELAY", "0.05"))
+STARTUP = float(os.environ.get("FAKE_RCLONE_STARTUP", "0.02"))
+FAIL = set(filter(None, os.environ.get("FAKE_RCLONE_FAIL", "").split(",")))
+JOB_TIME = float(os.environ.get("FAKE_RCLONE_JOB_TIME", "0.5"))
+
+JSON_LOG = "--use-json-log" in sys.argv
+
+mounts = {}
+jobs = {}
+lock = threading.Lock()
+quit_event = threading.Event()
+
+
+def _edit_mountinfo(add=None, remove=None):
+    if not MOUNTINFO:
+        return
+    with open(MOUNTINFO, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        lines = [l for l in f.read().splitlines() if l]
+        if remove:
+            lines = [l for l in lines if l.split(" - ")[0].split()[4] != remove]
+        if add:
+            src, mp = add
+            lines.append(f"1 1 0:1 / {mp.replace(' ', chr(92) + '040')} rw - fuse.rclone {src} rw")
+        f.seek(0)
+        f.truncate()
+        f.write("\n".join(lines) + ("\n" if lines else ""))
+
+
+def do_mount(fs, mountpoint):
+    time.sleep(DELAY)
+    if fs.rstrip(":") in FAIL:
+        raise RuntimeError("dial tcp: i/o timeout")
+    mp = os.path.abspath(mountpoint)
+    with lock:
+        mounts[mountpoint] = fs
+    _edit_mountinfo(add=(fs, mp))
+
+
+def do_unmount(mountpoint):
+    with lock:
+        mounts.pop(mountpoint, None)
+    _edit_mountinfo(remove=os.path.abspath(mountpoint))
+
+
+def log_error(obj, msg):
+    if JSON_LOG:
+        line = json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "level": "error",
+                           "msg": msg, "object": obj, "source": "fake/fake_rclone.py"})
+    else:
+        line = f"{time.strftime('%Y/%m/%d %H:%M:%S')} ERROR : {obj}: {msg}"
+    print(line, file=sys.stderr, flush=True)
+
+
+def stats(group=None):
+    job = jobs.get(int(group.split("/")[1])) if group else None
+    if job is None and group is None:
+        # the global group: one entry per running job, like rclone's transferring list
+        running = [{"name": f"job{i}", "group": f"job/{i}", "speed": 1024 ** 2, "srcFs": j["srcFs"],
+                    "dstFs": j["dstFs"]} for i, j in list(jobs.items()) if not _finished(j)]
+        return {"speed": 1024 ** 2 * len(running), "errors": 0, "transferring": running, "bytes": 0}
+    if job is None:
+        return {"speed": 0, "errors": 0, "transferring": [], "bytes": 0}
+    done = min(1.0, (time.time() - job["start"]) / JOB_TIME)
+    return {"speed": 1024 ** 2, "errors": 0, "transferring": [], "bytes": int(done * 10 * 1024 ** 2),
+            "totalBytes": 10 * 1024 ** 2}
+
+
+def start_job(params):
+    with lock:
+        jobid = len(jobs) + 1
+        jobs[jobid] = {"start": time.time(), "stopped": False,
+                       "srcFs": params.get("srcFs", ""), "dstFs": params.get("dstFs", ""),
+                       "fail": any(str(params.get(k, "")).split(":")[0] in FAIL for k in ("srcFs", "dstFs"))}
+    return {"jobid": jobid}
+
+
+def _finished(job):
+    return job["stopped"] or time.time() - job["start"] >= JOB_TIME
+
+
+def job_status(jobid):
+    job = jobs[jobid]
+    finished = _finished(job)
+    ok = finished and not job["stopped"] and not job["fail"]
+    error = "" if ok or not finished else ("context canceled" if job["stopped"] else "directory not found")
+    return {"id": jobid, "finished": finished, "success": ok, "error": error}
+
+
+def vfs_stats():
+    return {"diskCache": {"bytesUsed": 0, "files": 0, "uploadsInProgress": 0, "uploadsQueued": 0},
+            "inUse": 0}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        method = self.path.strip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        params = json.loads(self.rfile.read(length) or b"{}")
+        try:
+            out = self.dispatch(method, params)
+            code = 200
+        except Exception as e:
+            log_error(params.get("fs", ""), str(e))
+            out, code = {"error": str(e)}, 500
+        body = json.dumps(out).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def dispatch(self, method, params):
+        if method == "mount/mount":
+            do_mount(params["fs"], params["mountPoint"])
+        elif method == "mount/unmount":
+            if params.get("mountPoint") not in mounts:
+                raise RuntimeError("mount not found")
+            do_unmount(params["mountPoint"])
+        elif method == "mount/unmountall":
+            for mp in list(mounts):
+                do_unmount(mp)
+        elif method == "mount/listmounts":
+            return {"mountPoints": [{"Fs": fs, "MountPoint": mp} for mp, fs in list(mounts.items())]}
+        elif method == "core/stats":
+            return stats(params.get("group"))
+        elif method.startswith(("sync/", "operations/copyfile", "operations/movefile")):
+            return start_job(params)
+        elif method == "operations/stat":
+            return {"item": None}
+        elif method == "job/status":
+            return job_status(params["jobid"])
+        elif method == "job/stop":
+            jobs[params["jobid"]]["stopped"] = True
+        elif method == "vfs/stats":
+            return vfs_stats()
+        elif method == "operations/list":
+            if params.get("fs", "").rstrip(":") in FAIL:
+                raise RuntimeError("dial tcp: i/o timeout")
+            return {"list": []}
+        elif method == "operations/about":
+            return {"total": 1 << 40, "used": 1 << 30, "free": (1 << 40) - (1 << 30)}
+        elif method == "core/quit":
+            quit_event.set()
+        elif method not in ("rc/noop", "config/create", "vfs/refresh", "vfs/poll-interval", "vfs/forget", "core/bwlimit"):
+            raise RuntimeError(f"couldn't find method {method!r}")
+        return {}
+
+
+def serve(args):
+    addr = next((a.split("=", 1)[1] for a in args if a.startswith("--rc-addr=")), None)
+    if addr is None:
+        return None
+    host, _, port = addr.rpartition(":")
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv):
+    if not argv or argv[0] == "version":
+        print("rclone v0.0.0-fake")
+        return 0
+    if "--config=-" in argv:
+        sys.stdin.read()
+    signal.signal(signal.SIGTERM, lambda *_: quit_event.set())
+    time.sleep(STARTUP)
+    cmd, args = argv[0], argv[1:]
+    if cmd == "rcd":
+        serve(args)
+        quit_event.wait()
+        for mp in list(mounts):
+            do_unmount(mp)
+        return 0
+    if cmd == "mount":
+        fs, mountpoint = args[0], args[1]
+        if "--rc" in args:
+            serve(args)
+        try:
+            do_mount(fs, mountpoint)
+        except RuntimeError as e:
+            log_error(fs, str(e))
+            return 5
+        quit_event.wait()
+        do_unmount(mountpoint)
+        return 0
+    if cmd == "lsjson":
+        fs = next(a for a in args if a.endswith(":"))
+        if fs.rstrip(":") in FAIL:
+            print("ERROR : : error listing: dial tcp: i/o timeout", file=sys.stderr)
+            return 5
+        print("[]")
+        return 0
+    print(f"fake rclone: unsupported command {cmd}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
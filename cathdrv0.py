@@ -2,85 +2,17 @@
 # Full rclone automation backend | RAM-only config | Zero traces
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, simpledialog
 import subprocess
 import threading
 import os
 import sys
 import shutil
-import string
-
-# ------------------- RCLONE BACKEND -------------------
-class RcloneBackend:
-    def __init__(self):
-        self.config = ""
-        self.mounts = {}
-        self.letters = iter(string.ascii_uppercase[25::-1])
-    
-    def add_remote(self, name, rtype, **kwargs):
-        block = f"[{name}]\ntype = {rtype}\n"
-        for k, v in kwargs.items():
-            block += f"{k} = {v}\n"
-        self.config += "\n" + block
-        return name
-    
-    def mount(self, name, callback=None):
-        letter = next(self.letters) + ":"
-        def do_mount():
-            try:
-                flags = ["rclone", "mount", f"{name}:", letter,
-                         "--config=-", "--vfs-cache-mode", "full",
-                         "--dir-cache-time", "5m", "--poll-interval", "30s"]
-                if os.name == "nt":
-                    proc = subprocess.Popen(flags, stdin=subprocess.PIPE,
-                                            creationflags=subprocess.CREATE_NO_WINDOW)
-                else:
-                    proc = subprocess.Popen(flags, stdin=subprocess.PIPE)
-                proc.stdin.write(self.config.encode())
-                proc.stdin.close()
-                self.mounts[name] = (letter, proc)
-                if callback:
-                    callback(name, letter, True)
-            except Exception as e:
-                if callback:
-                    callback(name, None, False, str(e))
-        threading.Thread(target=do_mount, daemon=True).start()
-    
-    def unmount(self, name):
-        if name in self.mounts:
-            letter, proc = self.mounts[name]
-            if proc.poll() is None:
-                if os.name == "nt":
-                    subprocess.call(["taskkill", "/F", "/PID", str(proc.pid)],
-                                    creationflags=subprocess.CREATE_NO_WINDOW)
-                else:
-                    proc.terminate()
-            del self.mounts[name]
-    
-    def unmount_all(self):
-        for name in list(self.mounts.keys()):
-            self.unmount(name)
-    
-    def auth_interactive(self, name, rtype):
-        """Run rclone config for OAuth-based services"""
-        try:
-            if os.name == "nt":
-                subprocess.run(["rclone", "config", "create", name, rtype],
-                               creationflags=subprocess.CREATE_NEW_CONSOLE)
-            else:
-                subprocess.run(["rclone", "config", "create", name, rtype])
-            cfg_path = os.path.expanduser("~/.config/rclone/rclone.conf")
-            if os.name == "nt":
-                cfg_path = os.path.join(os.environ.get("APPDATA", ""), "rclone", "rclone.conf")
-            if os.path.exists(cfg_path):
-                with open(cfg_path, "r") as f:
-                    self.config = f.read()
-                return True
-        except:
-            pass
-        return False
-
-rclone = RcloneBackend()
+
+from catmount import PROFILE_NAMES, MountScheduler, IdleReaper, MountSupervisor, PollTuner, Prober, RcloneBackend, UiDispatcher, backend_handlers, claim, start_metrics
+from catmount.aggregate import ACTION_POLICIES, CREATE_POLICIES, KINDS, SEARCH_POLICIES, aggregate
+from catmount.metrics import summary
+from catmount.profiles import format_size
 
 # ------------------- SERVICE DATA -------------------
 ICONS = {
@@ -113,9 +45,30 @@ ICON_COLORS = {
     "FTP": "#0078D4"
 }
 
+MOUNT_PROFILES = {
+    "Google Drive": "auto",
+    "Dropbox": "small-files",
+    "OneDrive": "auto",
+    "Box": "small-files",
+    "Amazon S3": "bulk-archive",
+    "WebDAV": "default",
+    "FTP": "bulk-archive"
+}
+
+BANDWIDTH_PRESETS = {
+    "Unlimited": "off",
+    "1 MB/s": "1M",
+    "5 MB/s": "5M",
+    "10 MB/s": "10M",
+    "50 MB/s": "50M"
+}
+
+# service -> (comma-separated dirs to pre-warm after mounting, depth; 0 = whole tree)
+PREWARM = {}
+
 # ------------------- MAIN APP -------------------
 class CatCloudmounter:
-    def __init__(self):
+    def __init__(self, instance=None):
         self.root = tk.Tk()
         self.root.title("Cat' Cloudmounter 0.1")
         self.root.geometry("400x380")
@@ -123,12 +76,28 @@ class CatCloudmounter:
         self.root.resizable(False, False)
         
         self.services = {}
+        self.remotes = {}
         self.check_vars = {}
         self.selected = None
+        self.mounted_count = 0
+        self.rclone = RcloneBackend()
         
         self.build_ui()
+        self.ui = UiDispatcher(self.root, self.apply_updates).start()
+        self.rclone.on_log = self.on_log
+        self.rclone.prewarmer.on_progress = self.on_prewarm
         self.root.protocol("WM_DELETE_WINDOW", self.exit_clean)
         self.root.after(100, self.check_rclone)
+        self.supervisor = MountSupervisor(self.rclone, on_state=self.on_mount_state).start()
+        self.tuner = PollTuner(self.rclone).start()
+        self.metrics = start_metrics(self.rclone, on_update=lambda m: self.ui.call(self.show_metrics, m))
+        self.reaper = IdleReaper(self.rclone, self.metrics, on_state=self.on_mount_state).start()
+        self.prober = Prober(self.rclone)
+        self.instance = instance
+        if instance is not None:
+            self.ipc = backend_handlers(self.rclone)
+            instance.serve(dict(self.ipc, show=self.remote_show, mount=self.remote_mount,
+                                unmount=self.remote_unmount))
 
     def build_ui(self):
         # Blue border frame
@@ -152,12 +121,26 @@ class CatCloudmounter:
         edit_menu = tk.Menu(menubar, tearoff=0)
         edit_menu.add_command(label="Configure Selected", command=self.configure_selected)
         edit_menu.add_command(label="Remove Selected", command=self.remove_selected)
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Combine Services...", command=self.combine_services)
         menubar.add_cascade(label="Edit", menu=edit_menu)
         
         view_menu = tk.Menu(menubar, tearoff=0)
         view_menu.add_command(label="Refresh", command=self.refresh_status)
+        view_menu.add_command(label="Log of Selected", command=self.show_log)
         menubar.add_cascade(label="View", menu=view_menu)
         
+        bw_menu = tk.Menu(menubar, tearoff=0)
+        self.bw_var = tk.StringVar(value="off")
+        for label, rate in BANDWIDTH_PRESETS.items():
+            bw_menu.add_radiobutton(label=label, variable=self.bw_var, value=rate,
+                                    command=lambda r=rate: self.set_bandwidth(bwlimit=r))
+        bw_menu.add_separator()
+        bw_menu.add_command(label="Schedule...", command=self.bandwidth_schedule)
+        bw_menu.add_command(label="Transfer Slots...", command=self.transfer_slots)
+        bw_menu.add_command(label="API Rate Limits...", command=self.api_rate_limits)
+        menubar.add_cascade(label="Bandwidth", menu=bw_menu)
+        
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Install rclone", command=self.install_rclone)
         tools_menu.add_command(label="Open rclone config", command=self.open_rclone_config)
@@ -209,7 +192,13 @@ class CatCloudmounter:
                             command=lambda n=name: self.toggle_service(n))
         chk.pack(side="right", padx=10)
         
-        self.services[name] = {"row": row, "mounted": False, "letter": None}
+        probe_lbl = tk.Label(row, text="", fg="#888888", bg="#1a1a1a", font=("Segoe UI", 9))
+        probe_lbl.pack(side="right")
+        
+        self.services[name] = {"row": row, "mounted": False, "letter": None, "probe": probe_lbl}
+        self.remotes[name.lower().replace(" ", "")] = name
+        self.rclone.set_profile(name.lower().replace(" ", ""), MOUNT_PROFILES.get(name, "default"))
+        self.rclone.set_prewarm(name.lower().replace(" ", ""), *PREWARM.get(name, ("", 0)))
         
         for widget in [row, icon_lbl, name_lbl]:
             widget.bind("<Button-1>", lambda e, n=name: self.select_service(n))
@@ -231,6 +220,11 @@ class CatCloudmounter:
                 child.configure(bg="#333333")
             except:
                 pass
+        
+        # parked by the idle reaper: opening it from the list brings it back
+        if name.lower().replace(" ", "") in self.rclone.idle:
+            self.update_status(f"Remounting {name}...")
+            self.mount_service(name)
 
     def toggle_service(self, name):
         if self.check_vars[name].get():
@@ -246,40 +240,195 @@ class CatCloudmounter:
         remote_name = name.lower().replace(" ", "")
         
         def on_mount(n, letter, success, error=None):
-            def update():
-                if success:
-                    self.services[name]["mounted"] = True
-                    self.services[name]["letter"] = letter
-                    self.update_status(f"{name} mounted on {letter}")
-                else:
-                    self.check_vars[name].set(False)
-                    messagebox.showerror("Mount Failed", error or "Unknown error")
-            self.root.after(0, update)
+            if success:
+                self.ui.post(name, mounted=True, letter=letter)
+                self.ui.post(None, message=f"{name} mounted on {letter} in {self.rclone.latency.get(n, 0):.1f}s")
+            else:
+                self.ui.post(name, checked=False)
+                self.ui.call(messagebox.showerror, "Mount Failed", error or "Unknown error")
         
-        if remote_name not in rclone.config.lower():
+        if remote_name not in self.rclone.config:
             if messagebox.askyesno("Configure", f"{name} not configured.\n\nRun rclone wizard?"):
-                rclone.auth_interactive(remote_name, rtype)
+                self.rclone.auth_interactive(remote_name, rtype)
         
-        rclone.mount(remote_name, on_mount)
+        self.supervisor.reset(remote_name)
+        self.rclone.mount(remote_name, on_mount)
+
+    def on_mount_state(self, remote_name, state, detail):
+        name = self.remotes.get(remote_name)
+        if name is None:
+            return
+        if state == "idle":
+            self.ui.post(name, mounted=False)
+            self.ui.post(None, message=f"{name} idle, unmounted • click to remount on {detail}")
+        elif state == "forgotten":
+            self.ui.post(None, message=f"{name}: {detail}")
+        else:
+            self.ui.post(name, mounted=state == "mounted", letter=detail if state == "mounted" else None)
+            self.ui.post(None, message=f"{name} {state}: {detail}")
+
+    def on_log(self, remote_name, record):
+        name = self.remotes.get(remote_name, remote_name)
+        self.ui.post(None, message=f"{name} {record.kind}: {record.msg}")
+
+    def on_prewarm(self, remote_name, done, total, detail):
+        name = self.remotes.get(remote_name, remote_name)
+        self.ui.post(None, message=f"{name} pre-warm {done}/{total} • {detail}")
+
+    def show_log(self):
+        name = self.selected
+        if not name:
+            return messagebox.showinfo("Log", "Select a service first")
+        buf = self.rclone.log(name.lower().replace(" ", ""))
+        win = tk.Toplevel(self.root)
+        counts = ", ".join(f"{n} {k}" for k, n in buf.counts.items() if k != "info") or "no errors"
+        win.title(f"{name} log • {counts}")
+        win.configure(bg="#1a1a1a")
+        text = tk.Text(win, height=20, width=90, bg="#1a1a1a", fg="white", font=("Consolas", 9))
+        text.pack(fill="both", expand=True, padx=8, pady=8)
+        text.insert("end", "\n".join(str(r) for r in buf.tail()) or "Nothing logged yet")
+        text.config(state="disabled")
+
+    def apply_updates(self, batch):
+        msg = batch.pop(None, {}).get("message")
+        for name, delta in batch.items():
+            if name not in self.services:
+                continue
+            if "mounted" in delta:
+                self.set_mounted(name, delta["mounted"], delta.get("letter"))
+            if "checked" in delta:
+                self.check_vars[name].set(delta["checked"])
+            if "probe" in delta:
+                self.show_probe(name, delta["probe"])
+        self.update_status(msg)
+
+    def show_probe(self, name, result):
+        color = "#FF5555" if not result.ok else "#FFAA00" if result.slow else "#55CC55"
+        self.services[name]["probe"].config(text=str(result), fg=color)
+
+    def set_mounted(self, name, mounted, letter=None):
+        svc = self.services[name]
+        if svc["mounted"] != mounted:
+            self.mounted_count += 1 if mounted else -1
+        svc["mounted"] = mounted
+        svc["letter"] = letter if mounted else None
+
+    def show_metrics(self, latest):
+        name = self.selected
+        if name in self.services and self.services[name]["mounted"]:
+            m = latest.get(name.lower().replace(" ", ""))
+            if m is not None:
+                self.status_label.config(text=f"{name} {self.services[name]['letter']} • {summary(m)}")
 
     def unmount_service(self, name):
         remote_name = name.lower().replace(" ", "")
-        rclone.unmount(remote_name)
-        self.services[name]["mounted"] = False
-        self.services[name]["letter"] = None
+        self.rclone.unmount(remote_name)
+        self.set_mounted(name, False)
         self.update_status(f"{name} unmounted")
 
     def mount_all(self):
-        for name in self.services:
-            if self.check_vars[name].get():
-                self.mount_service(name)
+        jobs, remotes, skipped, reasons = [], {}, [], {}
+        for priority, name in enumerate(self.services):
+            if not self.check_vars[name].get() or self.services[name]["mounted"]:
+                continue
+            remote_name = name.lower().replace(" ", "")
+            if not RCLONE_TYPES.get(name) or remote_name not in self.rclone.config:
+                skipped.append(name)
+                continue
+            remotes[remote_name] = name
+            jobs.append((remote_name, priority))
+        if not jobs:
+            self.update_status(f"Nothing to mount ({len(skipped)} not configured)" if skipped else "Nothing to mount")
+            return
+        
+        def progress(batch, done, total):
+            for r in batch:
+                if r.ok:
+                    self.ui.post(remotes[r.name], mounted=True, letter=r.mountpoint)
+                else:
+                    self.ui.post(remotes[r.name], checked=False)
+            self.ui.post(None, message=f"Mounting {done}/{total}...")
+        
+        def finish(results):
+            failed = [f"{remotes[r.name]}: {r.error}" for r in results if not r.ok]
+            failed += [f"{name}: {reasons.get(name, 'not configured')}" for name in skipped]
+            ok = [r for r in results if r.ok]
+            msg = f"{len(ok)}/{len(results) + len(skipped)} mounted"
+            if ok:
+                slowest = max(ok, key=lambda r: r.elapsed)
+                msg += f" • slowest {remotes[slowest.name]} {slowest.elapsed:.1f}s"
+            self.update_status(msg)
+            if failed:
+                messagebox.showerror("Mount All", "\n".join(failed))
+        
+        def schedule():
+            # unreachable remotes would only hold a worker until the ready timeout
+            ready, unreachable = self.prober.triage(jobs)
+            for r in unreachable:
+                skipped.append(remotes[r.name])
+                reasons[remotes[r.name]] = f"{r}: {r.error}"
+            if not ready:
+                return finish([])
+            self.update_status(f"Mounting 0/{len(ready)}...")
+            MountScheduler(self.rclone).run(ready, on_progress=progress,
+                                       on_done=lambda results: self.ui.call(finish, results))
+        
+        stale = self.prober.stale(remotes)
+        if not stale:
+            return schedule()
+        self.update_status(f"Checking {len(stale)} services...")
+        self.prober.run(stale, on_result=lambda r: self.ui.post(remotes[r.name], probe=r),
+                        on_done=lambda results: self.ui.call(schedule))
 
     def unmount_all(self):
-        rclone.unmount_all()
         for name in self.services:
-            self.services[name]["mounted"] = False
+            self.set_mounted(name, False)
             self.check_vars[name].set(False)
-        self.update_status("All unmounted")
+        self.update_status("Unmounting...")
+        def do_unmount():
+            report = self.rclone.unmount_all()
+            self.ui.post(None, message=f"All unmounted • {report}")
+        threading.Thread(target=do_unmount, daemon=True).start()
+
+    # ------------------- INSTANCE IPC -------------------
+    # Commands from a second launch or the CLI arrive on the instance
+    # socket thread, so they only reach Tk through self.ui.
+    def remote_show(self):
+        self.ui.call(self.show_window)
+        return "shown"
+
+    def show_window(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+
+    def remote_mount(self, *names):
+        if not names:
+            self.ui.call(self.mount_all)
+            return "mounting checked services"
+        missing = [n for n in names if n not in self.rclone.config]
+        if missing:
+            raise ValueError(f"not configured: {', '.join(missing)}")
+
+        def on_mount(n, letter, success, error=None):
+            name = self.remotes.get(n, n)
+            if success:
+                self.ui.post(name, mounted=True, checked=True, letter=letter)
+                self.ui.post(None, message=f"{name} mounted on {letter} in {self.rclone.latency.get(n, 0):.1f}s")
+            else:
+                self.ui.post(None, message=f"{name} failed: {error}")
+        for n in names:
+            self.supervisor.reset(n)
+            self.rclone.mount(n, on_mount)
+        return f"mounting {', '.join(names)}"
+
+    def remote_unmount(self, *names):
+        result = self.ipc["unmount"](*names)
+        for remote_name, name in list(self.remotes.items()):
+            if remote_name not in self.rclone.mounts:
+                self.ui.post(name, mounted=False)
+        self.ui.post(None, message=result)
+        return result
 
     def configure_selected(self):
         if self.selected:
@@ -289,21 +438,90 @@ class CatCloudmounter:
         rtype = RCLONE_TYPES.get(name)
         if rtype:
             remote_name = name.lower().replace(" ", "")
-            rclone.auth_interactive(remote_name, rtype)
+            self.rclone.auth_interactive(remote_name, rtype)
             self.update_status(f"{name} configured")
 
     def remove_selected(self):
         if self.selected:
             name = self.selected
+            remote_name = name.lower().replace(" ", "")
+            self.rclone.unmount(remote_name)
+            self.rclone.config.remove_remote(remote_name)
+            self.rclone.logs.pop(remote_name, None)
+            self.set_mounted(name, False)
+            self.remotes.pop(remote_name, None)
             self.services[name]["row"].destroy()
             del self.services[name]
             del self.check_vars[name]
             self.selected = None
 
+    def combine_services(self):
+        configured = [n for n in self.services if n.lower().replace(" ", "") in self.rclone.config]
+        if len(configured) < 2:
+            return messagebox.showinfo("Combine Services", "Configure at least two services first")
+        win = tk.Toplevel(self.root)
+        win.title("Combine Services")
+        win.geometry(f"300x{330 + 26 * len(configured)}")
+        win.configure(bg="#1a1a1a")
+        win.transient(self.root)
+        win.grab_set()
+        
+        tk.Label(win, text="Mount these as one drive:", fg="white", bg="#1a1a1a").pack(pady=10)
+        picks = {}
+        for name in configured:
+            picks[name] = tk.BooleanVar(value=name == self.selected)
+            tk.Checkbutton(win, text=name, variable=picks[name], fg="white", bg="#1a1a1a",
+                           selectcolor="#1a1a1a", activebackground="#1a1a1a").pack(anchor="w", padx=30)
+        
+        tk.Label(win, text="Name:", fg="white", bg="#1a1a1a").pack(pady=(10, 0))
+        name_entry = tk.Entry(win, width=30)
+        name_entry.insert(0, "All Clouds")
+        name_entry.pack()
+        
+        kind_var = tk.StringVar(value="union")
+        tk.Label(win, text="Merge trees (union) or one folder each (combine):", fg="white", bg="#1a1a1a").pack(pady=(10, 0))
+        tk.OptionMenu(win, kind_var, *KINDS).pack()
+        
+        policies = tk.Frame(win, bg="#1a1a1a")
+        policies.pack(pady=6)
+        policy_vars = {}
+        for col, (label, choices) in enumerate((("Read", SEARCH_POLICIES), ("Modify", ACTION_POLICIES),
+                                                ("Create", CREATE_POLICIES))):
+            tk.Label(policies, text=label, fg="white", bg="#1a1a1a").grid(row=0, column=col)
+            policy_vars[label] = tk.StringVar(value=choices[0])
+            tk.OptionMenu(policies, policy_vars[label], *choices).grid(row=1, column=col)
+        
+        def create():
+            label = name_entry.get().strip()
+            picked = [n for n, var in picks.items() if var.get()]
+            if label in self.services:
+                return messagebox.showerror("Combine Services", f"{label} already exists", parent=win)
+            try:
+                aggregate(self.rclone.config, label.lower().replace(" ", ""),
+                          [n.lower().replace(" ", "") for n in picked], kind=kind_var.get(),
+                          search=policy_vars["Read"].get(), action=policy_vars["Modify"].get(),
+                          create=policy_vars["Create"].get())
+            except ValueError as e:
+                return messagebox.showerror("Combine Services", str(e), parent=win)
+            RCLONE_TYPES[label] = kind_var.get()
+            MOUNT_PROFILES[label] = "auto"
+            ICONS[label] = "◈"
+            ICON_COLORS[label] = "#0078D4"
+            # the combined mount replaces the members' own mounts
+            for name in picked:
+                if self.services[name]["mounted"]:
+                    self.check_vars[name].set(False)
+                    self.unmount_service(name)
+            self.add_service_row(label)
+            win.destroy()
+            self.mount_service(label)
+        
+        tk.Button(win, text="Combine & Mount", command=create, bg="#0078D7", fg="white").pack(pady=12)
+
     def add_service_wizard(self):
         win = tk.Toplevel(self.root)
         win.title("Add Service")
-        win.geometry("300x200")
+        win.geometry("300x360")
         win.configure(bg="#1a1a1a")
         win.transient(self.root)
         win.grab_set()
@@ -317,11 +535,26 @@ class CatCloudmounter:
         type_entry.insert(0, "drive")
         type_entry.pack()
         
+        tk.Label(win, text="Performance Profile:", fg="white", bg="#1a1a1a").pack(pady=10)
+        profile_var = tk.StringVar(value="auto")
+        tk.OptionMenu(win, profile_var, *PROFILE_NAMES).pack()
+        
+        tk.Label(win, text="Pre-warm dirs (blank = off, / = all):", fg="white", bg="#1a1a1a").pack(pady=(10, 0))
+        prewarm_entry = tk.Entry(win, width=30)
+        prewarm_entry.pack()
+        depth_var = tk.IntVar(value=0)
+        depth_row = tk.Frame(win, bg="#1a1a1a")
+        depth_row.pack(pady=4)
+        tk.Label(depth_row, text="Depth (0 = whole tree):", fg="white", bg="#1a1a1a").pack(side="left")
+        tk.Spinbox(depth_row, from_=0, to=10, width=4, textvariable=depth_var).pack(side="left", padx=4)
+        
         def add():
             name = name_entry.get()
             rtype = type_entry.get()
             if name and rtype:
                 RCLONE_TYPES[name] = rtype
+                MOUNT_PROFILES[name] = profile_var.get()
+                PREWARM[name] = (prewarm_entry.get(), depth_var.get())
                 ICONS[name] = "●"
                 ICON_COLORS[name] = "#0078D4"
                 self.add_service_row(name)
@@ -329,18 +562,64 @@ class CatCloudmounter:
         
         tk.Button(win, text="Add", command=add, bg="#0078D7", fg="white").pack(pady=20)
 
+    def set_bandwidth(self, **budget):
+        try:
+            self.rclone.bandwidth.configure(**budget)
+        except ValueError as e:
+            return messagebox.showerror("Bandwidth", str(e))
+        # pushing new limits over rc can take a moment per mount
+        threading.Thread(target=self.rclone.bandwidth.rebalance, daemon=True).start()
+        self.update_status("Bandwidth budget updated")
+
+    def bandwidth_schedule(self):
+        current = " ".join(f"{m // 60:02d}:{m % 60:02d},{format_size(r) if r >= 0 else 'off'}" for m, r in self.rclone.bandwidth.schedule)
+        text = simpledialog.askstring("Bandwidth Schedule",
+                                      "Timetable shared by all mounts\n(e.g. 08:00,1M 19:00,10M 23:00,off):",
+                                      initialvalue=current, parent=self.root)
+        if text is not None:
+            self.bw_var.set("")
+            self.set_bandwidth(bwlimit=text.strip() or "off")
+
+    def transfer_slots(self):
+        slots = simpledialog.askinteger("Transfer Slots", "Total transfers across all mounts (0 = no cap):",
+                                        initialvalue=self.rclone.bandwidth.transfers, minvalue=0, parent=self.root)
+        if slots is not None:
+            self.set_bandwidth(transfers=slots)
+
+    def api_rate_limits(self):
+        current = ",".join(f"{p}={t:g}" for p, t in self.rclone.bandwidth.tps.items())
+        text = simpledialog.askstring("API Rate Limits", "Calls per second per provider, per-process mounts only\n(e.g. drive=10,dropbox=12):",
+                                      initialvalue=current, parent=self.root)
+        if text is not None:
+            self.set_bandwidth(tps=text)
+
     def refresh_status(self):
-        count = sum(1 for s in self.services.values() if s["mounted"])
-        self.update_status(f"{count} services mounted")
+        self.update_status(f"{self.mounted_count} services mounted")
 
-    def update_status(self, msg):
-        self.status_label.config(text=msg)
-        count = sum(1 for s in self.services.values() if s["mounted"])
-        self.status_indicator.config(bg="#00FF00" if count > 0 else "#666666")
+    def update_status(self, msg=None):
+        if msg is not None:
+            self.status_label.config(text=msg)
+        self.status_indicator.config(bg="#00FF00" if self.mounted_count > 0 else "#666666")
 
     def check_rclone(self):
         if not shutil.which("rclone"):
-            self.show_rclone_wizard()
+            return self.show_rclone_wizard()
+        self.probe_services()
+
+    def probe_services(self):
+        """List the root of every configured service at once and show RTT in its row"""
+        remotes = {n.lower().replace(" ", ""): n for n in self.services}
+        names = [r for r in remotes if r in self.rclone.config]
+        if not names:
+            return
+        
+        def done(results):
+            down = [remotes[r.name] for r in results if not r.ok]
+            msg = f"{len(results) - len(down)}/{len(results)} services reachable"
+            self.ui.post(None, message=msg + (f" • down: {', '.join(down)}" if down else ""))
+        
+        self.update_status(f"Checking {len(names)} services...")
+        self.prober.run(names, on_result=lambda r: self.ui.post(remotes[r.name], probe=r), on_done=done)
 
     def show_rclone_wizard(self):
         win = tk.Toplevel(self.root)
@@ -381,10 +660,10 @@ class CatCloudmounter:
                                    creationflags=subprocess.CREATE_NEW_CONSOLE)
                 else:
                     subprocess.run(["sudo", "apt", "install", "rclone", "-y"])
-                self.root.after(0, lambda: self.update_status("rclone installed!"))
-                self.root.after(0, lambda: messagebox.showinfo("Success", "rclone installed!"))
+                self.ui.post(None, message="rclone installed!")
+                self.ui.call(messagebox.showinfo, "Success", "rclone installed!")
             except Exception as e:
-                self.root.after(0, lambda: messagebox.showerror("Failed", str(e)))
+                self.ui.call(messagebox.showerror, "Failed", str(e))
         threading.Thread(target=do_install, daemon=True).start()
 
     def open_rclone_config(self):
@@ -398,11 +677,21 @@ class CatCloudmounter:
 
     def exit_clean(self):
         if messagebox.askyesno("Exit", "Unmount all and exit?"):
-            rclone.unmount_all()
+            self.supervisor.stop()
+            self.tuner.stop()
+            self.reaper.stop()
+            self.metrics.stop()
+            self.ui.stop()
+            if self.instance is not None:
+                self.instance.release()
+            self.rclone.shutdown()
             self.root.destroy()
 
     def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
-    CatCloudmounter().run()
+    # a second launch just raises the window of the first
+    instance = claim("show")
+    if instance is not None:
+        CatCloudmounter(instance).run()
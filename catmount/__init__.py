@@ -0,0 +1,42 @@
+# Cat's CloudMounter shared backend — used by both Tk frontends
+
+from .aggregate import aggregate
+from .ramconfig import RamConfig, parse_ini, format_section
+from .rcengine import RcClient, RcdEngine, RcError
+from .backend import RcloneBackend
+from .bandwidth import BandwidthBudget
+from .cachepool import CachePool
+from .instance import NoInstance, SingleInstance, backend_handlers, claim, send
+from .logcapture import LogBuffer, LogRecord, parse_line
+from .mountpoints import MountpointAllocator
+from .metrics import MetricsCollector, MetricsServer, MountMetrics, start_metrics
+from .prewarm import Prewarmer
+from .polltune import PollTuner
+from .probe import ProbeResult, Prober
+from .procmgr import ShutdownReport, stop_processes
+from .profiles import PROFILES, PROFILE_NAMES, auto_profile
+from .reaper import IdleReaper
+from .readiness import MountError, read_mountinfo, wait_ready
+from .scheduler import MountResult, MountScheduler
+from .supervisor import MountSupervisor, classify
+from .transfers import TransferJob, TransferQueue
+from .uiqueue import UiDispatcher
+
+__all__ = ["aggregate",
+           "RamConfig", "parse_ini", "format_section",
+           "BandwidthBudget", "CachePool",
+           "RcClient", "RcdEngine", "RcError", "RcloneBackend",
+           "NoInstance", "SingleInstance", "backend_handlers", "claim", "send",
+           "LogBuffer", "LogRecord", "parse_line",
+           "MountpointAllocator",
+           "MetricsCollector", "MetricsServer", "MountMetrics", "start_metrics",
+           "PollTuner", "Prewarmer",
+           "ProbeResult", "Prober",
+           "ShutdownReport", "stop_processes",
+           "PROFILES", "PROFILE_NAMES", "auto_profile",
+           "IdleReaper",
+           "MountError", "read_mountinfo", "wait_ready",
+           "MountResult", "MountScheduler",
+           "MountSupervisor", "classify",
+           "TransferJob", "TransferQueue",
+           "UiDispatcher"]
@@ -0,0 +1,51 @@
+# ------------------- AGGREGATE REMOTES -------------------
+# Folds several configured remotes into one generated union or combine
+# section so they share a single mount, process and VFS cache. union
+# merges the trees (policies decide where reads/writes go), combine puts
+# each remote in its own top-level directory.
+
+import re
+
+KINDS = ("union", "combine")
+# rclone union policies; the first of each list is rclone's default
+POLICIES = ["all", "epall", "epff", "eplfs", "eplus", "epmfs", "eprand",
+            "ff", "lfs", "lus", "mfs", "newest", "rand"]
+ACTION_POLICIES = ["epall"] + [p for p in POLICIES if p != "epall"]
+CREATE_POLICIES = ["epmfs"] + [p for p in POLICIES if p != "epmfs"]
+SEARCH_POLICIES = ["ff"] + [p for p in POLICIES if p != "ff"]
+
+
+def directory_name(remote):
+    return re.sub(r"[^\w.-]", "_", remote) or "remote"
+
+
+def aggregate(config, name, remotes, kind="union", action="epall", create="epmfs",
+              search="ff", cache_time=120):
+    """Add a union/combine section over `remotes` to config and return its name"""
+    remotes = list(dict.fromkeys(remotes))
+    if kind not in KINDS:
+        raise ValueError(f"unknown aggregate kind: {kind}")
+    if not re.fullmatch(r"[\w.-][\w. -]*", name or ""):
+        raise ValueError(f"bad remote name: {name!r}")
+    if len(remotes) < 2:
+        raise ValueError("pick at least two remotes")
+    missing = [r for r in remotes if r not in config]
+    if missing:
+        raise ValueError(f"not configured: {', '.join(missing)}")
+    if name in config:
+        # add_remote would silently replace the existing section
+        raise ValueError(f"{name} already exists")
+    if kind == "union":
+        for policy, allowed in ((action, POLICIES), (create, POLICIES), (search, POLICIES)):
+            if policy not in allowed:
+                raise ValueError(f"unknown union policy: {policy}")
+        config.add_remote(name, "union", upstreams=" ".join(f"{r}:" for r in remotes),
+                          action_policy=action, create_policy=create, search_policy=search,
+                          cache_time=cache_time)
+    else:
+        dirs = {}
+        for r in remotes:
+            d = directory_name(r)
+            dirs[d if d not in dirs else f"{d}_{len(dirs)}"] = r
+        config.add_remote(name, "combine", upstreams=" ".join(f"{d}={r}:" for d, r in dirs.items()))
+    return name
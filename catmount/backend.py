@@ -0,0 +1,381 @@
+# ------------------- RCLONE BACKEND -------------------
+# Mounts go through one shared `rclone rcd` when it can be started and
+# fall back to one `rclone mount` process per remote otherwise.
+
+import os
+import subprocess
+import threading
+import time
+
+from . import profiles
+from .bandwidth import TPS_PROCESS_ONLY, BandwidthBudget
+from .cachepool import CachePool
+from .logcapture import LOG_LEVEL, LogBuffer, LogRecord, capture
+from .metrics import ENGINE
+from .mountpoints import MountpointAllocator
+from .prewarm import Prewarmer
+from .procmgr import stop_later, stop_processes
+from .ramconfig import RamConfig
+from .rcengine import RcClient, RcdEngine, RcError, free_port, rc_env
+from .readiness import READY_TIMEOUT, MountError, wait_ready
+
+
+def default_config_path():
+    if os.name == "nt":
+        return os.path.join(os.environ.get("APPDATA", ""), "rclone", "rclone.conf")
+    return os.path.expanduser("~/.config/rclone/rclone.conf")
+
+
+class RcloneBackend:
+    def __init__(self, config=None, engine="auto"):
+        self.config = config if config is not None else RamConfig()
+        self.mounts = {}
+        self.latency = {}
+        self.profiles = {}
+        self.tuning = {}
+        self.wanted = set()
+        self.idle = set()
+        self.epoch = {}
+        self.started = {}
+        self.mounting = {}
+        self.mounting_lock = threading.Lock()
+        self.rc = {}
+        self.rc_auth = None
+        self.errors = {}
+        self.logs = {}
+        self.on_log = None
+        self.ready_timeout = READY_TIMEOUT
+        self.mountpoints = MountpointAllocator()
+        self.cache = CachePool()
+        self.prewarmer = Prewarmer(self)
+        self.bandwidth = BandwidthBudget(self)
+        self.engine_mode = os.environ.get("CATMOUNT_ENGINE", engine)
+        self.engine = None
+        self.engine_lock = threading.Lock()
+        self.engine_tried = False
+        self.jobs_engine = None
+
+    def add_remote(self, name, rtype, **kwargs):
+        return self.config.add_remote(name, rtype, **kwargs)
+
+    def get_engine(self):
+        """Start the shared rcd on first use; None means per-process mounts"""
+        with self.engine_lock:
+            if self.engine is None and not self.engine_tried and self.engine_mode != "process":
+                self.engine_tried = True
+                engine = RcdEngine(self.config, on_record=self.engine_record, cache_dir=self.cache.root)
+                if engine.start():
+                    self.engine = engine
+                elif self.engine_mode == "rcd":
+                    self.engine_tried = False
+                    raise MountError("rclone rcd could not be started")
+            if self.engine is not None and not self.engine.available:
+                self.engine.stop()
+                self.engine, self.engine_tried = None, False
+            return self.engine
+
+    def log(self, name):
+        buf = self.logs.get(name)
+        if buf is None:
+            buf = self.logs.setdefault(name, LogBuffer())
+        return buf
+
+    def record(self, name, record):
+        """Store a parsed log line for a remote; errors also land in self.errors"""
+        self.log(name).add(record)
+        if record.kind != "info":
+            self.errors[name] = record.msg
+            if self.on_log is not None:
+                self.on_log(name, record)
+
+    def recent_errors(self, name):
+        """Messages of notable records logged since the remote's last mount attempt"""
+        since = self.started.get(name, 0)
+        return [r.msg for r in self.log(name).tail() if r.kind != "info" and r.time >= since]
+
+    def engine_record(self, record):
+        self.record(self.engine_owner(record) or ENGINE, record)
+
+    def engine_owner(self, record):
+        """Remote a line of the shared rcd's log is about, if it can be told"""
+        # backend errors name it ("remote:path"); VFS and mount lines carry a
+        # path under the mountpoint, or the mountpoint itself, instead
+        name = record.object.split(":", 1)[0] if ":" in record.object else None
+        if name in self.config:
+            return name
+        text = f"{record.object} {record.msg}"
+        for name, mountpoint in sorted(dict(self.mountpoints.reserved).items(), key=lambda i: -len(i[1])):
+            if mountpoint in text:
+                return name
+        return None
+
+    def job_engine(self):
+        """rcd for transfer jobs: the shared mount engine, or a private one in process mode"""
+        engine = self.get_engine()
+        if engine is not None:
+            return engine
+        with self.engine_lock:
+            if self.jobs_engine is None or not self.jobs_engine.available:
+                engine = RcdEngine(self.config, on_record=self.engine_record)
+                if not engine.start():
+                    raise MountError("rclone rcd could not be started for transfers")
+                self.jobs_engine = engine
+            return self.jobs_engine
+
+    def mount(self, name, callback=None, mountpoint=None):
+        def do_mount():
+            try:
+                mp_ = self.mount_now(name, mountpoint)
+                if callback:
+                    callback(name, mp_, True)
+            except Exception as e:
+                if callback:
+                    callback(name, None, False, str(e))
+        threading.Thread(target=do_mount, daemon=True).start()
+
+    def set_profile(self, name, profile):
+        profiles.resolve(profile)
+        self.profiles[name] = profile
+
+    def set_prewarm(self, name, paths, depth=0):
+        self.prewarmer.configure(name, paths, depth)
+
+    def mount_now(self, name, mountpoint=None):
+        """Mount in the calling thread and return the mountpoint once it is served
+
+        Concurrent calls for one remote share a single attempt: later callers
+        wait for it and get its mountpoint or its error.
+        """
+        self.wanted.add(name)
+        with self.mounting_lock:
+            if name in self.mounts:
+                return self.mounts[name][0]
+            attempt = self.mounting.get(name)
+            first = attempt is None
+            if first:
+                attempt = self.mounting[name] = threading.Event()
+        if not first:
+            attempt.wait()
+            if name in self.mounts:
+                return self.mounts[name][0]
+            raise MountError(self.errors.get(name) or f"{name} did not mount")
+        try:
+            return self._mount(name, mountpoint)
+        finally:
+            with self.mounting_lock:
+                del self.mounting[name]
+            attempt.set()
+
+    def _mount(self, name, mountpoint):
+        # a new epoch voids any release still queued behind the previous mount's exit
+        self.epoch[name] = self.epoch.get(name, 0) + 1
+        self.started[name] = time.time()
+        allocated = mountpoint is None and self.mountpoints.get(name) is None
+        if mountpoint is None:
+            mountpoint = self.mountpoints.allocate(name)
+        start = time.monotonic()
+        try:
+            profile = profiles.resolve(self.profiles.get(name, "default"), len(self.mounts) + 1)
+            profile = dict(profile, **self.tuning.get(name, {}))
+            profile = self.cache.apply(name, profile, expected=len(self.wanted))
+            profile = self.bandwidth.apply(name, profile, expected=len(self.wanted))
+            engine = self.get_engine()
+            if engine is not None:
+                engine.mount(name, mountpoint, vfs_opt=profiles.vfs_opt(profile),
+                             main_opt=profiles.main_opt(profile))
+                proc = None
+                if self.bandwidth.tps_limit(name) is not None:
+                    self.log(name).add(LogRecord(time.time(), "notice", "info", f"{name}:", TPS_PROCESS_ONLY))
+            else:
+                proc = self.spawn_mount(name, mountpoint, profile)
+            try:
+                wait_ready(mountpoint, proc=proc, engine=engine, timeout=self.ready_timeout)
+            except MountError as e:
+                self.abort_mount(mountpoint, proc, engine)
+                last = self.log(name).last_error
+                if last is not None and last.time >= start:
+                    e = MountError(f"{e}: {last.msg}")
+                self.errors[name] = str(e)
+                raise e from None
+        except Exception:
+            # a restart or a parked remount keeps the slot it already had; the
+            # cache stays either way, it may hold uploads the next try resumes
+            if allocated:
+                self.mountpoints.release(name, mountpoint)
+            self.free_shares(name, purge=False)
+            raise
+        with self.mounting_lock:
+            # unmount() during the attempt only withdrew the remote from `wanted`
+            undo = name not in self.wanted
+            if not undo:
+                self.mounts[name] = (mountpoint, proc)
+                self.idle.discard(name)
+        if undo:
+            self.rc.pop(name, None)
+            self.stop_mount(mountpoint, proc, engine)
+            self.release(name, mountpoint)
+            raise MountError(f"{name} was unmounted before it was ready")
+        self.latency[name] = time.monotonic() - start
+        self.errors.pop(name, None)
+        self.prewarmer.submit(name)
+        return mountpoint
+
+    def abort_mount(self, mountpoint, proc, engine):
+        if proc is not None:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        elif engine is not None:
+            try:
+                engine.unmount(mountpoint)
+            except RcError:
+                pass
+
+    def stop_mount(self, mountpoint, proc, engine):
+        if proc is not None:
+            stop_processes([proc])
+        elif engine is not None:
+            try:
+                engine.unmount(mountpoint)
+            except RcError:
+                pass
+
+    def spawn_mount(self, name, mountpoint, profile):
+        if self.rc_auth is None:
+            import secrets
+            self.rc_auth = ("cat", secrets.token_urlsafe(16))
+        port = free_port()
+        flags = ["rclone", "mount", f"{name}:", mountpoint, "--config=-", f"--cache-dir={self.cache.root}",
+                 "--use-json-log", f"--log-level={LOG_LEVEL}"] + profiles.mount_flags(profile)
+        flags += self.bandwidth.mount_flags(name)
+        flags += ["--rc", f"--rc-addr=127.0.0.1:{port}"]
+        env = rc_env(*self.rc_auth)
+        if os.name == "nt":
+            proc = subprocess.Popen(flags, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, env=env, creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            proc = subprocess.Popen(flags, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.PIPE, env=env)
+        capture(proc.stderr, lambda record: self.record(name, record))
+        proc.stdin.write(self.config.scoped(name).encode())
+        proc.stdin.close()
+        self.rc[name] = RcClient(f"http://127.0.0.1:{port}", *self.rc_auth, timeout=5)
+        return proc
+
+    def rc_client(self, name):
+        """(client, fs) to query a mount over rc; fs is set for rcd mounts"""
+        mountpoint, proc = self.mounts.get(name, (None, None))
+        if mountpoint is None:
+            return None, None
+        if proc is None:
+            engine = self.engine
+            return (engine.client, f"{name}:") if engine is not None else (None, None)
+        return self.rc.get(name), None
+
+    def forget_mount(self, name):
+        """Drop a dead mount's bookkeeping without touching the process"""
+        self.mounts.pop(name, None)
+        self.rc.pop(name, None)
+
+    def release(self, name, mountpoint=None):
+        """Give back a remote's mountpoint and its share of the cache pool"""
+        self.mountpoints.release(name, mountpoint)
+        self.free_shares(name)
+
+    def free_shares(self, name, purge=True):
+        self.cache.release(name, purge)
+        self.bandwidth.forget(name)
+
+    def release_later(self, name, mountpoint, keep_mountpoint=False):
+        """Cleanup for detach; skipped if the remote was remounted meanwhile"""
+        epoch = self.epoch.get(name)
+
+        def then():
+            if self.epoch.get(name) != epoch or name in self.mounts:
+                return
+            if keep_mountpoint:
+                self.free_shares(name)
+            else:
+                self.release(name, mountpoint)
+        return then
+
+    def detach(self, name, then):
+        """Stop serving a mount; `then` runs once rclone has let go of it"""
+        mountpoint, proc = self.mounts.pop(name)
+        self.rc.pop(name, None)
+        self.prewarmer.cancel(name)
+        if proc is None:
+            if self.engine is not None:
+                try:
+                    self.engine.unmount(mountpoint)
+                except RcError:
+                    pass
+            then()
+        else:
+            stop_later(proc, then=then)
+
+    def unmount(self, name):
+        with self.mounting_lock:
+            self.wanted.discard(name)
+            self.idle.discard(name)
+            mounted, busy = name in self.mounts, name in self.mounting
+        if not mounted:
+            # an attempt still running undoes itself once it sees this
+            if not busy:
+                self.release(name)
+            return
+        self.detach(name, self.release_later(name, self.mounts[name][0]))
+
+    def park(self, name):
+        """Unmount an idle remote but keep its mountpoint reserved for a quick remount"""
+        if name not in self.mounts:
+            return False
+        self.idle.add(name)
+        self.detach(name, self.release_later(name, self.mounts[name][0], keep_mountpoint=True))
+        return True
+
+    def unmount_all(self, stop_engine=False):
+        """Stop every mount in parallel and return a ShutdownReport"""
+        with self.mounting_lock:
+            mounts = list(self.mounts.values())
+            for name in self.mounts:
+                self.prewarmer.cancel(name)
+            self.mounts.clear()
+            self.rc.clear()
+            self.wanted.clear()
+            self.idle.clear()
+        procs = [proc for _, proc in mounts if proc is not None]
+        extra = []
+        with self.engine_lock:
+            engine = self.engine
+            if stop_engine:
+                self.engine = None
+        if engine is not None:
+            extra.append(engine.stop if stop_engine else engine.unmount_all)
+        if stop_engine and self.jobs_engine is not None:
+            extra.append(self.jobs_engine.stop)
+            self.jobs_engine = None
+        report = stop_processes(procs, extra=extra)
+        self.mountpoints.release_all()
+        self.cache.clear()
+        return report
+
+    def shutdown(self):
+        return self.unmount_all(stop_engine=True)
+
+    def auth_interactive(self, name, rtype):
+        """Run rclone config for OAuth-based services"""
+        try:
+            if os.name == "nt":
+                subprocess.run(["rclone", "config", "create", name, rtype],
+                               creationflags=subprocess.CREATE_NEW_CONSOLE)
+            else:
+                subprocess.run(["rclone", "config", "create", name, rtype])
+            cfg_path = default_config_path()
+            if os.path.exists(cfg_path):
+                with open(cfg_path, "r") as f:
+                    self.config.load(f.read())
+                return True
+        except:
+            pass
+        return False
@@ -0,0 +1,189 @@
+# ------------------- BANDWIDTH BUDGET -------------------
+# One budget for all mounts: total bandwidth (optionally a time-of-day
+# timetable), total transfer slots and per-provider API rates. Bandwidth
+# is max-min fair-shared across mounts from the metrics poller's samples
+# and applied live with rc core/bwlimit. Transfer slots and --tpslimit
+# can only be set when rclone starts, so they are split at mount time.
+# rclone keeps a single API-rate limiter per process, so --tpslimit only
+# reaches per-process mounts: the shared rcd can't limit remotes apart.
+
+import os
+import threading
+import time
+
+from .profiles import parse_size
+from .rcengine import RcError
+
+BWLIMIT = os.environ.get("CATMOUNT_BWLIMIT", "off")
+TRANSFERS = int(os.environ.get("CATMOUNT_TRANSFERS", "0"))
+# rclone's docs suggest ~10 tps for Google Drive; Dropbox throttles above ~12
+PROVIDER_TPS = {"drive": 10, "dropbox": 12}
+MIN_RATE = 64 * 1024
+TPS_PROCESS_ONLY = "API rate limit not applied: --tpslimit only reaches per-process mounts (CATMOUNT_ENGINE=process)"
+
+
+def parse_tps(text):
+    """"drive=10,dropbox=12" -> {"drive": 10.0, "dropbox": 12.0}"""
+    limits = {}
+    for part in str(text or "").split(","):
+        provider, _, value = part.partition("=")
+        if provider.strip() and value.strip():
+            limits[provider.strip()] = float(value)
+    return limits
+
+
+def parse_schedule(text):
+    """rclone-style timetable "08:00,512k 19:00,10M 23:00,off" -> [(minute, bytes/s)]
+
+    A plain rate ("10M", "off") is a schedule with one all-day entry; -1 = unlimited.
+    """
+    text = str(text or "off").strip()
+    if "," not in text:
+        return [(0, parse_size(text))]
+    entries = []
+    for part in text.split():
+        when, _, rate = part.partition(",")
+        hours, _, minutes = when.partition(":")
+        entries.append((int(hours) * 60 + int(minutes or 0), parse_size(rate)))
+    if not entries:
+        raise ValueError(f"bad bandwidth schedule: {text}")
+    return sorted(entries)
+
+
+def rate_at(schedule, now=None):
+    t = time.localtime(now)
+    minute = t.tm_hour * 60 + t.tm_min
+    rate = schedule[-1][1]
+    for start, value in schedule:
+        if start <= minute:
+            rate = value
+    return rate
+
+
+def format_rate(rate):
+    return "off" if rate < 0 else f"{max(1, int(rate // 1024))}k"
+
+
+def fair_share(total, demands):
+    """Max-min fair split of total between {name: demand}; leftover spread evenly"""
+    shares, remaining = {}, float(total)
+    order = sorted(demands, key=demands.get)
+    for i, name in enumerate(order):
+        share = min(demands[name], remaining / (len(order) - i))
+        shares[name] = share
+        remaining -= share
+    if shares and remaining > 0:
+        for name in shares:
+            shares[name] += remaining / len(shares)
+    return shares
+
+
+class BandwidthBudget:
+    def __init__(self, backend, bwlimit=BWLIMIT, transfers=TRANSFERS, tps=None, tolerance=0.1):
+        self.backend = backend
+        self.schedule = parse_schedule(bwlimit)
+        self.transfers = transfers
+        self.tps = dict(PROVIDER_TPS)
+        self.tps.update(parse_tps(os.environ.get("CATMOUNT_TPS")) if tps is None else tps)
+        self.tolerance = tolerance
+        self.applied = {}
+        self.lock = threading.Lock()
+
+    def configure(self, bwlimit=None, transfers=None, tps=None):
+        """Change the budget; bandwidth takes effect on the next rebalance"""
+        if bwlimit is not None:
+            self.schedule = parse_schedule(bwlimit)
+        if transfers is not None:
+            self.transfers = max(0, int(transfers))
+        if tps is not None:
+            self.tps.update(parse_tps(tps) if isinstance(tps, str) else tps)
+
+    @property
+    def total(self):
+        return rate_at(self.schedule)
+
+    def provider(self, name):
+        # a crypt/alias/union wraps other remotes; the innermost one talks to the API
+        config = self.backend.config
+        chain = config.resolve(name)
+        section = config.get_remote(chain[0]) if chain else None
+        return (section or {}).get("type")
+
+    def apply(self, name, profile, expected=0):
+        """Profile copy with this mount's share of the transfer slots"""
+        if not self.transfers:
+            return profile
+        share = max(1, self.transfers // max(expected, len(self.backend.mounts) + 1, 1))
+        return dict(profile, transfers=min(int(profile.get("transfers", share)), share))
+
+    def tps_limit(self, name):
+        """--tpslimit for a process mount: the provider's rate split between its mounts"""
+        provider = self.provider(name)
+        limit = self.tps.get(provider)
+        if not limit:
+            return None
+        peers = sum(1 for n in self.backend.wanted | set(self.backend.mounts)
+                    if n != name and self.provider(n) == provider)
+        return max(limit / (peers + 1), 0.1)
+
+    def mount_flags(self, name):
+        flags = []
+        total = self.total
+        if total >= 0:
+            flags += ["--bwlimit", format_rate(max(MIN_RATE, total // max(len(self.backend.wanted), 1)))]
+        tps = self.tps_limit(name)
+        if tps is not None:
+            flags += ["--tpslimit", f"{tps:g}"]
+        return flags
+
+    def observe(self, latest):
+        self.rebalance(latest)
+
+    def rebalance(self, latest=None):
+        """Split the current total across mounts and push changed limits over rc"""
+        latest = latest or {}
+        total = self.total
+        mounts = dict(self.backend.mounts)
+        if not mounts:
+            return {}
+        if total < 0:
+            shares = {name: -1 for name in mounts}
+        else:
+            demands = {}
+            for name in mounts:
+                # busy mounts ask for a bit more than they currently move,
+                # idle ones keep a trickle
+                m = latest.get(name)
+                if m is None or not (m.transferring or m.uploads_pending):
+                    demands[name] = MIN_RATE
+                elif m.speed:
+                    demands[name] = max(m.speed * 1.5, MIN_RATE)
+                else:
+                    demands[name] = float(total)
+            shares = {n: max(MIN_RATE, s) for n, s in fair_share(total, demands).items()}
+        with self.lock:
+            engine_total = sum(s for n, s in shares.items() if mounts[n][1] is None)
+            if total < 0:
+                engine_total = -1
+            for name, share in shares.items():
+                if mounts[name][1] is not None:
+                    self.push(name, share, *self.backend.rc_client(name))
+            if any(proc is None for _, proc in mounts.values()) and self.backend.engine is not None:
+                # rcd has one limiter for all of its mounts: give it their combined share
+                self.push(None, engine_total, self.backend.engine.client, None)
+        return shares
+
+    def push(self, key, rate, client, fs):
+        old = self.applied.get(key)
+        if client is None or old == rate:
+            return
+        if old is not None and rate >= 0 and old >= 0 and abs(rate - old) <= self.tolerance * old:
+            return
+        try:
+            client.call("core/bwlimit", timeout=2, rate=format_rate(rate))
+            self.applied[key] = rate
+        except RcError:
+            pass
+
+    def forget(self, name):
+        self.applied.pop(name, None)
@@ -0,0 +1,170 @@
+# ------------------- VFS CACHE POOL -------------------
+# Every mount's VFS cache lives under one RAM-backed root (/dev/shm or
+# $XDG_RUNTIME_DIR, both tmpfs on Linux) and draws from one byte budget.
+# Shares are weighted by recent activity reported by the metrics poller
+# and recomputed whenever a mount starts, and no mount gets more than an
+# even split between the mounts running or expected. A new mount takes
+# back the excess of shares granted when fewer mounts were around. rclone
+# can't resize a running VFS cache, so those mounts pick up their smaller
+# size on their next (re)mount. A cache still holding writes rclone has
+# not uploaded is never deleted: the next mount of that remote resumes
+# the uploads from it.
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from .profiles import available_memory, format_size, parse_size
+
+MIB = 1024 ** 2
+
+
+def default_root():
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    if os.name == "nt":
+        return os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), "catmount", "cache")
+    if os.path.isdir("/dev/shm"):
+        return f"/dev/shm/catmount-{uid}"
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "catmount-cache")
+    return os.path.join(tempfile.gettempdir(), f"catmount-cache-{uid}")
+
+
+CACHE_ROOT = os.environ.get("CATMOUNT_CACHE_ROOT") or default_root()
+CACHE_BUDGET = os.environ.get("CATMOUNT_CACHE_BUDGET", "")
+MIN_SHARE = 64 * MIB
+
+
+class CachePool:
+    def __init__(self, root=CACHE_ROOT, budget=None, min_share=MIN_SHARE, smoothing=0.2):
+        self.root = root
+        self.min_share = min_share
+        self.smoothing = smoothing
+        self.granted = {}
+        self.activity = {}
+        self.uploads = {}
+        self.lock = threading.Lock()
+        self._budget = budget
+
+    @property
+    def budget(self):
+        if self._budget is None:
+            self._budget = self.default_budget()
+        return self._budget
+
+    def default_budget(self):
+        """CATMOUNT_CACHE_BUDGET, else a quarter of free RAM, capped by free space in root"""
+        budget = parse_size(CACHE_BUDGET) if CACHE_BUDGET else available_memory() // 4
+        try:
+            os.makedirs(self.root, mode=0o700, exist_ok=True)
+            st = os.statvfs(self.root)
+            budget = min(budget, st.f_bavail * st.f_frsize * 9 // 10)
+        except (OSError, AttributeError):
+            pass
+        return max(budget, 0)
+
+    def weight(self, name):
+        return 1.0 + self.activity.get(name, 0.0)
+
+    def targets(self, names, expected=0):
+        """Activity-weighted split of the budget; `expected` pads for mounts still to come"""
+        names = list(names)
+        total = sum(self.weight(n) for n in names) + max(0, expected - len(names))
+        if not total:
+            return {}
+        return {n: max(self.min_share, int(self.budget * self.weight(n) / total) // MIB * MIB)
+                for n in names}
+
+    def grant(self, name, expected=0, cap=None):
+        """Bytes of cache for a mount about to start, or None if the pool is exhausted"""
+        with self.lock:
+            self.granted.pop(name, None)
+            names = set(self.granted) | {name}
+            targets = self.targets(names, expected)
+            fair = self.budget // max(expected, len(names), 1)
+            target = min(targets[name], max(fair, self.min_share))
+            if cap is not None:
+                target = min(target, cap)
+            # shares sized for fewer mounts shrink to their new target
+            for other, size in self.granted.items():
+                self.granted[other] = min(size, targets[other])
+            free = self.budget - sum(self.granted.values())
+            share = min(target, free) // MIB * MIB
+            if share < self.min_share:
+                return None
+            self.granted[name] = share
+            os.makedirs(self.root, mode=0o700, exist_ok=True)
+            return share
+
+    def apply(self, name, profile, expected=0):
+        """Profile copy with this mount's cache size, or minimal caching when out of budget"""
+        if profile.get("cache_mode", "off") == "off":
+            return profile
+        limit = parse_size(profile.get("cache_max_size", "off"))
+        share = self.grant(name, expected, cap=limit if limit >= 0 else None)
+        if share is None:
+            return dict(profile, cache_mode="minimal", cache_max_size=format_size(self.min_share))
+        return dict(profile, cache_max_size=format_size(share))
+
+    def dirty(self, name):
+        """True while the remote's cache may hold writes rclone hasn't uploaded yet"""
+        if self.uploads.get(name):
+            return True
+        # rclone marks every cached file not yet uploaded "Dirty" in vfsMeta
+        for dirpath, _, files in os.walk(os.path.join(self.root, "vfsMeta", name)):
+            for f in files:
+                try:
+                    with open(os.path.join(dirpath, f), "r") as meta:
+                        if json.load(meta).get("Dirty"):
+                            return True
+                except (OSError, ValueError, AttributeError):
+                    continue
+        return False
+
+    def purge(self, name):
+        """Delete a remote's cache unless it still owes uploads; False if it was kept"""
+        if self.dirty(name):
+            return False
+        # rclone keeps data and metadata under <cache-dir>/vfs{,Meta}/<remote>
+        for sub in ("vfs", "vfsMeta"):
+            shutil.rmtree(os.path.join(self.root, sub, name), ignore_errors=True)
+        return True
+
+    def release(self, name, purge=True):
+        with self.lock:
+            self.granted.pop(name, None)
+            self.activity.pop(name, None)
+        if purge:
+            self.purge(name)
+        self.uploads.pop(name, None)
+
+    def observe(self, latest):
+        """Fold a metrics sample into each mount's activity score"""
+        with self.lock:
+            for name, m in latest.items():
+                if name not in self.granted:
+                    continue
+                self.uploads[name] = m.uploads_pending
+                score = (m.speed + (m.open_files + m.uploads_pending) * MIB) / MIB
+                prev = self.activity.get(name, score)
+                self.activity[name] = prev + self.smoothing * (score - prev)
+
+    def clear(self):
+        """Forget every share and delete the cache root; returns remotes kept for pending uploads"""
+        with self.lock:
+            self.granted.clear()
+            self.activity.clear()
+        names = set()
+        for sub in ("vfs", "vfsMeta"):
+            try:
+                names.update(os.listdir(os.path.join(self.root, sub)))
+            except OSError:
+                pass
+        kept = sorted(name for name in names if not self.purge(name))
+        self.uploads.clear()
+        if not kept:
+            shutil.rmtree(self.root, ignore_errors=True)
+        return kept
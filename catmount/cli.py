@@ -0,0 +1,291 @@
+# ------------------- HEADLESS CLI -------------------
+# python -m catmount mount-all | probe | status | unmount | gui | startup-time
+# When an instance is already running, mount-all/status/unmount are sent
+# to it over its local socket instead of acting on the host directly.
+# Nothing here imports tkinter; the Tk frontends load only for `gui`.
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from .backend import RcloneBackend, default_config_path
+from .bandwidth import BWLIMIT, TPS_PROCESS_ONLY, TRANSFERS
+from .instance import NoInstance, SingleInstance, backend_handlers, claim, send
+from .metrics import METRICS_PORT, start_metrics
+from .mountpoints import unmount_path
+from .polltune import PollTuner
+from .probe import PROBE_TIMEOUT, Prober
+from .profiles import PROFILE_NAMES
+from .ramconfig import RamConfig
+from .readiness import rclone_mounts
+from .reaper import IDLE_AFTER, MAX_ACTIVE, IdleReaper
+from .scheduler import DEADLINE, WORKERS, MountScheduler
+from .supervisor import MountSupervisor
+
+FRONTENDS = {"classic": ("cathdrv0", "CatCloudmounter"), "neuter": ("mounterhdrv0", "CatsCloudMounter")}
+
+
+def load_config(path):
+    if path == "-":
+        return RamConfig(sys.stdin.read())
+    with open(path, "r") as f:
+        return RamConfig(f.read())
+
+
+def forward(command, *args):
+    """Hand a command to the running instance; None when there is none"""
+    try:
+        reply = send(command, *args)
+    except NoInstance:
+        return None
+    except (OSError, TimeoutError) as e:
+        reply = {"ok": False, "error": str(e)}
+    if not reply.get("ok"):
+        print(f"catmount: {reply.get('error')}", file=sys.stderr)
+    return reply
+
+
+def cmd_mount_all(args):
+    instance = SingleInstance()
+    if not instance.acquire():
+        reply = forward("mount", *args.remotes)
+        if reply is None:
+            print("catmount: another instance holds the lock but does not answer", file=sys.stderr)
+            return 1
+        if reply.get("ok"):
+            print(f"catmount: already running, {reply['result']}")
+        return 0 if reply.get("ok") else 1
+    try:
+        return mount_all(args, instance)
+    finally:
+        instance.release()
+
+
+def mount_all(args, instance):
+    try:
+        config = load_config(args.config)
+    except OSError as e:
+        print(f"catmount: cannot read config: {e}", file=sys.stderr)
+        return 1
+    names = args.remotes or config.names()
+    missing = [n for n in names if n not in config]
+    if missing:
+        print(f"catmount: not in config: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    backend = RcloneBackend(config, engine=args.engine)
+    try:
+        backend.bandwidth.configure(bwlimit=args.bwlimit, transfers=args.transfers, tps=args.tpslimit)
+    except ValueError as e:
+        print(f"catmount: {e}", file=sys.stderr)
+        return 1
+    if args.tpslimit and args.engine != "process":
+        print(f"catmount: warning: {TPS_PROCESS_ONLY}", file=sys.stderr)
+    for name in names:
+        backend.set_profile(name, args.profile)
+
+    jobs, skipped = [(n, i) for i, n in enumerate(names)], []
+    if args.probe_timeout > 0:
+        prober = Prober(backend, timeout=args.probe_timeout)
+        prober.run_now(names)
+        jobs, skipped = prober.triage(jobs)
+        for r in skipped:
+            print(f"[skip] {r.name}: {r}: {r.error}", flush=True)
+
+    def progress(batch, done, total):
+        for r in batch:
+            state = f"{r.mountpoint} {r.elapsed:.1f}s" if r.ok else f"FAILED {r.error}"
+            print(f"[{done}/{total}] {r.name}: {state}", flush=True)
+
+    results = MountScheduler(backend, workers=args.workers, deadline=args.deadline).run_now(
+        jobs, on_progress=progress)
+    ok = sum(1 for r in results if r.ok)
+    print(f"{ok}/{len(names)} mounted", flush=True)
+    if not ok:
+        # nothing to supervise: don't leave the rcd or the cache root behind
+        backend.shutdown()
+        return 1
+    if args.no_wait:
+        return 0 if ok == len(names) else 1
+
+    instance.serve(backend_handlers(backend))
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    supervisor = MountSupervisor(
+        backend, on_state=lambda n, s, d: print(f"{n}: {s} {d}", flush=True)).start()
+    tuner = PollTuner(backend, on_change=lambda n, r, c: print(f"{n}: {r:.1f} changes/h, {c}", flush=True)).start()
+    # the collector also drives bandwidth rebalancing, so it always runs
+    metrics = start_metrics(backend, port=args.metrics_port)
+    if metrics.server is not None:
+        print(f"metrics on http://127.0.0.1:{metrics.server.port}/metrics", flush=True)
+    reaper = IdleReaper(backend, metrics, idle_after=args.idle_after, max_active=args.max_active,
+                        on_state=lambda n, s, d: print(f"{n}: {s} {d}", flush=True)).start()
+    while not stop.wait(1):
+        pass
+    supervisor.stop()
+    tuner.stop()
+    reaper.stop()
+    metrics.stop()
+    backend.shutdown()
+    return 0
+
+
+def cmd_probe(args):
+    try:
+        config = load_config(args.config)
+    except OSError as e:
+        print(f"catmount: cannot read config: {e}", file=sys.stderr)
+        return 1
+    backend = RcloneBackend(config, engine="process")
+    results = Prober(backend, timeout=args.timeout).run_now(args.remotes or config.names())
+    results.sort(key=lambda r: (not r.ok, r.rtt))
+    if args.json:
+        print(json.dumps([{"remote": r.name, "ok": r.ok, "rtt": round(r.rtt, 3), "kind": r.kind,
+                           "error": r.error, "free": r.free} for r in results]))
+    else:
+        for r in results:
+            print(f"{r.name}\t{r}" + (f"\t{r.error}" if r.error else ""))
+    return 0 if all(r.ok for r in results) else 1
+
+
+def cmd_status(args):
+    reply = forward("status")
+    if reply is not None and reply.get("ok"):
+        rows = reply["result"]
+        if args.json:
+            print(json.dumps(rows))
+        else:
+            for row in rows:
+                print(f"{row['remote']}:\t{row['mountpoint'] or '-'}\t{row['state']}")
+            print(f"{len(rows)} remotes in the running instance")
+        return 0
+    mounts = rclone_mounts()
+    if args.json:
+        print(json.dumps([{"remote": src, "mountpoint": mp} for src, mp in mounts]))
+    else:
+        for src, mp in mounts:
+            print(f"{src}\t{mp}")
+        print(f"{len(mounts)} rclone mounts")
+    return 0
+
+
+def cmd_unmount(args):
+    if args.mountpoints or args.all:
+        reply = forward("unmount", *args.mountpoints)
+        if reply is not None:
+            if reply.get("ok"):
+                print(reply["result"])
+            return 0 if reply.get("ok") else 1
+    if os.name == "nt":
+        print("catmount: unmount needs the owning instance on Windows", file=sys.stderr)
+        return 1
+    targets = args.mountpoints or ([mp for _, mp in rclone_mounts()] if args.all else [])
+    if not targets:
+        print("catmount: nothing to unmount (give mountpoints or --all)", file=sys.stderr)
+        return 1
+    failed = [mp for mp in targets if not unmount_path(mp)]
+    for mp in failed:
+        print(f"catmount: failed to unmount {mp}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_gui(args):
+    import importlib
+    instance = claim("show")
+    if instance is None:
+        print("catmount: already running, raised its window")
+        return 0
+    module, cls = FRONTENDS[args.frontend]
+    getattr(importlib.import_module(module), cls)(instance).run()
+    return 0
+
+
+def cmd_startup_time(args):
+    """Median cold-start time of the headless and GUI import paths"""
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    targets = {"headless": "import catmount.cli"}
+    targets.update({name: f"import {mod}" for name, (mod, _) in FRONTENDS.items()})
+    results = {}
+    for name, code in targets.items():
+        runs = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            runs.append(time.perf_counter() - start)
+        results[name] = sorted(runs)[len(runs) // 2]
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for name, secs in results.items():
+            print(f"{name:10} {secs * 1000:7.1f} ms")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="catmount", description="Headless Cat's CloudMounter")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("mount-all", help="mount remotes and supervise them until interrupted")
+    p.add_argument("remotes", nargs="*", help="remote names (default: every section)")
+    p.add_argument("--config", default=os.environ.get("RCLONE_CONFIG", default_config_path()),
+                   help="rclone config file, '-' for stdin")
+    p.add_argument("--engine", choices=["auto", "rcd", "process"], default="auto")
+    p.add_argument("--profile", choices=PROFILE_NAMES, default="auto")
+    p.add_argument("--workers", type=int, default=WORKERS)
+    p.add_argument("--deadline", type=float, default=DEADLINE)
+    p.add_argument("--bwlimit", default=BWLIMIT,
+                   help="total bandwidth shared by all mounts: RATE or timetable '08:00,1M 23:00,off'")
+    p.add_argument("--transfers", type=int, default=TRANSFERS, help="total transfer slots (0 = no cap)")
+    p.add_argument("--tpslimit", default=None,
+                   help="API calls/s per provider, e.g. drive=10,dropbox=12 (per-process mounts only)")
+    p.add_argument("--idle-after", type=float, default=IDLE_AFTER,
+                   help="unmount remotes idle this many seconds, keeping their mountpoint (0 = never)")
+    p.add_argument("--max-active", type=int, default=MAX_ACTIVE, help="keep at most this many mounted (0 = no cap)")
+    p.add_argument("--probe-timeout", type=float, default=PROBE_TIMEOUT,
+                   help="list each remote's root first and skip ones that don't answer in time (0 = no probe)")
+    p.add_argument("--no-wait", action="store_true", help="exit once mounted, without supervising")
+    p.add_argument("--metrics-port", type=int, default=METRICS_PORT,
+                   help="serve Prometheus text metrics on 127.0.0.1:PORT")
+    p.set_defaults(func=cmd_mount_all)
+
+    p = sub.add_parser("probe", help="check every remote is reachable and measure its round trip")
+    p.add_argument("remotes", nargs="*", help="remote names (default: every section)")
+    p.add_argument("--config", default=os.environ.get("RCLONE_CONFIG", default_config_path()),
+                   help="rclone config file, '-' for stdin")
+    p.add_argument("--timeout", type=float, default=PROBE_TIMEOUT)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_probe)
+
+    p = sub.add_parser("status", help="list rclone mounts on this host")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("unmount", help="unmount rclone mountpoints")
+    p.add_argument("mountpoints", nargs="*")
+    p.add_argument("--all", action="store_true")
+    p.set_defaults(func=cmd_unmount)
+
+    p = sub.add_parser("gui", help="start a Tk frontend")
+    p.add_argument("frontend", nargs="?", choices=sorted(FRONTENDS), default="classic")
+    p.set_defaults(func=cmd_gui)
+
+    p = sub.add_parser("startup-time", help="measure cold-start time of each entry point")
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_startup_time)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except PermissionError as e:
+        print(f"catmount: {e}", file=sys.stderr)
+        return 1
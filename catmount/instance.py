@@ -0,0 +1,178 @@
+# ------------------- SINGLE INSTANCE -------------------
+# One catmount per user session owns the mounts. The first process takes
+# a lock and listens on a Unix socket (a named pipe on Windows); later
+# launches and CLI calls send their command there and exit. Messages are
+# JSON over multiprocessing.connection, one request and one reply each.
+
+import json
+import os
+import stat
+import tempfile
+import threading
+
+INSTANCE_NAME = os.environ.get("CATMOUNT_INSTANCE", "catmount")
+
+
+def runtime_dir():
+    path = os.environ.get("XDG_RUNTIME_DIR")
+    if path:
+        return path
+    # /tmp is shared: someone else may have made this name first (or made
+    # it a symlink) to catch our socket, so only a private dir of ours will do
+    path = os.path.join(tempfile.gettempdir(), f"catmount-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private directory owned by uid {os.getuid()}; refusing to use it")
+    return path
+
+
+def default_address(name=INSTANCE_NAME):
+    if os.name == "nt":
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\{name}-{user}"
+    return os.path.join(runtime_dir(), f"{name}.sock")
+
+
+class NoInstance(Exception):
+    """No running instance is listening"""
+
+
+def send(command, *args, address=None, timeout=10):
+    """Run `command` in the running instance and return its reply dict"""
+    from multiprocessing.connection import Client
+    try:
+        conn = Client(address or default_address())
+    except (OSError, EOFError) as e:
+        raise NoInstance(str(e)) from None
+    with conn:
+        conn.send_bytes(json.dumps({"command": command, "args": list(args)}).encode())
+        if not conn.poll(timeout):
+            raise TimeoutError(f"instance did not answer {command!r} in {timeout:g}s")
+        return json.loads(conn.recv_bytes())
+
+
+class SingleInstance:
+    def __init__(self, address=None):
+        self.address = address or default_address()
+        self.listener = None
+        self.lock_file = None
+        self.handlers = {}
+        self.thread = None
+
+    def acquire(self):
+        """Become the primary instance; False means another one already is"""
+        from multiprocessing.connection import Listener
+        if os.name != "nt":
+            import fcntl
+            self.lock_file = open(self.address + ".lock", "w")
+            try:
+                fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self.lock_file.close()
+                self.lock_file = None
+                return False
+            # we hold the lock, so any socket file left here is from a crash
+            try:
+                os.unlink(self.address)
+            except FileNotFoundError:
+                pass
+        try:
+            # on Windows creating the first pipe instance is itself the lock
+            self.listener = Listener(self.address)
+        except OSError:
+            self.release()
+            return False
+        return True
+
+    def serve(self, handlers):
+        """Answer requests on a daemon thread; handlers map command -> fn(*args) -> result"""
+        self.handlers = dict(handlers)
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def loop(self):
+        while self.listener is not None:
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError):
+                if self.listener is None:
+                    return
+                continue
+            threading.Thread(target=self.answer, args=(conn,), daemon=True).start()
+
+    def answer(self, conn):
+        with conn:
+            try:
+                if not conn.poll(5):
+                    return
+                request = json.loads(conn.recv_bytes(1 << 20))
+                handler = self.handlers.get(request.get("command"))
+                if handler is None:
+                    reply = {"ok": False, "error": f"unknown command {request.get('command')!r}"}
+                else:
+                    reply = {"ok": True, "result": handler(*request.get("args", []))}
+            except (OSError, EOFError):
+                return
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+            try:
+                conn.send_bytes(json.dumps(reply, default=str).encode())
+            except OSError:
+                pass
+
+    def release(self):
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.close()
+        if self.lock_file is not None:
+            self.lock_file.close()
+            self.lock_file = None
+
+
+def claim(command="show", *args, address=None):
+    """Primary SingleInstance, or None once `command` was handed to the running one"""
+    instance = SingleInstance(address)
+    if instance.acquire():
+        return instance
+    try:
+        send(command, *args, address=instance.address)
+    except (NoInstance, OSError, TimeoutError):
+        pass
+    return None
+
+
+def backend_handlers(backend):
+    """Default commands served for an RcloneBackend: mount, unmount, status"""
+    def mount(*names):
+        names = names or [n for n in backend.config.names() if n not in backend.mounts]
+        missing = [n for n in names if n not in backend.config]
+        if missing:
+            raise ValueError(f"not in config: {', '.join(missing)}")
+        for name in names:
+            backend.mount(name)
+        return f"mounting {', '.join(names)}"
+
+    def unmount(*names):
+        if not names:
+            report = backend.unmount_all()
+            return f"unmounted all: {report}"
+        # the CLI speaks mountpoints, the GUIs remote names; accept both
+        by_path = {mp: n for n, (mp, _) in backend.mounts.items()}
+        names = [by_path.get(n, n) for n in names]
+        for name in names:
+            backend.unmount(name)
+        return f"unmounted {', '.join(names)}"
+
+    def status():
+        rows = [{"remote": n, "mountpoint": mp, "state": "mounted"} for n, (mp, _) in backend.mounts.items()]
+        rows += [{"remote": n, "mountpoint": backend.mountpoints.get(n), "state": "idle"} for n in backend.idle]
+        rows += [{"remote": n, "mountpoint": None, "state": "failed", "error": backend.errors.get(n)}
+                 for n in backend.errors if n in backend.config and n not in backend.mounts and n not in backend.idle]
+        return rows
+
+    return {"mount": mount, "unmount": unmount, "status": status, "ping": lambda: "pong"}
@@ -0,0 +1,117 @@
+# ------------------- LOG CAPTURE -------------------
+# rclone runs with --use-json-log and its stderr piped into a reader
+# thread that keeps draining the pipe, so a chatty remote never blocks.
+# Each remote keeps its last LOG_LINES records in a ring buffer; errors,
+# retries and rate limits are tagged so the GUI can surface them.
+
+import collections
+import json
+import os
+import re
+import threading
+import time
+
+LOG_LINES = int(os.environ.get("CATMOUNT_LOG_LINES", "500"))
+LOG_LEVEL = os.environ.get("CATMOUNT_LOG_LEVEL", "NOTICE")
+MAX_LINE = 8192
+
+KINDS = {
+    "ratelimit": re.compile(r"rate ?limit|too many requests|\b429\b|quota exceeded|throttl", re.I),
+    "retry": re.compile(r"\bretry|attempt \d+/\d+ failed", re.I),
+}
+
+# plain-text fallback: "2024/01/02 15:04:05 ERROR : object: message"
+TEXT_LINE = re.compile(r"^(?:\S+ \S+ )?(DEBUG|INFO|NOTICE|ERROR|CRITICAL|EMERGENCY)\s*: (.*)$")
+
+
+class LogRecord:
+    __slots__ = ("time", "level", "kind", "object", "msg")
+
+    def __init__(self, time, level, kind, object, msg):
+        self.time = time
+        self.level = level
+        self.kind = kind
+        self.object = object
+        self.msg = msg
+
+    def __str__(self):
+        stamp = time.strftime("%H:%M:%S", time.localtime(self.time))
+        obj = f"{self.object}: " if self.object else ""
+        return f"{stamp} {self.level.upper():6} {obj}{self.msg}"
+
+
+def kind_of(level, msg):
+    for kind, pattern in KINDS.items():
+        if pattern.search(msg):
+            return kind
+    return "error" if level in ("error", "critical", "emergency") else "info"
+
+
+def parse_line(line):
+    """Turn one rclone log line (JSON or plain text) into a LogRecord"""
+    line = line.strip()
+    if not line:
+        return None
+    level, obj, msg = "notice", "", line
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+            level = str(data.get("level", level)).lower()
+            obj = str(data.get("object") or "")
+            msg = str(data.get("msg", line)).strip()
+        except ValueError:
+            pass
+    else:
+        m = TEXT_LINE.match(line)
+        if m:
+            level, msg = m.group(1).lower(), m.group(2)
+    return LogRecord(time.time(), level, kind_of(level, msg), obj, msg)
+
+
+class LogBuffer:
+    """Bounded per-remote log: every record plus counters per kind"""
+
+    def __init__(self, maxlen=LOG_LINES):
+        self.records = collections.deque(maxlen=maxlen)
+        self.counts = collections.Counter()
+        self.last_error = None
+        self.lock = threading.Lock()
+
+    def add(self, record):
+        with self.lock:
+            self.records.append(record)
+            self.counts[record.kind] += 1
+            if record.kind != "info":
+                self.last_error = record
+
+    def tail(self, n=None, kinds=None):
+        with self.lock:
+            records = list(self.records)
+        if kinds:
+            records = [r for r in records if r.kind in kinds]
+        return records[-n:] if n else records
+
+
+def capture(stream, on_record):
+    """Drain a binary pipe on a daemon thread, calling on_record per parsed line"""
+    def reader():
+        try:
+            with stream:
+                while True:
+                    raw = stream.readline(MAX_LINE)
+                    if not raw:
+                        break
+                    record = parse_line(raw.decode("utf-8", "replace"))
+                    if record is None:
+                        continue
+                    try:
+                        on_record(record)
+                    except Exception:
+                        # a broken callback must not close the pipe: rclone
+                        # would die of SIGPIPE on its next log line
+                        pass
+        except (OSError, ValueError):
+            pass
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    return thread
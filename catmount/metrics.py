@@ -0,0 +1,202 @@
+# ------------------- LIVE METRICS -------------------
+# Polls core/stats and vfs/stats over rc for every mount and keeps the
+# latest sample. Samples feed the GUI status columns and an optional
+# Prometheus text-exposition endpoint on localhost.
+
+import os
+import threading
+import time
+
+from .rcengine import RcError
+
+ENGINE = "(rcd)"
+METRICS_PORT = int(os.environ.get("CATMOUNT_METRICS_PORT", "0"))
+
+GAUGES = [
+    ("bytes_per_second", "speed", "Current transfer rate in bytes per second"),
+    ("transfers_in_flight", "transferring", "Transfers currently running"),
+    ("errors_total", "errors", "Errors counted by rclone since start"),
+    ("vfs_cache_bytes", "cache_bytes", "Bytes held in the VFS disk cache"),
+    ("vfs_cache_files", "cache_files", "Files held in the VFS disk cache"),
+    ("vfs_uploads_in_progress", "uploads_in_progress", "VFS cache uploads running"),
+    ("vfs_uploads_queued", "uploads_queued", "VFS cache uploads waiting (queue depth)"),
+    ("vfs_open_files", "open_files", "Files currently open through the mount"),
+    ("up", "up", "1 if the last scrape of this mount succeeded"),
+]
+
+
+class MountMetrics:
+    __slots__ = ("speed", "transferring", "errors", "cache_bytes", "cache_files",
+                 "uploads_in_progress", "uploads_queued", "open_files", "up", "at")
+
+    def __init__(self):
+        for slot in self.__slots__:
+            setattr(self, slot, 0)
+
+    @property
+    def uploads_pending(self):
+        return self.uploads_in_progress + self.uploads_queued
+
+    def add_core(self, stats):
+        self.speed = stats.get("speed") or 0
+        self.transferring = len(stats.get("transferring") or [])
+        self.errors = stats.get("errors") or 0
+
+    def add_core_fs(self, stats, fs):
+        # an rcd's core/stats covers every mount it serves: keep only the
+        # transfers touching this remote. Errors can't be split per remote,
+        # so the rcd exports them once under ENGINE and mounts leave them out.
+        mine = [t for t in stats.get("transferring") or []
+                if any(str(t.get(k) or "").startswith(fs) for k in ("srcFs", "dstFs"))]
+        self.speed = sum(t.get("speed") or 0 for t in mine)
+        self.transferring = len(mine)
+        self.errors = None
+
+    def add_vfs(self, stats):
+        cache = stats.get("diskCache") or {}
+        self.cache_bytes = cache.get("bytesUsed") or 0
+        self.cache_files = cache.get("files") or 0
+        self.uploads_in_progress = cache.get("uploadsInProgress") or 0
+        self.uploads_queued = cache.get("uploadsQueued") or 0
+        self.open_files = stats.get("inUse") or 0
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def summary(m):
+    """Short text for a status column"""
+    parts = [f"{format_bytes(m.speed)}/s"]
+    if m.transferring:
+        parts.append(f"{m.transferring} xfer")
+    if m.uploads_pending:
+        parts.append(f"{m.uploads_pending} up")
+    if m.errors:
+        parts.append(f"{m.errors} err")
+    return " • ".join(parts)
+
+
+class MetricsCollector:
+    def __init__(self, backend, interval=2.0, on_update=None, timeout=1.0):
+        self.backend = backend
+        self.interval = interval
+        self.on_update = on_update
+        self.timeout = timeout
+        self.latest = {}
+        self.server = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.server is not None:
+            self.server.close()
+
+    def loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                pass
+
+    def sample(self, client, fs=None, core=None):
+        """One mount's metrics; rcd mounts (fs set) take their transfers from the rcd's `core`"""
+        m = MountMetrics()
+        m.at = time.time()
+        try:
+            if fs is None:
+                m.add_core(client.call("core/stats", timeout=self.timeout))
+                m.add_vfs(client.call("vfs/stats", timeout=self.timeout))
+            else:
+                m.add_core_fs(core or {}, fs)
+                m.add_vfs(client.call("vfs/stats", timeout=self.timeout, fs=fs))
+            m.up = 1
+        except RcError:
+            m.up = 0
+        return m
+
+    def poll(self):
+        latest = {}
+        core = None
+        engine = self.backend.engine
+        if engine is not None and engine.available:
+            m = MountMetrics()
+            try:
+                core = engine.client.call("core/stats", timeout=self.timeout)
+                m.add_core(core)
+                m.up = 1
+            except RcError:
+                pass
+            m.at = time.time()
+            latest[ENGINE] = m
+        for name in list(self.backend.mounts):
+            client, fs = self.backend.rc_client(name)
+            if client is not None:
+                latest[name] = self.sample(client, fs, core)
+        self.latest = latest
+        self.backend.cache.observe(latest)
+        self.backend.bandwidth.observe(latest)
+        if self.on_update:
+            self.on_update(latest)
+        return latest
+
+    def exposition(self):
+        latest = self.latest
+        lines = []
+        for metric, attr, help_text in GAUGES:
+            lines.append(f"# HELP catmount_{metric} {help_text}")
+            lines.append(f"# TYPE catmount_{metric} {'counter' if metric.endswith('_total') else 'gauge'}")
+            for name, m in sorted(latest.items()):
+                if getattr(m, attr) is None:
+                    continue
+                label = name.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'catmount_{metric}{{remote="{label}"}} {getattr(m, attr)}')
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics(backend, on_update=None, port=METRICS_PORT):
+    """Collector plus, when a port is configured, the exposition endpoint"""
+    collector = MetricsCollector(backend, on_update=on_update).start()
+    collector.server = MetricsServer(collector, port) if port else None
+    return collector
+
+
+class MetricsServer:
+    """Serves collector.exposition() at http://host:port/metrics"""
+
+    def __init__(self, collector, port, host="127.0.0.1"):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = collector.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
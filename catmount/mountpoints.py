@@ -0,0 +1,121 @@
+# ------------------- MOUNTPOINT ALLOCATOR -------------------
+# Hands out one mountpoint per remote and takes it back on release.
+# Windows: free drive letters Z..D first, then directories under the
+# runtime root (WinFsp wants them not to exist yet). POSIX: a directory
+# per remote under $XDG_RUNTIME_DIR/catmount, created and removed here.
+# A remote keeps its slot until released, so restarts land in the same place.
+
+import os
+import re
+import shutil
+import string
+import subprocess
+import tempfile
+import threading
+
+from .readiness import read_mountinfo
+
+
+def default_root():
+    if os.name == "nt":
+        return os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), "catmount", "mnt")
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "catmount")
+    return os.path.join(tempfile.gettempdir(), f"catmount-{os.getuid()}")
+
+
+MOUNT_ROOT = os.environ.get("CATMOUNT_MOUNT_ROOT") or default_root()
+LETTERS = string.ascii_uppercase[25:2:-1]
+
+
+def used_drive_letters():
+    import ctypes
+    mask = ctypes.windll.kernel32.GetLogicalDrives()
+    return {string.ascii_uppercase[i] for i in range(26) if mask >> i & 1}
+
+
+def unmount_path(mountpoint, lazy=False):
+    for tool in (["fusermount3", "-u"], ["fusermount", "-u"], ["umount"]):
+        if shutil.which(tool[0]):
+            if lazy:
+                tool = tool + (["-z"] if tool[0].startswith("fusermount") else ["-l"])
+            return subprocess.call(tool + [mountpoint], stderr=subprocess.DEVNULL) == 0
+    return False
+
+
+class MountpointAllocator:
+    def __init__(self, root=MOUNT_ROOT, use_letters=None):
+        self.root = root
+        self.use_letters = os.name == "nt" if use_letters is None else use_letters
+        self.reserved = {}
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        return self.reserved.get(name)
+
+    def _slug(self, name):
+        return re.sub(r"[^\w.-]", "_", name) or "remote"
+
+    def _free_letter(self, taken):
+        try:
+            present = used_drive_letters()
+        except (AttributeError, OSError):
+            present = set()
+        for letter in LETTERS:
+            mp = letter + ":"
+            if mp not in taken and letter not in present:
+                return mp
+        return None
+
+    def _free_dir(self, name, taken):
+        slug = self._slug(name)
+        mounted = read_mountinfo() or set()
+        for i in range(1, 10000):
+            path = os.path.join(self.root, slug if i == 1 else f"{slug}-{i}")
+            if path in taken or path in mounted:
+                continue
+            if os.name == "nt":
+                if not os.path.exists(path):
+                    return path
+            elif not os.path.isdir(path) or not os.listdir(path):
+                return path
+        raise RuntimeError(f"no free mountpoint for {name}")
+
+    def allocate(self, name):
+        """Return the remote's reserved mountpoint, reserving a free one if needed"""
+        with self.lock:
+            mp = self.reserved.get(name)
+            if mp is not None:
+                self.clear_stale(mp)
+                return mp
+            taken = set(self.reserved.values())
+            mp = self._free_letter(taken) if self.use_letters else None
+            if mp is None:
+                mp = self._free_dir(name, taken)
+                os.makedirs(self.root if os.name == "nt" else mp, exist_ok=True)
+            self.reserved[name] = mp
+            return mp
+
+    def clear_stale(self, mp):
+        """Detach a FUSE mount left behind by a dead rclone before reusing it"""
+        if os.name != "nt" and mp in (read_mountinfo() or ()):
+            unmount_path(mp, lazy=True)
+
+    def release(self, name, mountpoint=None):
+        """Free the remote's slot; with `mountpoint`, only if that is still its slot"""
+        with self.lock:
+            if mountpoint is not None and self.reserved.get(name) != mountpoint:
+                return
+            mp = self.reserved.pop(name, None)
+        if mp is None or os.name == "nt":
+            return
+        self.clear_stale(mp)
+        try:
+            os.rmdir(mp)
+        except OSError:
+            pass
+
+    def release_all(self):
+        for name in list(self.reserved):
+            self.release(name)
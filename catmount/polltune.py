@@ -0,0 +1,141 @@
+# ------------------- ADAPTIVE POLL TUNING -------------------
+# Samples each mounted remote's top-level listing over rc and tracks how
+# often it actually changes. Quiet remotes drift towards long poll and
+# dir-cache times (fewer API calls, fewer 429s), busy ones towards short.
+# Poll interval is set live with rc vfs/poll-interval where the backend
+# supports it; dir-cache time can only change at mount time, so it is
+# stored in backend.tuning and picked up by the next mount.
+
+import os
+import threading
+import time
+
+from . import profiles
+from .profiles import format_duration, parse_duration
+from .rcengine import RcError
+
+SECOND = 10 ** 9
+POLL_MIN = parse_duration(os.environ.get("CATMOUNT_POLL_MIN", "10s"))
+POLL_MAX = parse_duration(os.environ.get("CATMOUNT_POLL_MAX", "10m"))
+DIR_CACHE_MIN = parse_duration(os.environ.get("CATMOUNT_DIR_CACHE_MIN", "30s"))
+DIR_CACHE_MAX = parse_duration(os.environ.get("CATMOUNT_DIR_CACHE_MAX", "1h"))
+
+
+def clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class ChangeRate:
+    """Exponentially weighted changes-per-hour estimate from listing samples"""
+    __slots__ = ("fingerprint", "at", "rate", "samples")
+
+    def __init__(self):
+        self.fingerprint = None
+        self.at = None
+        self.rate = 0.0
+        self.samples = 0
+
+    def observe(self, fingerprint, now, smoothing=0.3):
+        if self.at is not None:
+            changed = fingerprint != self.fingerprint
+            instant = 3600.0 / max(now - self.at, 1.0) if changed else 0.0
+            self.rate += smoothing * (instant - self.rate)
+            self.samples += 1
+        self.fingerprint, self.at = fingerprint, now
+
+
+class PollTuner:
+    def __init__(self, backend, on_change=None, interval=30.0, min_samples=3,
+                 poll_bounds=(POLL_MIN, POLL_MAX), dir_cache_bounds=(DIR_CACHE_MIN, DIR_CACHE_MAX)):
+        self.backend = backend
+        self.on_change = on_change
+        self.interval = interval
+        self.min_samples = min_samples
+        self.poll_bounds = poll_bounds
+        self.dir_cache_bounds = dir_cache_bounds
+        self.rates = {}
+        self.due = {}
+        self.live = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def current(self, name, key):
+        value = self.backend.tuning.get(name, {}).get(key)
+        if value is None:
+            value = profiles.resolve(self.backend.profiles.get(name, "default")).get(key, "0")
+        return parse_duration(value)
+
+    def tick(self):
+        now = time.monotonic()
+        for name in list(self.backend.mounts):
+            if now < self.due.get(name, 0):
+                continue
+            client, fs = self.backend.rc_client(name)
+            if client is None:
+                continue
+            try:
+                listing = client.call("operations/list", timeout=30, fs=f"{name}:", remote="")
+            except RcError:
+                continue
+            entries = listing.get("list") or []
+            rate = self.rates.setdefault(name, ChangeRate())
+            rate.observe(hash(tuple(sorted((e.get("Path"), e.get("Size"), e.get("ModTime"))
+                                           for e in entries))), now)
+            if rate.samples >= self.min_samples:
+                self.retune(name, rate.rate, client, fs)
+            # sample about twice per (possibly just retuned) poll period, but
+            # never more than once a minute
+            poll = self.current(name, "poll_interval") or self.poll_bounds[1]
+            self.due[name] = now + clamp(poll / 2 / SECOND, 60, 900)
+        for name in list(self.rates):
+            if name not in self.backend.wanted:
+                self.rates.pop(name, None)
+                self.due.pop(name, None)
+
+    def targets(self, rate, polling=True):
+        """(poll, dir_cache) in ns for `rate` changes per hour"""
+        hour = 3600 * SECOND
+        poll = clamp(int(hour / 4 / rate) if rate > 0 else self.poll_bounds[1], *self.poll_bounds)
+        if polling:
+            # change notifications invalidate the dir cache, so it can stay warm longer
+            dir_cache = clamp(poll * 10, *self.dir_cache_bounds)
+        else:
+            dir_cache = clamp(int(hour / 2 / rate) if rate > 0 else self.dir_cache_bounds[1],
+                              *self.dir_cache_bounds)
+        return poll, dir_cache
+
+    def retune(self, name, rate, client, fs, tolerance=0.25):
+        poll, dir_cache = self.targets(rate, self.live.get(name, True))
+        tuning = self.backend.tuning.setdefault(name, {})
+        changed = {}
+        old_poll = self.current(name, "poll_interval")
+        if abs(poll - old_poll) > tolerance * max(old_poll, 1):
+            params = {"fs": fs} if fs else {}
+            try:
+                client.call("vfs/poll-interval", timeout=5, interval=format_duration(poll), **params)
+                self.live[name] = True
+            except RcError:
+                # backend has no change notifications; only the dir cache matters
+                self.live[name] = False
+            tuning["poll_interval"] = changed["poll_interval"] = format_duration(poll)
+        old_dir = self.current(name, "dir_cache_time")
+        if abs(dir_cache - old_dir) > tolerance * max(old_dir, 1):
+            tuning["dir_cache_time"] = changed["dir_cache_time"] = format_duration(dir_cache)
+        if changed and self.on_change is not None:
+            self.on_change(name, rate, changed)
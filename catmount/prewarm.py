@@ -0,0 +1,127 @@
+# ------------------- DIRECTORY PRE-WARM -------------------
+# After a mount is served, walk the directories the user asked for with
+# rc vfs/refresh so the first Explorer/ls listing comes from the dir
+# cache. One background thread works through remotes one at a time with
+# a pause between calls so it never competes with mounting.
+
+import os
+import queue
+import threading
+import time
+
+from .rcengine import RcError
+
+
+def parse_paths(text):
+    """"Photos, Docs/Work" -> ["Photos", "Docs/Work"]; "/" means the whole remote"""
+    paths = []
+    for part in str(text or "").replace(";", ",").split(","):
+        part = part.strip()
+        if part:
+            paths.append(part.strip("/"))
+    return paths
+
+
+class Prewarmer:
+    def __init__(self, backend, on_progress=None, pause=0.05, timeout=600, idle=1.0):
+        self.backend = backend
+        self.on_progress = on_progress
+        self.pause = pause
+        self.timeout = timeout
+        self.idle = idle
+        self.specs = {}
+        self.queue = queue.SimpleQueue()
+        self.cancelled = set()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def configure(self, name, paths, depth=0):
+        """Pre-warm `paths` of `name` after each mount; depth 0 refreshes whole subtrees"""
+        paths = parse_paths(paths) if isinstance(paths, str) else list(paths)
+        if paths:
+            self.specs[name] = (paths, max(0, int(depth)))
+        else:
+            self.specs.pop(name, None)
+
+    def submit(self, name):
+        if name not in self.specs:
+            return False
+        self.cancelled.discard(name)
+        self.queue.put(name)
+        # the worker decides to exit under the same lock, so either it sees
+        # this name in the queue or we see it gone and start a new one
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+        return True
+
+    def cancel(self, name):
+        self.cancelled.add(name)
+
+    def emit(self, name, done, total, detail=""):
+        if self.on_progress is not None:
+            self.on_progress(name, done, total, detail)
+
+    def run(self):
+        while True:
+            try:
+                name = self.queue.get(timeout=self.idle)
+            except queue.Empty:
+                with self.lock:
+                    if self.queue.empty():
+                        self.thread = None
+                        return
+                continue
+            if name in self.cancelled or name not in self.specs:
+                continue
+            try:
+                self.warm(name, *self.specs[name])
+            except RcError as e:
+                self.emit(name, 0, 0, f"failed: {e}")
+
+    def warm(self, name, paths, depth):
+        client, fs = self.backend.rc_client(name)
+        mountpoint = self.backend.mounts.get(name, (None,))[0]
+        if client is None or mountpoint is None:
+            return
+        base = {"fs": fs} if fs else {}
+        start, done, total = time.monotonic(), 0, len(paths)
+        if not depth:
+            for path in paths:
+                if name in self.cancelled:
+                    return
+                self.refresh(client, base, [path], recursive=True)
+                done += 1
+                self.emit(name, done, total, path or "/")
+                time.sleep(self.pause)
+        else:
+            level = paths
+            for _ in range(depth):
+                if not level or name in self.cancelled:
+                    break
+                self.refresh(client, base, level)
+                done += len(level)
+                self.emit(name, done, total, level[-1] or "/")
+                level = self.children(mountpoint, level)
+                total += len(level)
+                time.sleep(self.pause)
+        self.emit(name, done, done, f"done in {time.monotonic() - start:.1f}s")
+
+    def refresh(self, client, base, dirs, recursive=False):
+        # vfs/refresh takes dir, dir2, dir3... in one call
+        params = dict(base, recursive=recursive)
+        for i, path in enumerate(dirs):
+            params["dir" if i == 0 else f"dir{i + 1}"] = path
+        client.call("vfs/refresh", timeout=self.timeout, **params)
+
+    def children(self, mountpoint, dirs):
+        # the listing we just refreshed is cached, so scanning it is cheap
+        found = []
+        for path in dirs:
+            try:
+                with os.scandir(os.path.join(mountpoint + os.sep, path)) as it:
+                    found += [f"{path}/{e.name}".lstrip("/") for e in it if e.is_dir()]
+            except OSError:
+                pass
+        return found
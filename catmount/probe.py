@@ -0,0 +1,145 @@
+# ------------------- REACHABILITY PROBE -------------------
+# Lists the root of every remote at once before mounting, each with its
+# own timeout, and records round-trip time and why it failed. mount_all
+# then skips remotes that can't be reached and mounts slow ones last, so
+# a dead backend no longer ties up a worker until the ready timeout.
+
+import os
+import subprocess
+import threading
+import time
+
+from .rcengine import RcError
+from .supervisor import classify
+
+PROBE_TIMEOUT = float(os.environ.get("CATMOUNT_PROBE_TIMEOUT", "8"))
+PROBE_SLOW = float(os.environ.get("CATMOUNT_PROBE_SLOW", "2"))
+PROBE_WORKERS = int(os.environ.get("CATMOUNT_PROBE_WORKERS", "16"))
+# results younger than this are reused by mount_all instead of probing again
+PROBE_MAX_AGE = float(os.environ.get("CATMOUNT_PROBE_MAX_AGE", "60"))
+
+
+class ProbeError(Exception):
+    def __init__(self, message, returncode=None):
+        super().__init__(message)
+        self.returncode = returncode
+
+
+class ProbeResult:
+    __slots__ = ("name", "ok", "rtt", "kind", "error", "free", "when")
+
+    def __init__(self, name, ok, rtt=0.0, kind=None, error=None, free=None):
+        self.name = name
+        self.ok = ok
+        self.rtt = rtt
+        self.kind = kind
+        self.error = error
+        self.free = free
+        self.when = time.time()
+
+    @property
+    def slow(self):
+        return self.ok and self.rtt >= PROBE_SLOW
+
+    def __str__(self):
+        if not self.ok:
+            return f"unreachable ({self.kind})"
+        return f"{self.rtt * 1000:.0f} ms" + (" (slow)" if self.slow else "")
+
+
+class Prober:
+    def __init__(self, backend, timeout=PROBE_TIMEOUT, workers=PROBE_WORKERS):
+        self.backend = backend
+        self.timeout = timeout
+        self.workers = max(1, workers)
+        self.results = {}
+
+    def probe(self, name):
+        """List the remote's root (and ask for quota over rc); never raises"""
+        start = time.monotonic()
+        try:
+            engine = self.backend.get_engine()
+        except Exception:
+            engine = None
+        try:
+            if engine is not None:
+                free = self.probe_rc(engine, name)
+            else:
+                free = self.probe_cli(name)
+        except subprocess.TimeoutExpired:
+            result = ProbeResult(name, False, self.timeout, "timeout", f"no answer in {self.timeout:g}s")
+        except (ProbeError, RcError, OSError) as e:
+            kind = classify(getattr(e, "returncode", None), str(e))
+            result = ProbeResult(name, False, time.monotonic() - start, kind, str(e))
+        else:
+            result = ProbeResult(name, True, time.monotonic() - start, free=free)
+        self.results[name] = result
+        return result
+
+    def probe_rc(self, engine, name):
+        engine.sync_deps(name)
+        # one low-level try: we want to know it's down, not wait out retries
+        try:
+            engine.client.call("operations/list", timeout=self.timeout, fs=f"{name}:", remote="",
+                               _config={"LowLevelRetries": 1})
+        except RcError as e:
+            if "timed out" in str(e):
+                raise subprocess.TimeoutExpired("operations/list", self.timeout) from None
+            raise ProbeError(str(e)) from None
+        try:
+            # many backends (s3, crypt...) have no about; that's not a failure
+            return engine.client.call("operations/about", timeout=self.timeout, fs=f"{name}:").get("free")
+        except RcError:
+            return None
+
+    def probe_cli(self, name):
+        cmd = ["rclone", "lsjson", "--max-depth", "1", "--config=-", "--low-level-retries", "1",
+               "--contimeout", f"{self.timeout:g}s", f"{name}:"]
+        out = subprocess.run(cmd, input=self.backend.config.scoped(name), capture_output=True,
+                             text=True, timeout=self.timeout)
+        if out.returncode != 0:
+            lines = out.stderr.strip().splitlines()
+            raise ProbeError(lines[-1] if lines else f"rclone exited with code {out.returncode}", out.returncode)
+        return None
+
+    def run(self, names, on_result=None, on_done=None):
+        """Probe in the background and return the thread"""
+        thread = threading.Thread(target=self.run_now, args=(names, on_result, on_done), daemon=True)
+        thread.start()
+        return thread
+
+    def run_now(self, names, on_result=None, on_done=None):
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        names = list(dict.fromkeys(names))
+        results = []
+        if names:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(names)),
+                                    thread_name_prefix="probe") as pool:
+                for fut in as_completed([pool.submit(self.probe, n) for n in names]):
+                    results.append(fut.result())
+                    if on_result:
+                        on_result(results[-1])
+        if on_done:
+            on_done(results)
+        return results
+
+    def stale(self, names, max_age=PROBE_MAX_AGE):
+        """Names with no probe result younger than max_age seconds"""
+        now = time.time()
+        return [n for n in names if n not in self.results or now - self.results[n].when > max_age]
+
+    def triage(self, jobs):
+        """Split (name, priority) jobs into ones worth mounting and unreachable ones
+
+        Slow remotes keep their relative order but go after the fast ones;
+        remotes that were never probed are treated as fast.
+        """
+        keep, skipped = [], []
+        for name, priority in jobs:
+            result = self.results.get(name)
+            if result is not None and not result.ok:
+                skipped.append(result)
+            else:
+                keep.append((name, priority, result is not None and result.slow))
+        keep.sort(key=lambda j: (j[2], j[1]))
+        return [(name, rank) for rank, (name, _, _) in enumerate(keep)], skipped
@@ -0,0 +1,174 @@
+# ------------------- VFS PERFORMANCE PROFILES -------------------
+# Named mount tunings. Values are written the way rclone flags take them
+# ("64M", "5m") and converted to bytes/nanoseconds for rc vfsOpt/_config.
+
+import os
+import re
+
+PROFILES = {
+    "default": {
+        "cache_mode": "full", "buffer_size": "16M", "read_ahead": "0",
+        "chunk_size": "128M", "transfers": 4, "checkers": 8,
+        "cache_max_size": "off", "cache_max_age": "1h",
+        "dir_cache_time": "5m", "poll_interval": "30s",
+    },
+    "streaming": {
+        "cache_mode": "full", "buffer_size": "64M", "read_ahead": "256M",
+        "chunk_size": "32M", "transfers": 4, "checkers": 8,
+        "cache_max_size": "10G", "cache_max_age": "6h",
+        "dir_cache_time": "30m", "poll_interval": "1m",
+    },
+    "small-files": {
+        "cache_mode": "full", "buffer_size": "1M", "read_ahead": "0",
+        "chunk_size": "1M", "transfers": 16, "checkers": 32,
+        "cache_max_size": "2G", "cache_max_age": "24h",
+        "dir_cache_time": "1h", "poll_interval": "30s",
+    },
+    "bulk-archive": {
+        "cache_mode": "writes", "buffer_size": "16M", "read_ahead": "0",
+        "chunk_size": "256M", "transfers": 8, "checkers": 8,
+        "cache_max_size": "1G", "cache_max_age": "10m",
+        "dir_cache_time": "12h", "poll_interval": "10m",
+    },
+}
+
+PROFILE_NAMES = ["auto"] + list(PROFILES)
+
+FLAGS = {
+    "cache_mode": "--vfs-cache-mode", "buffer_size": "--buffer-size",
+    "read_ahead": "--vfs-read-ahead", "chunk_size": "--vfs-read-chunk-size",
+    "transfers": "--transfers", "checkers": "--checkers",
+    "cache_max_size": "--vfs-cache-max-size", "cache_max_age": "--vfs-cache-max-age",
+    "dir_cache_time": "--dir-cache-time", "poll_interval": "--poll-interval",
+}
+
+VFS_KEYS = {
+    "cache_mode": "CacheMode", "read_ahead": "ReadAhead", "chunk_size": "ChunkSize",
+    "cache_max_size": "CacheMaxSize", "cache_max_age": "CacheMaxAge",
+    "dir_cache_time": "DirCacheTime", "poll_interval": "PollInterval",
+}
+
+MAIN_KEYS = {"buffer_size": "BufferSize", "transfers": "Transfers", "checkers": "Checkers"}
+
+SIZE_UNITS = {"": 1024, "B": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+TIME_UNITS = {"ms": 10 ** 6, "s": 10 ** 9, "m": 60 * 10 ** 9, "h": 3600 * 10 ** 9, "d": 86400 * 10 ** 9}
+
+SIZE_KEYS = {"buffer_size", "read_ahead", "chunk_size", "cache_max_size"}
+TIME_KEYS = {"cache_max_age", "dir_cache_time", "poll_interval"}
+
+
+def parse_size(value):
+    """rclone SizeSuffix ("64M", "off") to bytes; -1 means unlimited"""
+    value = str(value).strip()
+    if value.lower() == "off":
+        return -1
+    m = re.fullmatch(r"([\d.]+)\s*([BKMGT]?)i?B?", value, re.I)
+    if not m:
+        raise ValueError(f"bad size: {value}")
+    return int(float(m.group(1)) * SIZE_UNITS[m.group(2).upper()])
+
+
+def parse_duration(value):
+    """rclone Duration ("5m", "1h30m") to nanoseconds"""
+    total = 0
+    for num, unit in re.findall(r"([\d.]+)(ms|s|m|h|d)", str(value)):
+        total += int(float(num) * TIME_UNITS[unit])
+    if not total and str(value).strip("0") not in ("", "s"):
+        raise ValueError(f"bad duration: {value}")
+    return total
+
+
+def format_size(n):
+    for unit in ("G", "M", "K"):
+        if n >= SIZE_UNITS[unit] and n % SIZE_UNITS[unit] == 0:
+            return f"{n // SIZE_UNITS[unit]}{unit}"
+    return f"{n}B"
+
+
+def format_duration(ns):
+    seconds = max(0, int(ns // 10 ** 9))
+    for unit, size in (("h", 3600), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+def available_memory():
+    """Best-effort free physical memory in bytes"""
+    if os.name == "nt":
+        import ctypes
+
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        stat = MEMORYSTATUSEX()
+        stat.dwLength = ctypes.sizeof(stat)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(stat))
+        return stat.ullAvailPhys
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 2 * 1024 ** 3
+
+
+def auto_profile(active_mounts=1, memory=None):
+    """Size cache and buffers from free RAM shared across active mounts"""
+    memory = available_memory() if memory is None else memory
+    share = memory // 4 // max(1, active_mounts)
+    mib = 1024 ** 2
+    cache = min(max(share, 256 * mib), 16 * 1024 * mib) // mib * mib
+    buffer = min(max(cache // 64, 4 * mib), 64 * mib) // mib * mib
+    cpus = os.cpu_count() or 2
+    profile = dict(PROFILES["default"])
+    profile.update({
+        "buffer_size": format_size(buffer), "read_ahead": format_size(buffer * 2),
+        "chunk_size": format_size(min(buffer * 4, 128 * mib)),
+        "transfers": min(max(cpus, 4), 16), "checkers": min(max(cpus * 2, 8), 32),
+        "cache_max_size": format_size(cache),
+    })
+    return profile
+
+
+def resolve(profile, active_mounts=1):
+    if isinstance(profile, dict):
+        return profile
+    if profile in (None, "", "auto"):
+        return auto_profile(active_mounts)
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"unknown profile: {profile}") from None
+
+
+def mount_flags(profile):
+    flags = []
+    for key, flag in FLAGS.items():
+        if key in profile:
+            flags += [flag, str(profile[key])]
+    return flags
+
+
+def _rc_value(key, value):
+    if key in SIZE_KEYS:
+        return parse_size(value)
+    if key in TIME_KEYS:
+        return parse_duration(value)
+    return value
+
+
+def vfs_opt(profile):
+    return {rc: _rc_value(key, profile[key]) for key, rc in VFS_KEYS.items() if key in profile}
+
+
+def main_opt(profile):
+    return {rc: _rc_value(key, profile[key]) for key, rc in MAIN_KEYS.items() if key in profile}
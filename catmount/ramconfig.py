@@ -0,0 +1,148 @@
+# ------------------- RAM-ONLY RCLONE CONFIG -------------------
+# Sections live in a dict keyed by remote name; the INI text handed to
+# rclone is rebuilt only when something changed since the last get().
+
+import threading
+
+# Options that point at other remotes: crypt/alias/chunker/compress/hasher
+# use `remote`, union/combine use space-separated `upstreams`.
+REFERENCE_KEYS = ("remote", "upstreams")
+
+
+def parse_ini(text):
+    """Parse rclone INI text into an ordered {name: {key: value}} dict"""
+    sections = {}
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            current = sections.setdefault(line[1:-1].strip(), {})
+        elif current is not None and "=" in line:
+            key, _, value = line.partition("=")
+            current[key.strip()] = value.strip()
+    return sections
+
+
+def referenced_remotes(options):
+    """Names of remotes an options dict points at, e.g. crypt's `remote = gd:secret`"""
+    found = []
+    for key in REFERENCE_KEYS:
+        for token in options.get(key, "").split():
+            if options.get("type") == "combine" and "=" in token:
+                token = token.split("=", 1)[1]
+            if ":" in token and not token.startswith(":"):
+                name = token.split(":", 1)[0]
+                if name not in found:
+                    found.append(name)
+    return found
+
+
+def format_section(name, options):
+    lines = [f"[{name}]"]
+    lines += [f"{k} = {v}" for k, v in options.items()]
+    return "\n".join(lines) + "\n"
+
+
+class RamConfig:
+    def __init__(self, text=""):
+        self.sections = {}
+        self.version = 0
+        self.lock = threading.RLock()
+        self._text = ""
+        self._text_version = 0
+        self._scoped = {}
+        if text:
+            self.merge(text)
+
+    def _touch(self):
+        self.version += 1
+
+    def add_remote(self, name, rtype, **options):
+        with self.lock:
+            self.sections[name] = {"type": rtype, **{k: str(v) for k, v in options.items()}}
+            self._touch()
+        return name
+
+    def update_remote(self, name, **options):
+        with self.lock:
+            section = self.sections[name]
+            section.update({k: str(v) for k, v in options.items()})
+            self._touch()
+
+    def remove_remote(self, name):
+        with self.lock:
+            if self.sections.pop(name, None) is None:
+                return False
+            self._touch()
+            return True
+
+    def get_remote(self, name):
+        with self.lock:
+            section = self.sections.get(name)
+            return dict(section) if section is not None else None
+
+    def has_remote(self, name):
+        return name in self.sections
+
+    __contains__ = has_remote
+
+    def __len__(self):
+        return len(self.sections)
+
+    def names(self):
+        with self.lock:
+            return list(self.sections)
+
+    def merge(self, text):
+        """Add or replace every section found in an INI fragment"""
+        parsed = parse_ini(text)
+        with self.lock:
+            self.sections.update(parsed)
+            if parsed:
+                self._touch()
+        return list(parsed)
+
+    def load(self, text):
+        """Replace the whole config with the contents of an INI file"""
+        with self.lock:
+            self.sections = parse_ini(text)
+            self._touch()
+        return self.names()
+
+    def get(self):
+        with self.lock:
+            if self._text_version != self.version:
+                self._text = "\n".join(format_section(n, o) for n, o in self.sections.items())
+                self._text_version = self.version
+            return self._text
+
+    def resolve(self, name):
+        """name plus every remote it depends on, dependencies first"""
+        order, seen = [], set()
+        with self.lock:
+            def visit(n):
+                if n in seen or n not in self.sections:
+                    return
+                seen.add(n)
+                for dep in referenced_remotes(self.sections[n]):
+                    visit(dep)
+                order.append(n)
+            visit(name)
+        return order
+
+    def scoped(self, name):
+        """INI text holding only `name` and the remotes it wraps"""
+        with self.lock:
+            cached = self._scoped.get(name)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            text = "\n".join(format_section(n, self.sections[n]) for n in self.resolve(name))
+            self._scoped[name] = (self.version, text)
+            return text
+
+    def clear(self):
+        with self.lock:
+            self.sections.clear()
+            self._touch()
@@ -0,0 +1,170 @@
+# ------------------- RCLONE RCD ENGINE -------------------
+# One long-lived `rclone rcd` owns every mount; we drive it over the
+# remote-control HTTP API instead of spawning `rclone mount` per remote.
+
+import base64
+import json
+import os
+import shutil
+import socket
+import subprocess
+import time
+
+from .logcapture import LOG_LEVEL, capture
+
+
+class RcError(Exception):
+    def __init__(self, method, message, status=None):
+        super().__init__(f"{method}: {message}")
+        self.method = method
+        self.status = status
+
+
+class RcClient:
+    def __init__(self, url, user=None, password=None, timeout=10):
+        self.url = url.rstrip("/") + "/"
+        self.timeout = timeout
+        self.auth = None
+        if user:
+            token = base64.b64encode(f"{user}:{password or ''}".encode()).decode()
+            self.auth = f"Basic {token}"
+
+    def call(self, method, timeout=None, **params):
+        # urllib.request pulls in http.client/email; keep it off the startup path
+        import http.client
+        import urllib.error
+        import urllib.request
+        req = urllib.request.Request(self.url + method, data=json.dumps(params).encode(),
+                                     headers={"Content-Type": "application/json"})
+        if self.auth:
+            req.add_header("Authorization", self.auth)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout or self.timeout) as resp:
+                body = resp.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except Exception:
+                message = e.reason
+            raise RcError(method, message, e.code) from None
+        except (urllib.error.URLError, OSError) as e:
+            raise RcError(method, str(getattr(e, "reason", e))) from None
+        except http.client.HTTPException as e:
+            # e.g. core/quit: the daemon may exit before the reply is complete
+            raise RcError(method, f"{type(e).__name__}: {e}") from None
+        return json.loads(body) if body else {}
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rc_env(user, password):
+    """Child environment carrying rc credentials, which rclone reads like --rc-user/--rc-pass"""
+    return dict(os.environ, RCLONE_RC_USER=user, RCLONE_RC_PASS=password)
+
+
+class RcdEngine:
+    """Single rclone rcd daemon serving all mounts through mount/* calls"""
+
+    def __init__(self, config, url=None, user=None, password=None, on_record=None, cache_dir=None):
+        self.config = config
+        self.on_record = on_record
+        self.cache_dir = cache_dir
+        self.proc = None
+        self.client = RcClient(url, user, password) if url else None
+        self.synced = {}
+
+    @property
+    def available(self):
+        if self.client is None:
+            return False
+        return self.proc is None or self.proc.poll() is None
+
+    def start(self, timeout=10):
+        if self.client is None:
+            if not shutil.which("rclone"):
+                return False
+            import secrets
+            port, user, password = free_port(), "cat", secrets.token_urlsafe(16)
+            flags = ["rclone", "rcd", f"--rc-addr=127.0.0.1:{port}", "--config=-",
+                     "--use-json-log", f"--log-level={LOG_LEVEL}"]
+            if self.cache_dir:
+                flags.append(f"--cache-dir={self.cache_dir}")
+            try:
+                # credentials go in the environment: argv is world-readable in /proc
+                self.proc = subprocess.Popen(flags, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                             stderr=subprocess.PIPE, env=rc_env(user, password),
+                                             creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0)
+                self.proc.stdin.close()
+                capture(self.proc.stderr, self.on_record or (lambda record: None))
+            except OSError:
+                self.proc = None
+                return False
+            self.client = RcClient(f"http://127.0.0.1:{port}", user, password)
+            self.synced = {}
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc is not None and self.proc.poll() is not None:
+                break
+            try:
+                self.client.call("rc/noop", timeout=1)
+                return True
+            except RcError:
+                time.sleep(0.1)
+        self.stop()
+        return False
+
+    def sync_remote(self, name):
+        """Push a remote section into the daemon if it is new or changed"""
+        section = self.config.get_remote(name)
+        if section is None or self.synced.get(name) == section:
+            return
+        params = {k: v for k, v in section.items() if k != "type"}
+        self.client.call("config/create", name=name, type=section.get("type", ""),
+                         parameters=params, opt={"nonInteractive": True, "noObscure": True})
+        self.synced[name] = section
+
+    def sync_deps(self, name):
+        # the daemon starts with an empty config and only learns the
+        # sections its mounts and jobs actually need
+        for dep in self.config.resolve(name):
+            self.sync_remote(dep)
+
+    def mount(self, name, mountpoint, vfs_opt=None, mount_opt=None, main_opt=None):
+        self.sync_deps(name)
+        params = {"fs": f"{name}:", "mountPoint": mountpoint}
+        if vfs_opt:
+            params["vfsOpt"] = vfs_opt
+        if mount_opt:
+            params["mountOpt"] = mount_opt
+        if main_opt:
+            params["_config"] = main_opt
+        self.client.call("mount/mount", **params)
+
+    def unmount(self, mountpoint):
+        self.client.call("mount/unmount", mountPoint=mountpoint)
+
+    def list_mounts(self):
+        return self.client.call("mount/listmounts").get("mountPoints") or []
+
+    def unmount_all(self):
+        self.client.call("mount/unmountall")
+
+    def stop(self):
+        if self.available:
+            try:
+                self.client.call("mount/unmountall")
+                if self.proc is not None:
+                    self.client.call("core/quit", timeout=2)
+            except RcError:
+                pass
+        if self.proc is not None:
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+            self.proc = None
+        self.client = None
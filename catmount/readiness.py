@@ -0,0 +1,76 @@
+# ------------------- MOUNT READINESS -------------------
+# A mount only counts once the mountpoint is really served: listed in
+# /proc/self/mountinfo (or rc mount/listmounts, or the drive letter
+# exists on Windows) while the rclone process is still alive.
+
+import os
+import re
+import time
+
+from .rcengine import RcError
+
+MOUNTINFO = os.environ.get("CATMOUNT_MOUNTINFO", "/proc/self/mountinfo")
+READY_TIMEOUT = float(os.environ.get("CATMOUNT_READY_TIMEOUT", "30"))
+
+
+class MountError(Exception):
+    pass
+
+
+def _unescape(field):
+    # mountinfo escapes space, tab, newline and backslash as \ooo
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), field)
+
+
+def read_mountinfo(path=MOUNTINFO):
+    try:
+        with open(path, "r") as f:
+            return {_unescape(line.split()[4]) for line in f if line.strip()}
+    except OSError:
+        return None
+
+
+def rclone_mounts(path=MOUNTINFO):
+    """(source, mountpoint) for every fuse.rclone mount on this host"""
+    found = []
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                fields, _, tail = line.partition(" - ")
+                rest = tail.split()
+                if len(rest) >= 2 and rest[0] == "fuse.rclone":
+                    found.append((_unescape(rest[1]), _unescape(fields.split()[4])))
+    except OSError:
+        pass
+    return found
+
+
+def is_served(mountpoint, engine=None):
+    if engine is not None:
+        try:
+            if not any(m.get("MountPoint") == mountpoint for m in engine.list_mounts()):
+                return False
+        except RcError:
+            return False
+        if os.name == "nt" or not os.path.exists(MOUNTINFO):
+            return True
+    if os.name == "nt":
+        return os.path.exists(mountpoint.rstrip("\\") + "\\")
+    mounted = read_mountinfo()
+    if mounted is None:
+        return os.path.ismount(mountpoint)
+    return os.path.abspath(mountpoint) in mounted
+
+
+def wait_ready(mountpoint, proc=None, engine=None, timeout=READY_TIMEOUT, interval=0.1):
+    """Block until the mountpoint is served; return seconds waited"""
+    start = time.monotonic()
+    while True:
+        if proc is not None and proc.poll() is not None:
+            raise MountError(f"rclone exited with code {proc.returncode} before {mountpoint} was ready")
+        if is_served(mountpoint, engine):
+            return time.monotonic() - start
+        if time.monotonic() - start >= timeout:
+            raise MountError(f"{mountpoint} not ready after {timeout:g}s")
+        time.sleep(interval)
+        interval = min(interval * 1.5, 1.0)
@@ -0,0 +1,104 @@
+# ------------------- IDLE REAPER -------------------
+# Watches VFS activity from the metrics poller and parks remotes nobody
+# has touched for a while: rclone is stopped and the cache share given
+# back, but the mountpoint stays reserved so a remount from the service
+# list lands in the same place. max_active additionally parks the least
+# recently used remotes once more than that many are mounted.
+
+import os
+import threading
+import time
+
+from .rcengine import RcError
+
+IDLE_AFTER = float(os.environ.get("CATMOUNT_IDLE_AFTER", "600"))
+MAX_ACTIVE = int(os.environ.get("CATMOUNT_MAX_ACTIVE", "0"))
+
+# unmount: park the remote; forget: keep it mounted but drop its dir cache; keep: never
+POLICIES = ("unmount", "forget", "keep")
+
+
+def busy(m):
+    return bool(m.open_files or m.transferring or m.uploads_pending or m.speed)
+
+
+class IdleReaper:
+    def __init__(self, backend, metrics, on_state=None, idle_after=IDLE_AFTER,
+                 max_active=MAX_ACTIVE, interval=15.0):
+        self.backend = backend
+        self.metrics = metrics
+        self.on_state = on_state
+        self.idle_after = idle_after
+        self.max_active = max_active
+        self.interval = interval
+        self.policies = {}
+        self.last_active = {}
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def set_policy(self, name, policy="unmount", idle_after=None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown idle policy: {policy}")
+        self.policies[name] = (policy, self.idle_after if idle_after is None else idle_after)
+
+    def policy(self, name):
+        return self.policies.get(name, ("unmount", self.idle_after))
+
+    def emit(self, name, state, detail=""):
+        if self.on_state:
+            self.on_state(name, state, detail)
+
+    def tick(self):
+        backend, now = self.backend, time.monotonic()
+        latest = self.metrics.latest if self.metrics is not None else {}
+        mounts = dict(backend.mounts)
+        for name in mounts:
+            m = latest.get(name)
+            if name not in self.last_active or (m is not None and busy(m)):
+                self.last_active[name] = now
+        for name in list(self.last_active):
+            if name not in mounts:
+                del self.last_active[name]
+
+        # only remotes we have a fresh sample for can be judged idle
+        candidates = [n for n in mounts if n in latest and latest[n].up and self.policy(n)[0] != "keep"]
+        reap = [n for n in candidates if self.policy(n)[1] > 0
+                and now - self.last_active[n] >= self.policy(n)[1]]
+        if self.max_active and len(mounts) - len(reap) > self.max_active:
+            lru = sorted((n for n in candidates if n not in reap and not busy(latest[n])),
+                         key=self.last_active.get)
+            reap += lru[:len(mounts) - len(reap) - self.max_active]
+        for name in reap:
+            self.reap(name, mounts[name][0], now)
+
+    def reap(self, name, mountpoint, now):
+        policy = self.policy(name)[0]
+        idle_for = now - self.last_active.get(name, now)
+        if policy == "forget":
+            client, fs = self.backend.rc_client(name)
+            try:
+                if client is not None:
+                    client.call("vfs/forget", timeout=5, **({"fs": fs} if fs else {}))
+            except RcError:
+                pass
+            self.last_active[name] = now
+            self.emit(name, "forgotten", f"dir cache dropped after {idle_for:.0f}s idle")
+        elif self.backend.park(name):
+            self.last_active.pop(name, None)
+            self.emit(name, "idle", mountpoint)
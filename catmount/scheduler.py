@@ -0,0 +1,114 @@
+# ------------------- MOUNT SCHEDULER -------------------
+# Bounded worker pool for mount_all: lowest priority value goes first,
+# progress is reported in batches and the whole run has one deadline.
+
+import os
+import threading
+import time
+
+WORKERS = int(os.environ.get("CATMOUNT_WORKERS", "8"))
+DEADLINE = float(os.environ.get("CATMOUNT_MOUNT_DEADLINE", "120"))
+
+
+class MountResult:
+    __slots__ = ("name", "ok", "mountpoint", "error", "elapsed")
+
+    def __init__(self, name, ok, mountpoint=None, error=None, elapsed=0.0):
+        self.name = name
+        self.ok = ok
+        self.mountpoint = mountpoint
+        self.error = error
+        self.elapsed = elapsed
+
+
+class MountScheduler:
+    def __init__(self, backend, workers=WORKERS, deadline=DEADLINE, batch_interval=0.25):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.deadline = deadline
+        self.batch_interval = batch_interval
+        self.cancelled = threading.Event()
+
+    def _mount_one(self, name):
+        start = time.monotonic()
+        if self.cancelled.is_set():
+            return MountResult(name, False, error="cancelled")
+        try:
+            mountpoint = self.backend.mount_now(name)
+            return MountResult(name, True, mountpoint, elapsed=time.monotonic() - start)
+        except Exception as e:
+            return MountResult(name, False, error=str(e), elapsed=time.monotonic() - start)
+
+    def _drop(self, result):
+        # a remote that didn't mount is no longer wanted: nothing should restart it
+        if result.ok:
+            self.backend.unmount(result.name)
+        elif result.name not in self.backend.mounts:
+            self.backend.wanted.discard(result.name)
+
+    def _undo(self, fut):
+        if not fut.cancelled():
+            self._drop(fut.result())
+
+    def run(self, jobs, on_progress=None, on_done=None):
+        """Mount (name, priority) jobs in the background and return the thread
+
+        on_progress(batch, done, total) gets lists of MountResult at most every
+        batch_interval seconds; on_done(results) gets all of them at the end.
+        """
+        thread = threading.Thread(target=self.run_now, args=(jobs, on_progress, on_done), daemon=True)
+        thread.start()
+        return thread
+
+    def run_now(self, jobs, on_progress=None, on_done=None):
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        self.cancelled.clear()
+        names = [name for name, _ in sorted(jobs, key=lambda j: j[1])]
+        # claim every remote up front so cache shares are sized for the whole run
+        self.backend.wanted.update(names)
+        total = len(names)
+        results = []
+        if not names:
+            if on_done:
+                on_done(results)
+            return results
+        end = time.monotonic() + self.deadline
+        pool = ThreadPoolExecutor(max_workers=min(self.workers, total), thread_name_prefix="mount")
+        pending = {pool.submit(self._mount_one, name): name for name in names}
+        batch, last_flush = [], time.monotonic()
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0 or self.cancelled.is_set():
+                break
+            done, _ = wait(pending, timeout=min(remaining, self.batch_interval),
+                           return_when=FIRST_COMPLETED)
+            for fut in done:
+                del pending[fut]
+                batch.append(fut.result())
+            now = time.monotonic()
+            if batch and (now - last_flush >= self.batch_interval or not pending):
+                results += batch
+                if on_progress:
+                    on_progress(batch, len(results), total)
+                batch, last_flush = [], now
+        reason = "cancelled" if self.cancelled.is_set() else "deadline exceeded"
+        late = [MountResult(name, False, error=reason) for name in pending.values()]
+        self.cancelled.set()
+        # mounts already under way can't be interrupted; undo them when they
+        # land so nothing stays mounted that was reported as failed
+        for fut in pending:
+            fut.add_done_callback(self._undo)
+        pool.shutdown(wait=False, cancel_futures=True)
+        if batch or late:
+            results += batch + late
+            if on_progress:
+                on_progress(batch + late, len(results), total)
+        for result in results:
+            if not result.ok:
+                self._drop(result)
+        if on_done:
+            on_done(results)
+        return results
+
+    def cancel(self):
+        self.cancelled.set()
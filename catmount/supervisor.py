@@ -0,0 +1,158 @@
+# ------------------- MOUNT SUPERVISOR -------------------
+# Polls every mount, reaps dead rclone processes, classifies why they
+# died and remounts (the allocator keeps the remote's mountpoint
+# reserved, so it comes back in the same place) with jittered exponential
+# backoff. A circuit breaker stops retrying remotes that keep failing.
+
+import random
+import re
+import threading
+import time
+
+from .logcapture import KINDS
+from .rcengine import RcError
+
+# rclone exit codes: 1 usage/config, 5 temporary, 7 fatal (e.g. account)
+EXIT_CLASSES = {1: "config", 5: "network", 7: "auth"}
+
+# checked in order: providers answer rate limits with 403 too (Drive's
+# "Error 403: User Rate Limit Exceeded"), so a bare 403 is not auth
+PATTERNS = [
+    ("ratelimit", KINDS["ratelimit"]),
+    ("network", re.compile(r"dial tcp|i/o timeout|timed? ?out|connection (refused|reset)|"
+                           r"no such host|network is unreachable|tls handshake|unexpected eof|5\d\d ", re.I)),
+    ("auth", re.compile(r"\b401\b|unauthori[sz]ed|invalid_grant|token (has )?expired|"
+                        r"authenticat|permission denied|access denied|couldn't fetch token", re.I)),
+    ("config", re.compile(r"didn't find section|not found in config|unknown backend|"
+                          r"failed to create file system|couldn't find type|config file", re.I)),
+]
+
+NO_RETRY = {"auth", "config"}
+
+
+def classify(returncode=None, text=""):
+    for kind, pattern in PATTERNS:
+        if text and pattern.search(text):
+            return kind
+    return EXIT_CLASSES.get(returncode, "unknown")
+
+
+class MountSupervisor:
+    def __init__(self, backend, on_state=None, interval=2.0, base_delay=2.0, max_delay=300.0,
+                 max_failures=5, stable_after=60.0, breaker_cooldown=900.0):
+        self.backend = backend
+        self.on_state = on_state
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_failures = max_failures
+        self.stable_after = stable_after
+        self.breaker_cooldown = breaker_cooldown
+        self.failures = {}
+        self.retry_at = {}
+        self.up_since = {}
+        self.restarting = set()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def loop(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def emit(self, name, state, detail=""):
+        if self.on_state:
+            self.on_state(name, state, detail)
+
+    def backoff(self, failures):
+        delay = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+        return random.uniform(delay / 2, delay)
+
+    def reset(self, name):
+        """Close the breaker, e.g. after the user fixed auth and remounted"""
+        self.failures.pop(name, None)
+        self.retry_at.pop(name, None)
+
+    def dead_mounts(self):
+        backend = self.backend
+        served = False
+        for name, (mountpoint, proc) in list(backend.mounts.items()):
+            if proc is not None:
+                if proc.poll() is not None:
+                    yield name, mountpoint, proc.returncode
+                continue
+            if served is False:
+                engine = backend.engine
+                served = set()
+                if engine is not None and engine.available:
+                    try:
+                        served = {m.get("MountPoint") for m in engine.list_mounts()}
+                    except RcError:
+                        served = None
+            if served is not None and mountpoint not in served:
+                yield name, mountpoint, None
+
+    def tick(self):
+        backend, now = self.backend, time.monotonic()
+        for name, mountpoint, code in list(self.dead_mounts()):
+            backend.forget_mount(name)
+            self.up_since.pop(name, None)
+            self.failed(name, self.why(name, code))
+
+        for name in list(self.up_since):
+            if name not in backend.mounts:
+                del self.up_since[name]
+        for name in list(backend.mounts):
+            self.up_since.setdefault(name, now)
+            if now - self.up_since[name] >= self.stable_after and name not in self.retry_at:
+                self.failures.pop(name, None)
+
+        for name, due in list(self.retry_at.items()):
+            if name not in backend.wanted:
+                self.reset(name)
+                continue
+            if due > now or name in self.restarting or name in backend.mounts:
+                continue
+            del self.retry_at[name]
+            self.restarting.add(name)
+            self.emit(name, "restarting", f"attempt {self.failures.get(name, 0) + 1}")
+            backend.mount(name, self._restarted)
+
+    def why(self, name, code):
+        # newest line of this mount first: what killed rclone beats earlier retries
+        for msg in reversed(self.backend.recent_errors(name)):
+            kind = classify(None, msg)
+            if kind != "unknown":
+                return kind
+        return classify(code)
+
+    def failed(self, name, kind):
+        failures = self.failures[name] = self.failures.get(name, 0) + 1
+        if kind in NO_RETRY:
+            self.retry_at[name] = time.monotonic() + self.breaker_cooldown
+            self.emit(name, "failed", f"{kind} error")
+        elif failures >= self.max_failures:
+            self.retry_at[name] = time.monotonic() + self.breaker_cooldown
+            self.emit(name, "failed", f"{kind} error, gave up after {failures} tries")
+        else:
+            delay = self.backoff(failures)
+            self.retry_at[name] = time.monotonic() + delay
+            self.emit(name, "crashed", f"{kind} error, retry in {delay:.0f}s")
+
+    def _restarted(self, name, mountpoint, success, error=None):
+        self.restarting.discard(name)
+        if success:
+            self.emit(name, "mounted", mountpoint)
+        else:
+            self.failed(name, classify(None, error or ""))
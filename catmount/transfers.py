@@ -0,0 +1,199 @@
+# ------------------- TRANSFER QUEUE -------------------
+# Bulk copy/sync/move between remotes or local paths without going
+# through FUSE: each job is an rc sync/* (or operations/*file for a single
+# file) call with _async=true on the rcd daemon, polled with job/status
+# and core/stats for progress. Remotes of the same type get
+# ServerSideAcrossConfigs so the provider copies without a download.
+
+import os
+import threading
+import time
+
+from .rcengine import RcError
+
+JOBS = int(os.environ.get("CATMOUNT_JOBS", "2"))
+KINDS = ("copy", "sync", "move")
+
+
+class TransferJob:
+    __slots__ = ("id", "kind", "src", "dst", "state", "jobid", "bytes", "total",
+                 "speed", "error", "started", "finished", "attempts")
+
+    def __init__(self, id, kind, src, dst):
+        self.id = id
+        self.kind = kind
+        self.src = src
+        self.dst = dst
+        self.state = "queued"
+        self.jobid = None
+        self.bytes = 0
+        self.total = 0
+        self.speed = 0.0
+        self.error = None
+        self.started = None
+        self.finished = None
+        self.attempts = 0
+
+    @property
+    def progress(self):
+        return self.bytes / self.total if self.total else 0.0
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+
+class TransferQueue:
+    def __init__(self, backend, concurrency=JOBS, on_update=None, interval=1.0):
+        self.backend = backend
+        self.concurrency = max(1, concurrency)
+        self.on_update = on_update
+        self.interval = interval
+        self.jobs = {}
+        self.next_id = 1
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+
+    def loop(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.tick()
+            except Exception:
+                pass
+
+    def submit(self, kind, src, dst):
+        if kind not in KINDS:
+            raise ValueError(f"unknown transfer kind: {kind}")
+        with self.lock:
+            job = TransferJob(self.next_id, kind, src.strip(), dst.strip())
+            self.jobs[job.id] = job
+            self.next_id += 1
+        self.emit(job)
+        self.wake.set()
+        return job
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or not job.active:
+            return False
+        if job.state == "running" and job.jobid is not None:
+            try:
+                self.backend.job_engine().client.call("job/stop", jobid=job.jobid)
+            except RcError:
+                pass
+        job.state, job.error, job.finished = "cancelled", "cancelled", time.time()
+        self.emit(job)
+        return True
+
+    def retry(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None or job.active:
+            return False
+        job.state, job.jobid, job.error, job.bytes, job.total = "queued", None, None, 0, 0
+        self.emit(job)
+        self.wake.set()
+        return True
+
+    def clear_finished(self):
+        with self.lock:
+            for job_id in [i for i, j in self.jobs.items() if not j.active]:
+                del self.jobs[job_id]
+
+    def emit(self, job):
+        if self.on_update is not None:
+            self.on_update(job)
+
+    def tick(self):
+        jobs = list(self.jobs.values())
+        running = [j for j in jobs if j.state == "running"]
+        if running:
+            client = self.backend.job_engine().client
+            for job in running:
+                self.poll(client, job)
+        slots = self.concurrency - sum(1 for j in jobs if j.state == "running")
+        for job in [j for j in jobs if j.state == "queued"][:max(0, slots)]:
+            self.launch(job)
+
+    def split(self, spec):
+        """("remote:", "dir/file") for remote specs, (dirname, basename) for local paths"""
+        name, sep, path = spec.partition(":")
+        if sep and name in self.backend.config:
+            return f"{name}:", path.strip("/")
+        spec = spec.rstrip("/\\") or spec
+        return os.path.dirname(spec) or ".", os.path.basename(spec)
+
+    def remote_type(self, spec):
+        name, sep, _ = spec.partition(":")
+        if not sep or name not in self.backend.config:
+            return None
+        return self.backend.config.get_remote(name).get("type")
+
+    def launch(self, job):
+        job.attempts += 1
+        job.started, job.finished = time.time(), None
+        try:
+            engine = self.backend.job_engine()
+            for spec in (job.src, job.dst):
+                name, sep, _ = spec.partition(":")
+                if sep and name in self.backend.config:
+                    engine.sync_deps(name)
+            params = {"_async": True}
+            src_type = self.remote_type(job.src)
+            if src_type is not None and src_type == self.remote_type(job.dst):
+                params["_config"] = {"ServerSideAcrossConfigs": True}
+            src_fs, src_remote = self.split(job.src)
+            try:
+                item = engine.client.call("operations/stat", fs=src_fs, remote=src_remote).get("item")
+            except RcError:
+                item = None
+            if item is not None and not item.get("IsDir") and job.kind != "sync":
+                dst_fs, dst_remote = self.split(job.dst)
+                if job.dst.endswith(("/", ":")):
+                    dst_fs, dst_remote = job.dst, item.get("Name") or src_remote
+                params.update(srcFs=src_fs, srcRemote=src_remote, dstFs=dst_fs, dstRemote=dst_remote)
+                out = engine.client.call(f"operations/{job.kind}file", **params)
+            else:
+                params.update(srcFs=job.src, dstFs=job.dst)
+                if job.kind == "move":
+                    params["deleteEmptySrcDirs"] = True
+                out = engine.client.call(f"sync/{job.kind}", **params)
+            job.jobid = out.get("jobid")
+            job.state = "running"
+        except Exception as e:
+            job.state, job.error, job.finished = "failed", str(e), time.time()
+        self.emit(job)
+
+    def poll(self, client, job):
+        try:
+            status = client.call("job/status", jobid=job.jobid)
+        except RcError as e:
+            job.state, job.error, job.finished = "failed", str(e), time.time()
+            self.emit(job)
+            return
+        try:
+            stats = client.call("core/stats", group=f"job/{job.jobid}")
+            job.bytes = stats.get("bytes") or 0
+            job.total = stats.get("totalBytes") or job.total
+            job.speed = stats.get("speed") or 0.0
+        except RcError:
+            pass
+        if status.get("finished") and job.state == "running":
+            ok = status.get("success")
+            job.state = "done" if ok else "failed"
+            job.error = None if ok else status.get("error") or "failed"
+            job.finished = time.time()
+        self.emit(job)
@@ -0,0 +1,52 @@
+# ------------------- UI DISPATCHER -------------------
+# Worker threads never touch Tk. They post per-row state deltas here and
+# the Tk loop drains the queue at a fixed frame rate, coalescing every
+# delta for the same row into one update per frame.
+
+import queue
+
+
+class UiDispatcher:
+    def __init__(self, root, apply, fps=30):
+        self.root = root
+        self.apply = apply
+        self.interval = max(1, int(1000 / fps))
+        self.queue = queue.SimpleQueue()
+        self.job = None
+
+    def post(self, key, **delta):
+        """Thread-safe: merge delta into row `key` (None = status bar) next frame"""
+        self.queue.put((key, delta))
+
+    def call(self, fn, *args):
+        """Thread-safe: run fn(*args) on the Tk thread after this frame's deltas"""
+        self.queue.put((self, (fn, args)))
+
+    def start(self):
+        if self.job is None:
+            self.job = self.root.after(self.interval, self.drain)
+        return self
+
+    def stop(self):
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def drain(self):
+        batch, calls = {}, []
+        try:
+            while True:
+                key, delta = self.queue.get_nowait()
+                if key is self:
+                    calls.append(delta)
+                else:
+                    batch.setdefault(key, {}).update(delta)
+        except queue.Empty:
+            pass
+        try:
+            if batch:
+                self.apply(batch)
+            for fn, args in calls:
+                fn(*args)
+        finally:
+            self.job = self.root.after(self.interval, self.drain)
@@ -4,42 +4,50 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import subprocess
-import threading
-import os
 import sys
 import shutil
-import string
 
-# ------------------- RAM-ONLY RCLONE CONFIG -------------------
-class RamConfig:
-    def __init__(self):
-        self.content = ""
-    
-    def add_remote(self, name, block):
-        lines = self.content.strip().splitlines()
-        filtered = [l for l in lines if not l.startswith(f"[{name}]")]
-        self.content = "\n".join(filtered).rstrip() + "\n\n" + block.strip() + "\n"
-    
-    def get(self):
-        return self.content
+from catmount import PROFILE_NAMES, IdleReaper, MountSupervisor, PollTuner, Prober, RamConfig, RcloneBackend, UiDispatcher, backend_handlers, claim, start_metrics
+from catmount.aggregate import ACTION_POLICIES, CREATE_POLICIES, KINDS as AGGREGATE_KINDS, SEARCH_POLICIES, aggregate
+from catmount.metrics import format_bytes, summary
+from catmount.transfers import KINDS, TransferQueue
 
+# ------------------- RAM-ONLY RCLONE CONFIG -------------------
 config = RamConfig()
 
 # ------------------- MAIN APP -------------------
 class CatsCloudMounter:
-    def __init__(self):
+    def __init__(self, instance=None):
         self.root = tk.Tk()
         self.root.title("Cat's CloudMounter 1.0")
-        self.root.geometry("600x400")
+        self.root.geometry("960x400")
         self.root.configure(bg="#f5f5f5")
         self.root.resizable(False, False)
 
-        self.mounts = {}
-        self.next_letter = iter(string.ascii_uppercase[25::-1])
+        self.backend = RcloneBackend(config)
+        self.items = {}
+        self.names = {}
+        self.order = []
+        self.rows = {}
+        self.reach = {}
+        self.dirty = set()
 
         self.build_ui()
+        self.ui = UiDispatcher(self.root, self.apply_updates).start()
+        self.backend.on_log = self.on_log
+        self.backend.prewarmer.on_progress = self.on_prewarm
         self.root.protocol("WM_DELETE_WINDOW", self.exit_clean)
+        self.supervisor = MountSupervisor(self.backend, on_state=self.on_mount_state).start()
+        self.tuner = PollTuner(self.backend).start()
+        self.metrics = start_metrics(self.backend, on_update=self.show_metrics)
+        self.reaper = IdleReaper(self.backend, self.metrics, on_state=self.on_mount_state).start()
+        self.transfers = TransferQueue(self.backend, on_update=lambda job: self.ui.post(("job", job.id), job=job)).start()
+        self.prober = Prober(self.backend)
+        self.instance = instance
+        if instance is not None:
+            self.ipc = backend_handlers(self.backend)
+            instance.serve(dict(self.ipc, show=self.remote_show, mount=self.remote_mount,
+                                unmount=self.remote_unmount))
 
     def build_ui(self):
         top = tk.Frame(self.root, bg="#3a86ff")
@@ -47,13 +55,35 @@ class CatsCloudMounter:
         tk.Label(top, text="Cat's CloudMounter", fg="white", bg="#3a86ff", font=("Helvetica", 13, "bold")).pack(side="left", padx=12, pady=6)
         tk.Button(top, text="+", font=("Helvetica", 14), bg="#3a86ff", fg="white", relief="flat", command=self.add_connection).pack(side="right", padx=12)
 
-        cols = ("status",)
-        self.tree = ttk.Treeview(self.root, columns=cols, show="tree headings", height=14)
+        jobs = tk.Frame(self.root, bg="#f5f5f5")
+        jobs.pack(side="right", fill="y", padx=(0, 15), pady=15)
+        tk.Label(jobs, text="Transfers", bg="#f5f5f5", font=("Helvetica", 10, "bold")).pack(anchor="w")
+        self.job_tree = ttk.Treeview(jobs, columns=("status",), show="tree headings", height=12)
+        self.job_tree.heading("#0", text="Job")
+        self.job_tree.heading("status", text="Progress")
+        self.job_tree.column("#0", width=200)
+        self.job_tree.column("status", width=120, anchor="center")
+        self.job_tree.pack(fill="y", expand=True)
+        buttons = tk.Frame(jobs, bg="#f5f5f5")
+        buttons.pack(fill="x", pady=(6, 0))
+        for text, command in (("New", self.new_transfer), ("Cancel", self.cancel_transfer),
+                              ("Retry", self.retry_transfer), ("Clear", self.clear_transfers)):
+            tk.Button(buttons, text=text, relief="flat", bg="#e0e0e0", command=command).pack(side="left", padx=2)
+
+        cols = ("status", "reach")
+        frame = tk.Frame(self.root, bg="#f5f5f5")
+        frame.pack(fill="both", expand=True, padx=15, pady=15)
+        self.tree = ttk.Treeview(frame, columns=cols, show="tree headings", height=14)
         self.tree.heading("#0", text="Name")
         self.tree.heading("status", text="Status")
-        self.tree.column("#0", width=380)
-        self.tree.column("status", width=140, anchor="center")
-        self.tree.pack(fill="both", expand=True, padx=15, pady=15)
+        self.tree.heading("reach", text="Reachable")
+        self.tree.column("#0", width=240)
+        self.tree.column("status", width=180, anchor="center")
+        self.tree.column("reach", width=100, anchor="center")
+        scroll = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=lambda *a: (scroll.set(*a), self.flush_visible()))
+        scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
 
         self.status = tk.Label(self.root, text="Ready • 100% offline • files = OFF", bg="#e0e0e0", anchor="w", font=("Helvetica", 9))
         self.status.pack(fill="x", side="bottom")
@@ -61,7 +91,7 @@ class CatsCloudMounter:
     def add_connection(self):
         win = tk.Toplevel(self.root)
         win.title("Add Cloud Connection")
-        win.geometry("420x480")
+        win.geometry("420x590")
         win.configure(bg="#f5f5f5")
         win.transient(self.root)
         win.grab_set()
@@ -91,6 +121,18 @@ class CatsCloudMounter:
         name_entry.pack()
         name_entry.insert(0, "mygdrive")
 
+        tk.Label(win, text="Performance profile:", bg="#f5f5f5").pack(pady=(10,3))
+        profile = tk.StringVar(value="auto")
+        ttk.Combobox(win, textvariable=profile, values=PROFILE_NAMES, state="readonly", width=29).pack()
+
+        tk.Label(win, text="Pre-warm dirs (blank = off, / = all) • depth (0 = all):", bg="#f5f5f5").pack(pady=(10,3))
+        prewarm_row = tk.Frame(win, bg="#f5f5f5")
+        prewarm_row.pack()
+        prewarm_entry = tk.Entry(prewarm_row, width=26, font=("Consolas", 10))
+        prewarm_entry.pack(side="left")
+        depth = tk.IntVar(value=0)
+        ttk.Spinbox(prewarm_row, from_=0, to=10, width=4, textvariable=depth).pack(side="left", padx=6)
+
         tk.Label(win, text="Rclone config block:", bg="#f5f5f5").pack(pady=(10,3))
         text = tk.Text(win, height=10, width=48, font=("Consolas", 9))
         text.pack(padx=15)
@@ -117,71 +159,310 @@ class CatsCloudMounter:
             block = text.get(1.0, "end").strip()
             if not name or not block:
                 return messagebox.showerror("Error", "Fill everything, kitty")
-            config.add_remote(name, block)
-            iid = self.tree.insert("", "end", text=f"  {name}", values=("Disconnected",))
-            self.tree.item(iid, tags=(name,))
+            if not block.lstrip().startswith("["):
+                block = f"[{name}]\n{block}"
+            if not config.merge(block):
+                return messagebox.showerror("Error", "No [remote] section in config block")
+            self.backend.set_profile(name, profile.get())
+            self.backend.set_prewarm(name, prewarm_entry.get(), depth.get())
+            self.add_row(name)
+            self.probe([name])
             win.destroy()
             self.status.config(text=f"{name} added • 100% RAM")
 
         tk.Button(win, text="Add & Close", bg="#3a86ff", fg="white", font=("Helvetica", 10, "bold"), command=save).pack(pady=12)
 
+    def add_row(self, name):
+        if name in self.items:
+            return self.items[name]
+        iid = self.tree.insert("", "end", text=f"  {name}", values=("Disconnected", ""))
+        self.tree.item(iid, tags=(name,))
+        self.items[name] = iid
+        self.names[iid] = name
+        self.order.append(iid)
+        self.rows[name] = "Disconnected"
+        self.reach[name] = ""
+        return iid
+
+    def probe(self, names):
+        # lists each remote's root off the Tk thread; the result lands in the Reachable column
+        self.prober.run(names, on_result=lambda r: self.ui.post(r.name, probe=r))
+
+    def combine_selected(self):
+        picked = [self.names[iid] for iid in self.tree.selection() if iid in self.names]
+        win = tk.Toplevel(self.root)
+        win.title("Combine into one mount")
+        win.geometry("420x300")
+        win.configure(bg="#f5f5f5")
+        win.transient(self.root)
+
+        tk.Label(win, text=", ".join(picked), bg="#f5f5f5", font=("Helvetica", 10, "bold"), wraplength=380).pack(pady=10)
+        tk.Label(win, text="Remote name:", bg="#f5f5f5").pack(pady=(4,3))
+        name_entry = tk.Entry(win, width=32, font=("Consolas", 10))
+        name_entry.pack()
+        name_entry.insert(0, "combined")
+
+        tk.Label(win, text="union = merged tree • combine = one folder per remote", bg="#f5f5f5").pack(pady=(10,3))
+        kind = tk.StringVar(value="union")
+        ttk.Combobox(win, textvariable=kind, values=AGGREGATE_KINDS, state="readonly", width=29).pack()
+
+        policies = tk.Frame(win, bg="#f5f5f5")
+        policies.pack(pady=10)
+        chosen = {}
+        for col, (label, choices) in enumerate((("Read", SEARCH_POLICIES), ("Modify", ACTION_POLICIES),
+                                                ("Create", CREATE_POLICIES))):
+            tk.Label(policies, text=label, bg="#f5f5f5").grid(row=0, column=col, padx=6)
+            chosen[label] = tk.StringVar(value=choices[0])
+            ttk.Combobox(policies, textvariable=chosen[label], values=choices, state="readonly", width=8).grid(row=1, column=col, padx=6)
+
+        def create():
+            name = name_entry.get().strip()
+            if name in config:
+                return messagebox.showerror("Error", f"{name} already exists", parent=win)
+            try:
+                aggregate(config, name, picked, kind=kind.get(), search=chosen["Read"].get(),
+                          action=chosen["Modify"].get(), create=chosen["Create"].get())
+            except ValueError as e:
+                return messagebox.showerror("Error", str(e), parent=win)
+            # the combined mount replaces the members' own mounts
+            for member in picked:
+                if member in self.backend.mounts:
+                    self.unmount(self.items[member])
+            iid = self.add_row(name)
+            win.destroy()
+            self.mount(iid)
+
+        tk.Button(win, text="Combine & Mount", bg="#3a86ff", fg="white", font=("Helvetica", 10, "bold"), command=create).pack(pady=8)
+
     def mount(self, iid):
         name = self.tree.item(iid, "tags")[0]
-        letter = next(self.next_letter) + ":"
-        
-        def do_mount():
-            try:
-                proc = subprocess.Popen([
-                    "rclone", "mount", f"{name}:", f"{letter}\\",
-                    "--config=-", "--vfs-cache-mode", "full",
-                    "--dir-cache-time", "5m", "--poll-interval", "30s"
-                ], stdin=subprocess.PIPE, creationflags=subprocess.CREATE_NO_WINDOW if os.name == "nt" else 0)
-                proc.stdin.write(config.get().encode())
-                proc.stdin.close()
-                self.mounts[letter] = proc
-                self.tree.set(iid, "status", f"Mounted {letter}")
-                self.status.config(text=f"{name} → {letter} • live")
-            except Exception as e:
-                messagebox.showerror("Mount failed", str(e))
-
-        threading.Thread(target=do_mount, daemon=True).start()
+
+        def on_mount(n, letter, success, error=None):
+            if success:
+                self.ui.post(name, status=f"Mounted {letter}")
+                self.ui.post(None, message=f"{name} → {letter} • live in {self.backend.latency.get(n, 0):.1f}s")
+            else:
+                self.ui.call(messagebox.showerror, "Mount failed", error or "Unknown error")
+
+        self.supervisor.reset(name)
+        self.backend.mount(name, on_mount)
+
+    def on_mount_state(self, name, state, detail):
+        if state == "forgotten":
+            return self.ui.post(None, message=f"{name}: {detail}")
+        if state == "idle":
+            self.ui.post(name, status="Idle • select to mount")
+        else:
+            self.ui.post(name, status=f"Mounted {detail}" if state == "mounted" else state.capitalize())
+        self.ui.post(None, message=f"{name} {state}: {detail}")
+
+    def wake_selected(self):
+        # parked by the idle reaper: selecting the row remounts it in place
+        for iid in self.tree.selection():
+            if self.names.get(iid) in self.backend.idle:
+                self.mount(iid)
+
+    def on_log(self, name, record):
+        self.ui.post(None, message=f"{name} {record.kind}: {record.msg}")
+
+    def on_prewarm(self, name, done, total, detail):
+        self.ui.post(None, message=f"{name} pre-warm {done}/{total} • {detail}")
+
+    def show_log(self, iid):
+        name = self.tree.item(iid, "tags")[0]
+        buf = self.backend.log(name)
+        win = tk.Toplevel(self.root)
+        counts = ", ".join(f"{n} {k}" for k, n in buf.counts.items() if k != "info") or "no errors"
+        win.title(f"{name} log • {counts}")
+        win.configure(bg="#f5f5f5")
+        text = tk.Text(win, height=20, width=90, font=("Consolas", 9))
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+        text.insert("end", "\n".join(str(r) for r in buf.tail()) or "Nothing logged yet")
+        text.config(state="disabled")
+
+    def show_metrics(self, latest):
+        for name, m in latest.items():
+            mount = self.backend.mounts.get(name)
+            if mount is not None:
+                self.ui.post(name, status=f"Mounted {mount[0]} • {summary(m)}")
+
+    def apply_updates(self, batch):
+        msg = batch.pop(None, {}).get("message")
+        if msg is not None:
+            self.status.config(text=msg)
+        for name, delta in batch.items():
+            if "job" in delta:
+                self.show_job(delta["job"])
+            elif name in self.items:
+                if "status" in delta:
+                    self.rows[name] = delta["status"]
+                if "probe" in delta:
+                    self.reach[name] = str(delta["probe"])
+                self.dirty.add(name)
+        self.flush_visible()
+
+    def show_job(self, job):
+        iid = f"job{job.id}"
+        if job.state == "running":
+            status = f"{job.progress:.0%} • {format_bytes(job.speed)}/s"
+        elif job.state == "failed":
+            status = f"failed: {job.error}"
+        else:
+            status = job.state
+        if self.job_tree.exists(iid):
+            self.job_tree.set(iid, "status", status)
+        elif job.id in self.transfers.jobs:
+            self.job_tree.insert("", "end", iid=iid, text=f"{job.kind} {job.src} → {job.dst}", values=(status,))
+
+    def selected_jobs(self):
+        return [int(iid[3:]) for iid in self.job_tree.selection()]
+
+    def new_transfer(self):
+        win = tk.Toplevel(self.root)
+        win.title("New Transfer")
+        win.geometry("360x220")
+        win.configure(bg="#f5f5f5")
+        win.transient(self.root)
+        remotes = [f"{n}:" for n in config.names()]
+        kind = tk.StringVar(value="copy")
+        tk.Label(win, text="Operation:", bg="#f5f5f5").pack(pady=(10, 3))
+        ttk.Combobox(win, textvariable=kind, values=KINDS, state="readonly", width=29).pack()
+        tk.Label(win, text="From (remote:path or local path):", bg="#f5f5f5").pack(pady=(8, 3))
+        src = ttk.Combobox(win, values=remotes, width=40)
+        src.pack()
+        tk.Label(win, text="To:", bg="#f5f5f5").pack(pady=(8, 3))
+        dst = ttk.Combobox(win, values=remotes, width=40)
+        dst.pack()
+
+        def start():
+            if not src.get().strip() or not dst.get().strip():
+                return messagebox.showerror("Error", "Fill both paths, kitty")
+            self.transfers.submit(kind.get(), src.get(), dst.get())
+            win.destroy()
+
+        tk.Button(win, text="Start", bg="#3a86ff", fg="white", font=("Helvetica", 10, "bold"), command=start).pack(pady=12)
+
+    def cancel_transfer(self):
+        for job_id in self.selected_jobs():
+            self.transfers.cancel(job_id)
+
+    def retry_transfer(self):
+        for job_id in self.selected_jobs():
+            self.transfers.retry(job_id)
+
+    def clear_transfers(self):
+        self.transfers.clear_finished()
+        for iid in self.job_tree.get_children():
+            if int(iid[3:]) not in self.transfers.jobs:
+                self.job_tree.delete(iid)
+
+    def flush_visible(self):
+        # Off-screen rows keep their new status in self.rows and are only
+        # written to the Treeview once they scroll into view.
+        if not self.dirty:
+            return
+        top, bottom = self.tree.yview()
+        n = len(self.order)
+        for iid in self.order[int(top * n):int(bottom * n) + 1]:
+            name = self.names[iid]
+            if name in self.dirty:
+                self.tree.set(iid, "status", self.rows[name])
+                self.tree.set(iid, "reach", self.reach[name])
+                self.dirty.discard(name)
 
     def unmount(self, iid):
         name = self.tree.item(iid, "tags")[0]
-        for letter, proc in list(self.mounts.items()):
-            if proc.poll() is None:
-                subprocess.call(["taskkill", "/F", "/PID", str(proc.pid)], shell=True)
-                del self.mounts[letter]
-        self.tree.set(iid, "status", "Disconnected")
-        self.status.config(text=f"{name} unmounted")
+        self.backend.unmount(name)
+        self.ui.post(name, status="Disconnected")
+        self.ui.post(None, message=f"{name} unmounted")
+
+    # Commands from a second launch or the CLI come in on the instance
+    # socket thread; Treeview work is handed to the Tk thread.
+    def remote_show(self):
+        self.ui.call(self.show_window)
+        return "shown"
+
+    def show_window(self):
+        self.root.deiconify()
+        self.root.lift()
+        self.root.focus_force()
+
+    def remote_mount(self, *names):
+        if not names:
+            # a bulk mount leaves out remotes the last probe couldn't reach
+            jobs, unreachable = self.prober.triage(
+                [(n, i) for i, n in enumerate(self.items) if n not in self.backend.mounts])
+            names = [n for n, _ in jobs]
+            for r in unreachable:
+                self.ui.post(r.name, status=f"Skipped: {r}")
+        missing = [n for n in names if n not in self.items]
+        if missing:
+            raise ValueError(f"no row for {', '.join(missing)}")
+        for name in names:
+            self.ui.call(self.mount, self.items[name])
+        return f"mounting {', '.join(names)}"
+
+    def remote_unmount(self, *names):
+        result = self.ipc["unmount"](*names)
+        for name in list(self.items):
+            if name not in self.backend.mounts and self.rows.get(name, "").startswith("Mounted"):
+                self.ui.post(name, status="Disconnected")
+        self.ui.post(None, message=result)
+        return result
+
+    def remove(self, iid):
+        name = self.tree.item(iid, "tags")[0]
+        self.backend.unmount(name)
+        config.remove_remote(name)
+        self.backend.logs.pop(name, None)
+        self.items.pop(name, None)
+        self.names.pop(iid, None)
+        self.rows.pop(name, None)
+        self.reach.pop(name, None)
+        self.dirty.discard(name)
+        self.order.remove(iid)
+        self.tree.delete(iid)
 
     def exit_clean(self):
         if messagebox.askyesno("Quit", "Wipe all mounts & RAM config?"):
-            for proc in self.mounts.values():
-                if proc.poll() is None:
-                    subprocess.call(["taskkill", "/F", "/PID", str(proc.pid)], shell=True)
+            self.supervisor.stop()
+            self.tuner.stop()
+            self.reaper.stop()
+            self.transfers.stop()
+            self.metrics.stop()
+            self.ui.stop()
+            if self.instance is not None:
+                self.instance.release()
+            self.backend.shutdown()
             self.root.destroy()
 
     def run(self):
         self.tree.bind("<Double-1>", lambda e: self.mount(self.tree.selection()[0]) if self.tree.selection() else None)
         self.tree.bind("<Button-3>", lambda e: self.show_context_menu(e))
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self.wake_selected())
         self.root.mainloop()
 
     def show_context_menu(self, event):
         iid = self.tree.identify_row(event.y)
         if iid:
-            self.tree.selection_set(iid)
+            if iid not in self.tree.selection():
+                self.tree.selection_set(iid)
             menu = tk.Menu(self.root, tearoff=0)
-            if "Mounted" in self.tree.set(iid, "status"):
+            if self.rows.get(self.names.get(iid), "").startswith("Mounted"):
                 menu.add_command(label="Unmount", command=lambda: self.unmount(iid))
             else:
                 menu.add_command(label="Mount", command=lambda: self.mount(iid))
+            menu.add_command(label="Show Log", command=lambda: self.show_log(iid))
+            if len(self.tree.selection()) > 1:
+                menu.add_command(label="Combine Selected...", command=self.combine_selected)
             menu.add_separator()
-            menu.add_command(label="Remove", command=lambda: self.tree.delete(iid))
+            menu.add_command(label="Remove", command=lambda: self.remove(iid))
             menu.post(event.x_root, event.y_root)
 
 if __name__ == "__main__":
     if not shutil.which("rclone"):
         messagebox.showerror("rclone missing", "Install rclone → https://rclone.org/downloads/")
         sys.exit(1)
-    CatsCloudMounter().run()
+    instance = claim("show")
+    if instance is not None:
+        CatsCloudMounter(instance).run()
@@ -0,0 +1,52 @@
+# Every test runs against bench/fake_rclone.py: no FUSE, no network. The
+# environment has to be in place before catmount is imported, because the
+# mountinfo path, mount root and cache root are read at import time.
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "bench")]
+
+import bench  # noqa: E402
+
+WORKDIR = tempfile.mkdtemp(prefix="catmount-tests-")
+bench.setup_fake(WORKDIR, 0.05, [])
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """Knobs of the fake rclone: fake(delay=..., fail=[...]) before starting a backend"""
+    open(os.environ["CATMOUNT_MOUNTINFO"], "w").close()
+
+    def configure(delay=0.05, fail=()):
+        monkeypatch.setenv("FAKE_RCLONE_MOUNT_DELAY", str(delay))
+        monkeypatch.setenv("FAKE_RCLONE_FAIL", ",".join(fail))
+    configure()
+    return configure
+
+
+@pytest.fixture
+def backend_factory(fake):
+    from catmount import RcloneBackend
+    started = []
+
+    def make(n=3, engine="process"):
+        backend = RcloneBackend(bench.make_config(n), engine=engine)
+        started.append(backend)
+        return backend
+    yield make
+    for backend in started:
+        backend.shutdown()
+
+
+@pytest.fixture
+def engine(fake):
+    from catmount import RcdEngine
+    engine = RcdEngine(bench.make_config(3))
+    assert engine.start()
+    yield engine
+    engine.stop()
@@ -0,0 +1,46 @@
+import pytest
+
+import bench
+from catmount.aggregate import aggregate
+
+
+def test_union_section_and_scope():
+    config = bench.make_config(3)
+    assert aggregate(config, "all", ["r0", "r1", "r0"], create="lfs") == "all"
+    section = config.get_remote("all")
+    assert section["type"] == "union"
+    assert section["upstreams"] == "r0: r1:"
+    assert (section["action_policy"], section["create_policy"], section["search_policy"]) == ("epall", "lfs", "ff")
+    assert config.resolve("all") == ["r0", "r1", "all"]
+
+
+def test_combine_gives_each_remote_a_directory():
+    config = bench.make_config(1)
+    config.add_remote("my drive", "drive")
+    config.add_remote("my_drive", "drive")
+    aggregate(config, "both", ["r0", "my drive", "my_drive"], kind="combine")
+    assert config.get_remote("both")["upstreams"] == "r0=r0: my_drive=my drive: my_drive_2=my_drive:"
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"remotes": ["r0"]}, "at least two"),
+    ({"remotes": ["r0", "nope"]}, "not configured: nope"),
+    ({"name": "r1"}, "r1 already exists"),
+    ({"name": "bad:name"}, "bad remote name"),
+    ({"kind": "mirror"}, "unknown aggregate kind"),
+    ({"action": "best"}, "unknown union policy"),
+])
+def test_rejects(kwargs, error):
+    config = bench.make_config(2)
+    args = dict(name="all", remotes=["r0", "r1"])
+    args.update(kwargs)
+    with pytest.raises(ValueError, match=error):
+        aggregate(config, **args)
+    assert config.names() == ["r0", "r1"]
+
+
+def test_aggregate_mounts_as_one(backend_factory):
+    backend = backend_factory(2)
+    aggregate(backend.config, "all", ["r0", "r1"])
+    mountpoint = backend.mount_now("all")
+    assert set(backend.mounts) == {"all"} and mountpoint.endswith("all")
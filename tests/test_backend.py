@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import pytest
+
+from catmount import MountError
+from catmount.readiness import read_mountinfo
+
+
+def rclone_mount_processes(mountpoint):
+    count = 0
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                argv = f.read().split(b"\0")
+        except OSError:
+            continue
+        if b"mount" in argv and mountpoint.encode() in argv:
+            count += 1
+    return count
+
+
+def wait_for(condition, timeout=10):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end and not condition():
+        time.sleep(0.05)
+    return condition()
+
+
+def test_concurrent_mounts_share_one_attempt(backend_factory, fake):
+    fake(delay=0.5)
+    backend = backend_factory()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(backend.mount_now("r0"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == 1 and len(results) == 4
+    assert rclone_mount_processes(results[0]) == 1
+
+
+def test_concurrent_failures_all_raise(backend_factory, fake):
+    fake(fail=["r1"])
+    backend = backend_factory()
+    errors = []
+
+    def mount():
+        try:
+            backend.mount_now("r1")
+        except MountError as e:
+            errors.append(e)
+    threads = [threading.Thread(target=mount) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(errors) == 3
+    assert "r1" not in backend.mounts
+
+
+def test_unmount_cancels_a_mount_in_flight(backend_factory, fake):
+    fake(delay=0.5)
+    backend = backend_factory()
+    errors = []
+    thread = threading.Thread(target=lambda: errors.append(pytest.raises(MountError, backend.mount_now, "r0")))
+    thread.start()
+    while "r0" not in backend.mounting:
+        time.sleep(0.01)
+    backend.unmount("r0")
+    thread.join()
+    assert "unmounted" in str(errors[0].value)
+    assert "r0" not in backend.mounts
+    assert backend.mountpoints.get("r0") is None
+    assert not read_mountinfo()
+
+
+def test_old_cleanup_spares_a_quick_remount(backend_factory):
+    backend = backend_factory()
+    backend.mount_now("r0")
+    backend.unmount("r0")
+    mountpoint = backend.mount_now("r0")
+    time.sleep(1.5)
+    assert backend.mountpoints.get("r0") == mountpoint
+    assert os.path.isdir(mountpoint)
+    assert "r0" in backend.cache.granted
+
+
+def test_unmount_releases_once_rclone_exits(backend_factory):
+    backend = backend_factory()
+    backend.mount_now("r0")
+    backend.unmount("r0")
+    assert wait_for(lambda: backend.mountpoints.get("r0") is None)
+
+
+def test_failed_restart_keeps_its_reservation(backend_factory, fake):
+    backend = backend_factory()
+    mountpoint = backend.mountpoints.allocate("r1")
+    fake(fail=["r1"])
+    with pytest.raises(MountError):
+        backend.mount_now("r1")
+    assert backend.mountpoints.get("r1") == mountpoint
+
+
+def test_park_then_remount_keeps_the_slot(backend_factory):
+    backend = backend_factory()
+    mountpoint = backend.mount_now("r0")
+    assert backend.park("r0")
+    assert backend.mount_now("r0") == mountpoint
+    time.sleep(1.5)
+    assert backend.mountpoints.get("r0") == mountpoint
+    assert "r0" in backend.cache.granted
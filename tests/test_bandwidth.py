@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from catmount.bandwidth import TPS_PROCESS_ONLY, fair_share, parse_schedule, rate_at
+
+
+def test_fair_share_caps_small_demands_and_splits_the_rest():
+    shares = fair_share(100, {"a": 10, "b": 80, "c": 80})
+    assert shares["a"] == pytest.approx(10)
+    assert shares["b"] == pytest.approx(45)
+    assert shares["c"] == pytest.approx(45)
+
+
+def test_fair_share_spreads_leftover():
+    shares = fair_share(100, {"a": 10, "b": 20})
+    assert sum(shares.values()) == pytest.approx(100)
+    assert shares["b"] - shares["a"] == pytest.approx(10)
+
+
+def test_parse_schedule():
+    assert parse_schedule("off") == [(0, -1)]
+    assert parse_schedule("10M") == [(0, 10 * 1024 ** 2)]
+    assert parse_schedule("23:00,off 08:00,512k") == [(8 * 60, 512 * 1024), (23 * 60, -1)]
+
+
+def test_rate_at_wraps_around_midnight():
+    schedule = parse_schedule("08:00,1M 23:00,off")
+    at = lambda h: time.mktime(time.strptime(f"2024-01-02 {h}:30", "%Y-%m-%d %H:%M"))
+    assert rate_at(schedule, at(12)) == 1024 ** 2
+    assert rate_at(schedule, at(23)) == -1
+    assert rate_at(schedule, at(3)) == -1
+
+
+def drive_backend(backend_factory, engine):
+    backend = backend_factory(engine=engine)
+    backend.add_remote("gd", "drive", token="t")
+    backend.add_remote("gd2", "drive", token="t")
+    backend.add_remote("vault", "crypt", remote="gd:vault", password="p")
+    return backend
+
+
+def test_process_mounts_split_the_provider_tps(backend_factory):
+    backend = drive_backend(backend_factory, "process")
+    backend.wanted.update({"gd", "gd2", "vault", "r0"})
+    assert backend.bandwidth.provider("vault") == "drive"
+    assert backend.bandwidth.tps_limit("gd") == pytest.approx(10 / 3)
+    assert backend.bandwidth.tps_limit("r0") is None
+    backend.mount_now("gd")
+    with open(f"/proc/{backend.mounts['gd'][1].pid}/cmdline", "rb") as f:
+        argv = f.read().decode().split("\0")
+    assert float(argv[argv.index("--tpslimit") + 1]) == pytest.approx(10 / 3, rel=0.01)
+
+
+def test_rcd_mounts_say_tps_is_not_applied(backend_factory):
+    backend = drive_backend(backend_factory, "rcd")
+    backend.mount_now("gd")
+    backend.mount_now("r0")
+    assert [r.msg for r in backend.log("gd").tail()] == [TPS_PROCESS_ONLY]
+    assert backend.log("r0").tail() == []
+
+
+def test_rebalance_pushes_the_rcd_its_combined_share(backend_factory):
+    backend = backend_factory(engine="rcd")
+    backend.bandwidth.configure(bwlimit="10M")
+    backend.mount_now("r0")
+    backend.mount_now("r1")
+    shares = backend.bandwidth.rebalance()
+    assert shares == {"r0": pytest.approx(5 * 1024 ** 2), "r1": pytest.approx(5 * 1024 ** 2)}
+    assert backend.bandwidth.applied[None] == pytest.approx(10 * 1024 ** 2)
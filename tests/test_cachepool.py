@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from catmount import MountError
+from catmount.cachepool import MIB, CachePool
+from catmount.metrics import MountMetrics
+
+BUDGET = 1200 * MIB
+
+
+def write_cache(root, name, dirty=False):
+    for sub, body in (("vfs", "data"), ("vfsMeta", json.dumps({"Size": 4, "Dirty": dirty}))):
+        os.makedirs(os.path.join(root, sub, name, "docs"), exist_ok=True)
+        with open(os.path.join(root, sub, name, "docs", "a.txt"), "w") as f:
+            f.write(body)
+
+
+def test_later_mounts_take_back_part_of_the_first_share(tmp_path):
+    pool = CachePool(str(tmp_path), budget=BUDGET)
+    assert pool.grant("a", expected=1) == BUDGET
+    assert pool.grant("b", expected=2) == BUDGET // 2
+    assert pool.grant("c", expected=3) == BUDGET // 3
+    assert pool.granted == {"a": BUDGET // 3, "b": BUDGET // 3, "c": BUDGET // 3}
+
+
+def test_no_mount_gets_more_than_an_even_split(tmp_path):
+    pool = CachePool(str(tmp_path), budget=BUDGET)
+    assert pool.grant("a", expected=4) == BUDGET // 4
+    assert pool.grant("b", expected=1) == BUDGET // 2
+    assert pool.grant("c", cap=100 * MIB) == 100 * MIB
+    assert sum(pool.granted.values()) <= BUDGET
+
+
+def test_activity_weights_the_split(tmp_path):
+    pool = CachePool(str(tmp_path), budget=BUDGET, smoothing=1.0)
+    pool.grant("a", expected=2)
+    pool.grant("b", expected=2)
+    busy = MountMetrics()
+    busy.speed = 10 * MIB
+    pool.observe({"a": busy, "b": MountMetrics()})
+    pool.grant("c", expected=3)
+    assert pool.granted["a"] > pool.granted["b"]
+    assert pool.granted["c"] <= BUDGET // 3
+
+
+def test_apply_falls_back_to_minimal_only_when_exhausted(tmp_path):
+    pool = CachePool(str(tmp_path), budget=128 * MIB)
+    profile = {"cache_mode": "full", "cache_max_size": "off"}
+    assert pool.apply("a", profile, expected=1)["cache_max_size"] == "128M"
+    assert pool.apply("b", profile, expected=2)["cache_max_size"] == "64M"
+    assert pool.apply("c", profile, expected=3) == dict(profile, cache_mode="minimal", cache_max_size="64M")
+
+
+def test_release_purges_only_clean_caches(tmp_path):
+    pool = CachePool(str(tmp_path), budget=BUDGET)
+    write_cache(str(tmp_path), "clean")
+    write_cache(str(tmp_path), "dirty", dirty=True)
+    write_cache(str(tmp_path), "busy")
+    for name in ("clean", "dirty", "busy"):
+        pool.grant(name)
+    uploading = MountMetrics()
+    uploading.uploads_queued = 2
+    pool.observe({"busy": uploading})
+    for name in ("clean", "dirty", "busy"):
+        pool.release(name)
+    assert not os.path.exists(tmp_path / "vfs" / "clean")
+    assert os.path.exists(tmp_path / "vfs" / "dirty" / "docs" / "a.txt")
+    assert os.path.exists(tmp_path / "vfsMeta" / "busy")
+    assert pool.granted == {}
+
+
+def test_clear_keeps_caches_with_pending_uploads(tmp_path):
+    root = str(tmp_path / "cache")
+    pool = CachePool(root, budget=BUDGET)
+    write_cache(root, "clean")
+    write_cache(root, "dirty", dirty=True)
+    assert pool.clear() == ["dirty"]
+    assert os.listdir(os.path.join(root, "vfs")) == ["dirty"]
+    write_cache(root, "dirty")
+    assert pool.clear() == []
+    assert not os.path.exists(root)
+
+
+def test_failed_restart_keeps_the_cache(backend_factory, fake):
+    backend = backend_factory()
+    backend.mountpoints.allocate("r1")
+    write_cache(backend.cache.root, "r1")
+    fake(fail=["r1"])
+    with pytest.raises(MountError):
+        backend.mount_now("r1")
+    assert os.path.exists(os.path.join(backend.cache.root, "vfs", "r1", "docs", "a.txt"))
+    assert "r1" not in backend.cache.granted
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import bench
+from conftest import ROOT
+
+
+def processes_using(path):
+    found = []
+    for pid in filter(str.isdigit, os.listdir("/proc")):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                if path.encode() in f.read():
+                    found.append(int(pid))
+        except OSError:
+            continue
+    return found
+
+
+def catmount(tmp_path, *argv, **env):
+    with open(tmp_path / "rclone.conf", "w") as f:
+        f.write(bench.make_config(2).get())
+    env = dict(os.environ, XDG_RUNTIME_DIR=str(tmp_path), CATMOUNT_CACHE_ROOT=str(tmp_path / "cache"), **env)
+    return subprocess.run([sys.executable, "-m", "catmount", argv[0], "--config", str(tmp_path / "rclone.conf"),
+                           *argv[1:]], cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_mount_all_cleans_up_when_nothing_mounts(fake, tmp_path):
+    out = catmount(tmp_path, "mount-all", "--engine", "rcd", "--probe-timeout", "0",
+                   FAKE_RCLONE_FAIL="r0,r1")
+    assert out.returncode == 1
+    assert "0/2 mounted" in out.stdout
+    assert processes_using(str(tmp_path / "cache")) == []
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_idle_after_defaults_to_the_reaper_setting():
+    from catmount import cli
+    from catmount.reaper import IDLE_AFTER
+    args = cli.build_parser().parse_args(["mount-all"])
+    assert args.idle_after == IDLE_AFTER
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from catmount import instance
+from catmount.instance import NoInstance, SingleInstance, backend_handlers, claim, runtime_dir, send
+from test_backend import wait_for
+
+
+@pytest.fixture
+def address():
+    # a short private dir: Unix socket paths are capped near 100 bytes
+    path = tempfile.mkdtemp(prefix="cm-")
+    yield os.path.join(path, "test.sock")
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def primary(address):
+    first = SingleInstance(address)
+    assert first.acquire()
+    yield first
+    first.release()
+
+
+def test_send_round_trip(primary, address):
+    primary.serve({"echo": lambda *args: list(args)})
+    assert send("echo", "a", 1, address=address) == {"ok": True, "result": ["a", 1]}
+    reply = send("nope", address=address)
+    assert not reply["ok"] and "unknown command" in reply["error"]
+
+
+def test_handler_errors_come_back_as_replies(primary, address):
+    primary.serve({"boom": lambda: 1 / 0})
+    reply = send("boom", address=address)
+    assert not reply["ok"] and "division" in reply["error"]
+
+
+def test_second_acquire_fails_until_release(primary, address):
+    assert not SingleInstance(address).acquire()
+    primary.release()
+    again = SingleInstance(address)
+    assert again.acquire()
+    again.release()
+
+
+def test_send_without_instance(address):
+    with pytest.raises(NoInstance):
+        send("ping", address=address)
+
+
+def test_claim_forwards_to_the_primary(primary, address):
+    seen = []
+    primary.serve({"show": lambda *args: seen.append(args)})
+    assert claim("show", "r1", address=address) is None
+    assert wait_for(lambda: seen == [("r1",)])
+
+
+def test_backend_handlers(backend_factory, fake, primary, address):
+    fake(fail=["r2"])
+    backend = backend_factory()
+    primary.serve(backend_handlers(backend))
+    assert send("ping", address=address)["result"] == "pong"
+    assert not send("mount", "nope", address=address)["ok"]
+    assert send("mount", "r0", "r2", address=address)["ok"]
+    assert wait_for(lambda: "r0" in backend.mounts and "r2" in backend.errors)
+    rows = {row["remote"]: row for row in send("status", address=address)["result"]}
+    assert rows["r0"]["state"] == "mounted" and rows["r2"]["state"] == "failed"
+    mountpoint = rows["r0"]["mountpoint"]
+    assert send("unmount", mountpoint, address=address)["result"] == "unmounted r0"
+    assert wait_for(lambda: "r0" not in backend.mounts)
+
+
+@pytest.fixture
+def shared_tmp(monkeypatch):
+    path = tempfile.mkdtemp(prefix="cm-tmp-")
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    monkeypatch.setattr(tempfile, "tempdir", path)
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def test_runtime_dir_prefers_xdg(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert runtime_dir() == str(tmp_path)
+
+
+def test_runtime_dir_fallback_is_private(shared_tmp):
+    path = runtime_dir()
+    assert path == os.path.join(shared_tmp, f"catmount-{os.getuid()}")
+    assert os.stat(path).st_mode & 0o777 == 0o700
+    assert runtime_dir() == path
+
+
+def test_runtime_dir_refuses_a_symlink(shared_tmp):
+    target = os.path.join(shared_tmp, "elsewhere")
+    os.mkdir(target, 0o700)
+    os.symlink(target, os.path.join(shared_tmp, f"catmount-{os.getuid()}"))
+    with pytest.raises(PermissionError):
+        runtime_dir()
+
+
+def test_runtime_dir_refuses_an_open_dir(shared_tmp):
+    path = os.path.join(shared_tmp, f"catmount-{os.getuid()}")
+    os.mkdir(path)
+    os.chmod(path, 0o777)
+    with pytest.raises(PermissionError):
+        runtime_dir()
+    with pytest.raises(PermissionError):
+        instance.default_address()
+
+
+def test_runtime_dir_refuses_another_owner(shared_tmp, monkeypatch):
+    runtime_dir()
+    monkeypatch.setattr(os, "getuid", lambda: 12345)
+    os.rename(os.path.join(shared_tmp, f"catmount-{os.geteuid()}"), os.path.join(shared_tmp, "catmount-12345"))
+    with pytest.raises(PermissionError):
+        runtime_dir()
@@ -0,0 +1,61 @@
+import json
+import subprocess
+
+import pytest
+
+from catmount import RcError
+from catmount.logcapture import LogBuffer, LogRecord, capture, parse_line
+
+
+def test_parse_json_line():
+    r = parse_line(json.dumps({"level": "error", "msg": "Failed to copy: 429 Too Many Requests ",
+                               "object": "gd:photos/a.jpg", "source": "operations/copy.go:310"}))
+    assert (r.level, r.kind, r.object, r.msg) == ("error", "ratelimit", "gd:photos/a.jpg",
+                                                  "Failed to copy: 429 Too Many Requests")
+
+
+def test_parse_text_and_garbage():
+    r = parse_line("2024/01/02 15:04:05 ERROR : gd: couldn't connect\n")
+    assert (r.level, r.kind, r.msg) == ("error", "error", "gd: couldn't connect")
+    r = parse_line("2024/01/02 15:04:05 NOTICE : low level retry 1/10 (error x)")
+    assert r.kind == "retry"
+    r = parse_line("{not json")
+    assert (r.level, r.kind, r.msg) == ("notice", "info", "{not json")
+    assert parse_line("   \n") is None
+
+
+def test_buffer_is_bounded_but_counts_everything():
+    buf = LogBuffer(maxlen=3)
+    for i in range(5):
+        buf.add(LogRecord(i, "error" if i % 2 else "info", "error" if i % 2 else "info", "", f"m{i}"))
+    assert [r.msg for r in buf.tail()] == ["m2", "m3", "m4"]
+    assert [r.msg for r in buf.tail(1)] == ["m4"]
+    assert [r.msg for r in buf.tail(kinds={"error"})] == ["m3"]
+    assert buf.counts == {"info": 3, "error": 2}
+    assert buf.last_error.msg == "m3"
+
+
+def test_capture_reads_rclone_stderr(fake, tmp_path):
+    fake(fail=["r1"])
+    proc = subprocess.Popen(["rclone", "mount", "r1:", str(tmp_path / "r1"), "--use-json-log"],
+                            stderr=subprocess.PIPE)
+    buf = LogBuffer()
+    capture(proc.stderr, buf.add).join(10)
+    proc.wait()
+    assert buf.last_error.object == "r1:"
+    assert "i/o timeout" in buf.last_error.msg
+
+
+def test_rcd_lines_are_attributed_to_their_mount(backend_factory, fake):
+    fake(fail=["r1"])
+    backend = backend_factory(engine="rcd")
+    mountpoint = backend.mount_now("r0")
+    with pytest.raises(RcError):
+        backend.mount_now("r1")
+    assert "i/o timeout" in backend.log("r1").last_error.msg
+    vfs = LogRecord(0, "error", "error", "docs/a.txt", f"vfs cache: failed to upload {mountpoint}/docs/a.txt")
+    backend.engine_record(vfs)
+    assert backend.log("r0").last_error is vfs
+    rc = LogRecord(0, "error", "error", "", "rc: core/bogus: error: couldn't find method")
+    backend.engine_record(rc)
+    assert backend.log("(rcd)").last_error is rc
@@ -0,0 +1,79 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from catmount import MetricsCollector
+from catmount.metrics import ENGINE, MetricsServer, MountMetrics, summary
+
+
+def parse(text):
+    """{(metric, remote): value} plus the declared {metric: type}"""
+    samples, types = {}, {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, metric, kind = line.split()
+            types[metric] = kind
+        elif line and not line.startswith("#"):
+            series, value = line.rsplit(" ", 1)
+            metric, _, label = series.partition("{")
+            samples[metric, label[len('remote="'):-2]] = float(value)
+    return samples, types
+
+
+def test_process_mounts_report_their_own_stats(backend_factory):
+    backend = backend_factory(2)
+    backend.mount_now("r0")
+    backend.mount_now("r1")
+    latest = MetricsCollector(backend).poll()
+    assert set(latest) == {"r0", "r1"}
+    assert all(m.up == 1 and m.errors == 0 for m in latest.values())
+
+
+def test_rcd_mounts_get_only_their_own_transfers(backend_factory, monkeypatch, tmp_path):
+    monkeypatch.setenv("FAKE_RCLONE_JOB_TIME", "30")
+    backend = backend_factory(2, engine="rcd")
+    backend.mount_now("r0")
+    backend.mount_now("r1")
+    backend.engine.client.call("operations/copyfile", _async=True, srcFs="r0:", srcRemote="a",
+                               dstFs=str(tmp_path), dstRemote="a")
+    collector = MetricsCollector(backend)
+    latest = collector.poll()
+    assert latest["r0"].transferring == 1 and latest["r0"].speed == 1024 ** 2
+    assert latest["r1"].transferring == 0 and latest["r1"].speed == 0
+    assert latest[ENGINE].transferring == 1
+    samples, _ = parse(collector.exposition())
+    assert samples["catmount_transfers_in_flight", "r0"] == 1
+    assert samples["catmount_errors_total", ENGINE] == 0
+    # the rcd's error count is shared; it is not repeated per mount
+    assert ("catmount_errors_total", "r0") not in samples
+    assert samples["catmount_up", "r1"] == 1
+
+
+def test_exposition_format():
+    collector = MetricsCollector(backend=None)
+    m = MountMetrics()
+    m.speed, m.uploads_queued, m.up = 2048, 3, 1
+    collector.latest = {'my "drive"\\x': m}
+    text = collector.exposition()
+    assert text.endswith("\n")
+    assert '# HELP catmount_up 1 if the last scrape of this mount succeeded' in text
+    assert 'catmount_bytes_per_second{remote="my \\"drive\\"\\\\x"} 2048' in text
+    _, types = parse(text)
+    assert types["catmount_errors_total"] == "counter"
+    assert types["catmount_vfs_uploads_queued"] == "gauge"
+    assert summary(m) == "2.0 KB/s • 3 up"
+
+
+def test_server_serves_metrics_only():
+    collector = MetricsCollector(backend=None)
+    collector.latest = {"r0": MountMetrics()}
+    server = MetricsServer(collector, 0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as r:
+            assert r.headers["Content-Type"].startswith("text/plain")
+            assert 'catmount_up{remote="r0"} 0' in r.read().decode()
+        with pytest.raises(urllib.error.HTTPError, match="404"):
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/")
+    finally:
+        server.close()
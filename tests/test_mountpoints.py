@@ -0,0 +1,32 @@
+import os
+
+from catmount.mountpoints import MountpointAllocator
+
+
+def test_one_directory_per_remote_beyond_26(tmp_path):
+    alloc = MountpointAllocator(str(tmp_path), use_letters=False)
+    paths = [alloc.allocate(f"r{i}") for i in range(40)]
+    assert len(set(paths)) == 40 and all(os.path.isdir(p) for p in paths)
+    assert alloc.allocate("r7") == paths[7]
+
+
+def test_names_are_slugged_and_busy_dirs_skipped(tmp_path):
+    alloc = MountpointAllocator(str(tmp_path), use_letters=False)
+    os.makedirs(tmp_path / "My_Drive")
+    (tmp_path / "My_Drive" / "keep.txt").write_text("not ours")
+    assert alloc.allocate("My Drive") == str(tmp_path / "My_Drive-2")
+
+
+def test_release_frees_the_slot_for_reuse(tmp_path):
+    alloc = MountpointAllocator(str(tmp_path), use_letters=False)
+    first = alloc.allocate("a")
+    alloc.release("a")
+    assert not os.path.exists(first) and alloc.get("a") is None
+    assert alloc.allocate("a") == first
+
+
+def test_release_of_a_stale_slot_is_ignored(tmp_path):
+    alloc = MountpointAllocator(str(tmp_path), use_letters=False)
+    first = alloc.allocate("a")
+    alloc.release("a", first + "-old")
+    assert alloc.get("a") == first
@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from catmount import PollTuner
+from catmount.polltune import SECOND, ChangeRate
+
+
+def test_change_rate_tracks_changes_per_hour():
+    rate = ChangeRate()
+    rate.observe("a", 0)
+    for i in range(1, 30):
+        rate.observe(f"v{i}", i * 60.0)
+    assert rate.rate == pytest.approx(60, rel=0.01)
+    for i in range(30, 60):
+        rate.observe("v29", i * 60.0)
+    assert rate.rate < 1
+    assert rate.samples == 59
+
+
+def test_targets_follow_the_rate():
+    tuner = PollTuner(backend=None)
+    assert tuner.targets(0) == (tuner.poll_bounds[1], tuner.dir_cache_bounds[1])
+    poll, dir_cache = tuner.targets(60)
+    assert poll == 15 * SECOND and dir_cache == 150 * SECOND
+    assert tuner.targets(10 ** 6) == (tuner.poll_bounds[0], 100 * SECOND)
+    assert tuner.targets(60, polling=False)[1] == tuner.dir_cache_bounds[0]
+
+
+def test_quiet_mount_is_retuned_to_long_intervals(backend_factory):
+    backend = backend_factory(engine="rcd")
+    backend.mount_now("r0")
+    changes = []
+    tuner = PollTuner(backend, on_change=lambda n, r, c: changes.append((n, c)), min_samples=3)
+    for _ in range(4):
+        tuner.due.clear()
+        tuner.tick()
+    assert changes == [("r0", {"poll_interval": "10m", "dir_cache_time": "1h"})]
+    assert backend.tuning["r0"] == {"poll_interval": "10m", "dir_cache_time": "1h"}
+    # the next sample waits half the new poll interval
+    assert tuner.due["r0"] - time.monotonic() == pytest.approx(300, abs=5)
+
+
+def test_unwanted_remotes_are_forgotten(backend_factory):
+    backend = backend_factory()
+    backend.mount_now("r0")
+    tuner = PollTuner(backend)
+    tuner.tick()
+    assert "r0" in tuner.rates
+    backend.unmount("r0")
+    tuner.tick()
+    assert tuner.rates == {} and tuner.due == {}
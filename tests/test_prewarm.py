@@ -0,0 +1,63 @@
+import os
+import threading
+
+from catmount.prewarm import Prewarmer, parse_paths
+
+
+def test_parse_paths():
+    assert parse_paths("Photos, /Docs/Work/ ;Music") == ["Photos", "Docs/Work", "Music"]
+    assert parse_paths("/") == [""]
+    assert parse_paths(None) == []
+
+
+def warmer(backend):
+    events, finished = [], threading.Event()
+
+    def progress(name, done, total, detail):
+        events.append((name, done, total, detail))
+        if detail.startswith(("done", "failed")):
+            finished.set()
+    backend.prewarmer.on_progress = progress
+    return events, finished
+
+
+def test_whole_subtrees_after_mount(backend_factory):
+    backend = backend_factory()
+    events, finished = warmer(backend)
+    backend.set_prewarm("r0", "Photos, Docs")
+    backend.mount_now("r0")
+    assert finished.wait(10)
+    assert [e[1:] for e in events[:2]] == [(1, 2, "Photos"), (2, 2, "Docs")]
+    assert events[-1][3].startswith("done in ")
+
+
+def test_depth_walks_the_listing_level_by_level(backend_factory):
+    backend = backend_factory(engine="rcd")
+    mountpoint = backend.mountpoints.allocate("r0")
+    for d in ("docs/a/deep", "docs/b"):
+        os.makedirs(os.path.join(mountpoint, d))
+    events, finished = warmer(backend)
+    backend.set_prewarm("r0", "docs", depth=2)
+    backend.mount_now("r0")
+    assert finished.wait(10)
+    assert [e[1:3] for e in events] == [(1, 1), (3, 3), (3, 3)]
+
+
+def test_unconfigured_remotes_are_skipped(backend_factory):
+    backend = backend_factory()
+    events, _ = warmer(backend)
+    backend.mount_now("r1")
+    assert not backend.prewarmer.submit("r1")
+    assert events == []
+
+
+def test_submit_never_lands_on_an_exiting_worker(backend_factory):
+    backend = backend_factory()
+    backend.mount_now("r0")
+    done = threading.Semaphore(0)
+    prewarmer = Prewarmer(backend, on_progress=lambda n, d, t, detail: detail.startswith("done") and done.release(),
+                          pause=0, idle=0.001)
+    prewarmer.configure("r0", "x")
+    for _ in range(200):
+        prewarmer.submit("r0")
+        assert done.acquire(timeout=5)
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from catmount import probe
+from catmount.probe import Prober, ProbeResult
+
+
+@pytest.mark.parametrize("engine", ["rcd", "process"])
+def test_probe_reachable_and_failing(backend_factory, fake, engine):
+    fake(fail=["r1"])
+    prober = Prober(backend_factory(engine=engine), timeout=5)
+    ok, bad = prober.probe("r0"), prober.probe("r1")
+    assert ok.ok and not ok.slow and ok.kind is None
+    assert (ok.free is not None) == (engine == "rcd")
+    assert not bad.ok and bad.kind == "network" and "timeout" in bad.error
+    assert str(bad) == "unreachable (network)"
+    assert prober.results == {"r0": ok, "r1": bad}
+
+
+def test_run_reports_each_result_then_all(backend_factory, fake):
+    fake(fail=["r2"])
+    prober = Prober(backend_factory(engine="rcd"), workers=2)
+    seen, done = [], []
+    thread = prober.run(["r0", "r1", "r2", "r0"], on_result=seen.append, on_done=done.append)
+    thread.join(30)
+    assert sorted(r.name for r in seen) == ["r0", "r1", "r2"]
+    assert done == [seen]
+    assert [r.name for r in seen if not r.ok] == ["r2"]
+
+
+def test_run_now_without_names():
+    done = []
+    assert Prober(None).run_now([], on_done=done.append) == []
+    assert done == [[]]
+
+
+def test_stale():
+    prober = Prober(None)
+    prober.results["fresh"] = ProbeResult("fresh", True)
+    prober.results["old"] = ProbeResult("old", True)
+    prober.results["old"].when = time.time() - 120
+    assert prober.stale(["fresh", "old", "never"], max_age=60) == ["old", "never"]
+
+
+def test_triage_puts_slow_last_and_skips_unreachable():
+    prober = Prober(None)
+    prober.results = {
+        "slow": ProbeResult("slow", True, rtt=probe.PROBE_SLOW + 1),
+        "fast": ProbeResult("fast", True, rtt=0.01),
+        "dead": ProbeResult("dead", False, kind="network"),
+    }
+    jobs = [("slow", 0), ("dead", 1), ("fast", 2), ("unprobed", 3)]
+    keep, skipped = prober.triage(jobs)
+    assert keep == [("fast", 0), ("unprobed", 1), ("slow", 2)]
+    assert [r.name for r in skipped] == ["dead"]
@@ -0,0 +1,49 @@
+import subprocess
+import sys
+import time
+
+from catmount.procmgr import stop_later, stop_processes
+
+STUBBORN = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print(flush=True); time.sleep(60)"
+
+
+def stubborn():
+    proc = subprocess.Popen([sys.executable, "-c", STUBBORN], stdout=subprocess.PIPE)
+    proc.stdout.readline()
+    return proc
+
+
+def test_stops_everyone_in_parallel(fake, tmp_path):
+    procs = [subprocess.Popen(["rclone", "mount", f"r{i}:", str(tmp_path / f"r{i}")]) for i in range(8)]
+    report = stop_processes(procs, timeout=5)
+    assert report.graceful == 8 and report.killed == 0
+    assert all(p.poll() is not None for p in procs)
+
+
+def test_kills_only_the_stragglers(fake, tmp_path):
+    polite = subprocess.Popen(["rclone", "mount", "r0:", str(tmp_path / "r0")])
+    procs = [polite, stubborn(), stubborn()]
+    start = time.monotonic()
+    report = stop_processes(procs, timeout=0.5)
+    # both stubborn ones waited out the same timeout, not one after the other
+    assert time.monotonic() - start < 1.5
+    assert (report.graceful, report.killed) == (1, 2)
+    assert [p.returncode for p in procs[1:]] == [-9, -9]
+    assert str(report).startswith("1 stopped, 2 killed in ")
+
+
+def test_extra_callables_run_alongside_and_report_errors():
+    ran = []
+
+    def boom():
+        raise RuntimeError("engine gone")
+    report = stop_processes([], extra=[lambda: ran.append(1), boom])
+    assert ran == [1]
+    assert report.errors == ["engine gone"]
+
+
+def test_stop_later_runs_then_after_the_exit(fake, tmp_path):
+    proc = subprocess.Popen(["rclone", "mount", "r0:", str(tmp_path / "r0")])
+    seen = []
+    stop_later(proc, then=lambda: seen.append(proc.poll())).join(10)
+    assert seen and seen[0] is not None
@@ -0,0 +1,71 @@
+import pytest
+
+from catmount import profiles
+from catmount.profiles import parse_duration, parse_size, vfs_opt
+
+MIB = 1024 ** 2
+
+
+@pytest.mark.parametrize("text, size", [
+    ("64M", 64 * MIB), ("1G", 1024 * MIB), ("512k", 512 * 1024), ("10", 10 * 1024),
+    ("100B", 100), ("1.5M", 3 * MIB // 2), ("2GiB", 2048 * MIB), ("off", -1), ("OFF", -1),
+])
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.mark.parametrize("text, ns", [
+    ("5m", 300 * 10 ** 9), ("1h30m", 5400 * 10 ** 9), ("500ms", 5 * 10 ** 8),
+    ("0", 0), ("0s", 0), ("1d", 86400 * 10 ** 9),
+])
+def test_parse_duration(text, ns):
+    assert parse_duration(text) == ns
+
+
+@pytest.mark.parametrize("bad", ["lots", "5 minutes", ""])
+def test_parse_rejects_garbage(bad):
+    with pytest.raises(ValueError):
+        parse_size(bad)
+    if bad:
+        with pytest.raises(ValueError):
+            parse_duration(bad)
+
+
+def test_vfs_opt_uses_rc_names_and_units():
+    opt = vfs_opt(profiles.PROFILES["streaming"])
+    assert opt["CacheMode"] == "full"
+    assert opt["ReadAhead"] == 256 * MIB
+    assert opt["CacheMaxSize"] == 10 * 1024 * MIB
+    assert opt["DirCacheTime"] == 30 * 60 * 10 ** 9
+    assert "BufferSize" not in opt
+    assert profiles.main_opt(profiles.PROFILES["streaming"]) == {
+        "BufferSize": 64 * MIB, "Transfers": 4, "Checkers": 8}
+
+
+def test_every_profile_converts():
+    for name in profiles.PROFILES:
+        assert set(vfs_opt(profiles.resolve(name))) == set(profiles.VFS_KEYS.values())
+    assert vfs_opt(profiles.resolve("default"))["CacheMaxSize"] == -1
+
+
+def test_auto_profile_splits_memory_between_mounts():
+    one = profiles.auto_profile(1, memory=8 * 1024 * MIB)
+    four = profiles.auto_profile(4, memory=8 * 1024 * MIB)
+    assert parse_size(one["cache_max_size"]) == 2048 * MIB
+    assert parse_size(four["cache_max_size"]) == 512 * MIB
+    assert parse_size(profiles.auto_profile(1000, memory=MIB)["cache_max_size"]) == 256 * MIB
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="unknown profile"):
+        profiles.resolve("turbo")
+
+
+def test_profile_reaches_the_mount_command(backend_factory):
+    backend = backend_factory()
+    backend.set_profile("r0", "streaming")
+    backend.mount_now("r0")
+    with open(f"/proc/{backend.mounts['r0'][1].pid}/cmdline", "rb") as f:
+        argv = f.read().decode().split("\0")
+    assert argv[argv.index("--vfs-read-ahead") + 1] == "256M"
+    assert argv[argv.index("--dir-cache-time") + 1] == "30m"
@@ -0,0 +1,77 @@
+from catmount import RamConfig
+from catmount.ramconfig import parse_ini, referenced_remotes
+
+
+def test_add_update_remove():
+    config = RamConfig()
+    config.add_remote("gd", "drive", token="t", chunk=8)
+    assert config.get_remote("gd") == {"type": "drive", "token": "t", "chunk": "8"}
+    config.update_remote("gd", token="new")
+    assert config.get_remote("gd")["token"] == "new"
+    assert "gd" in config and len(config) == 1
+    assert config.remove_remote("gd")
+    assert not config.remove_remote("gd")
+    assert config.get_remote("gd") is None
+
+
+def test_get_round_trips_and_is_cached():
+    config = RamConfig("[a]\ntype = s3\n\n; comment\n[b]\ntype = drive\ntoken = x\n")
+    text = config.get()
+    assert config.get() is text
+    assert parse_ini(text) == {"a": {"type": "s3"}, "b": {"type": "drive", "token": "x"}}
+    config.update_remote("a", region="eu")
+    assert "region = eu" in config.get()
+
+
+def test_merge_keeps_load_replaces():
+    config = RamConfig("[a]\ntype = s3\n")
+    assert config.merge("[b]\ntype = drive\n") == ["b"]
+    assert config.names() == ["a", "b"]
+    assert config.load("[c]\ntype = ftp\n") == ["c"]
+
+
+def layered():
+    config = RamConfig()
+    config.add_remote("gd", "drive", token="t")
+    config.add_remote("box", "dropbox")
+    config.add_remote("secret", "crypt", remote="gd:vault", password="p")
+    config.add_remote("both", "union", upstreams="secret: box:/photos")
+    config.add_remote("unrelated", "s3")
+    return config
+
+
+def test_referenced_remotes():
+    assert referenced_remotes({"type": "crypt", "remote": "gd:vault"}) == ["gd"]
+    assert referenced_remotes({"type": "alias", "remote": "/local/path"}) == []
+    assert referenced_remotes({"type": "crypt", "remote": ":s3:bucket"}) == []
+    assert referenced_remotes({"type": "combine", "upstreams": "a=gd: b=box:dir"}) == ["gd", "box"]
+
+
+def test_resolve_lists_dependencies_first():
+    config = layered()
+    assert config.resolve("gd") == ["gd"]
+    assert config.resolve("secret") == ["gd", "secret"]
+    assert config.resolve("both") == ["gd", "secret", "box", "both"]
+    assert config.resolve("missing") == []
+
+
+def test_resolve_survives_cycles():
+    config = RamConfig()
+    config.add_remote("a", "alias", remote="b:")
+    config.add_remote("b", "alias", remote="a:")
+    assert sorted(config.resolve("a")) == ["a", "b"]
+
+
+def test_scoped_holds_only_the_closure():
+    config = layered()
+    sections = parse_ini(config.scoped("secret"))
+    assert list(sections) == ["gd", "secret"]
+    assert sections["secret"]["remote"] == "gd:vault"
+
+
+def test_scoped_follows_changes():
+    config = layered()
+    first = config.scoped("secret")
+    assert config.scoped("secret") is first
+    config.update_remote("gd", token="new")
+    assert parse_ini(config.scoped("secret"))["gd"]["token"] == "new"
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from catmount import RcError
+from catmount.readiness import read_mountinfo
+
+
+def test_start_and_noop(engine):
+    assert engine.available
+    assert engine.client.call("rc/noop") == {}
+
+
+def test_password_stays_off_the_command_line(engine):
+    with open(f"/proc/{engine.proc.pid}/cmdline", "rb") as f:
+        argv = f.read().decode()
+    with open(f"/proc/{engine.proc.pid}/environ", "rb") as f:
+        env = f.read().decode()
+    assert "--rc-pass" not in argv
+    assert "RCLONE_RC_PASS=" in env
+
+
+def test_mount_list_unmount(engine, tmp_path):
+    mountpoint = str(tmp_path / "r0")
+    engine.mount("r0", mountpoint)
+    assert engine.synced.keys() == {"r0"}
+    assert [m["MountPoint"] for m in engine.list_mounts()] == [mountpoint]
+    assert os.path.abspath(mountpoint) in read_mountinfo()
+    engine.unmount(mountpoint)
+    assert engine.list_mounts() == []
+
+
+def test_errors_raise_rcerror(engine, fake, tmp_path):
+    with pytest.raises(RcError) as e:
+        engine.client.call("no/such-method")
+    assert e.value.method == "no/such-method"
+    with pytest.raises(RcError):
+        engine.unmount(str(tmp_path / "never-mounted"))
+
+
+def test_stop_quits_the_daemon(engine):
+    proc = engine.proc
+    engine.stop()
+    assert proc.poll() is not None
+    assert not engine.available
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from catmount import MountError, wait_ready
+from catmount.readiness import MOUNTINFO, is_served, rclone_mounts
+
+
+def add_line(source, mountpoint):
+    with open(MOUNTINFO, "a") as f:
+        f.write(f"36 25 0:52 / {mountpoint.replace(' ', chr(92) + '040')} rw - fuse.rclone {source} rw\n")
+
+
+def test_mountinfo_lines_are_unescaped(fake, tmp_path):
+    mountpoint = str(tmp_path / "My Drive")
+    assert not is_served(mountpoint)
+    add_line("gd:", mountpoint)
+    assert is_served(mountpoint)
+    assert rclone_mounts() == [("gd:", mountpoint)]
+
+
+def test_served_over_rc_needs_listmounts_and_mountinfo(engine, tmp_path):
+    mountpoint = str(tmp_path / "r0")
+    add_line("r0:", mountpoint)
+    assert not is_served(mountpoint, engine)
+    engine.mount("r0", mountpoint)
+    assert is_served(mountpoint, engine)
+
+
+def test_wait_ready_measures_a_real_mount(fake, tmp_path):
+    fake(delay=0.3)
+    mountpoint = str(tmp_path / "r0")
+    proc = subprocess.Popen(["rclone", "mount", "r0:", mountpoint])
+    try:
+        waited = wait_ready(mountpoint, proc=proc, timeout=10)
+    finally:
+        proc.terminate()
+        proc.wait()
+    assert 0.3 <= waited < 10
+
+
+def test_wait_ready_fails_when_rclone_exits(fake, tmp_path):
+    fake(fail=["r1"])
+    proc = subprocess.Popen(["rclone", "mount", "r1:", str(tmp_path / "r1")], stderr=subprocess.DEVNULL)
+    with pytest.raises(MountError, match="exited with code 5"):
+        wait_ready(str(tmp_path / "r1"), proc=proc, timeout=10)
+
+
+def test_wait_ready_times_out(fake, tmp_path):
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+    try:
+        with pytest.raises(MountError, match="not ready after 0.3s"):
+            wait_ready(os.path.join(tmp_path, "never"), proc=proc, timeout=0.3)
+    finally:
+        proc.kill()
+        proc.wait()
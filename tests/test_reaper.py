@@ -0,0 +1,53 @@
+import time
+
+from catmount import IdleReaper, MetricsCollector
+
+
+def reaper_for(backend, **kwargs):
+    states = []
+    metrics = MetricsCollector(backend)
+    reaper = IdleReaper(backend, metrics, on_state=lambda n, s, d: states.append((n, s)), **kwargs)
+    return reaper, metrics, states
+
+
+def test_idle_mounts_are_parked_in_place(backend_factory):
+    backend = backend_factory()
+    mountpoints = {n: backend.mount_now(n) for n in ("r0", "r1")}
+    reaper, metrics, states = reaper_for(backend, idle_after=0.1)
+    metrics.poll()
+    reaper.tick()
+    assert states == []
+    time.sleep(0.2)
+    reaper.tick()
+    assert sorted(states) == [("r0", "idle"), ("r1", "idle")]
+    assert backend.mounts == {} and backend.idle == {"r0", "r1"}
+    assert backend.mountpoints.get("r0") == mountpoints["r0"]
+    assert backend.mount_now("r0") == mountpoints["r0"]
+    assert backend.idle == {"r1"}
+
+
+def test_max_active_parks_the_least_recently_used(backend_factory):
+    backend = backend_factory()
+    for name in ("r0", "r1", "r2"):
+        backend.mount_now(name)
+    reaper, metrics, states = reaper_for(backend, idle_after=0, max_active=2)
+    metrics.poll()
+    reaper.last_active.update({"r0": 3.0, "r1": 1.0, "r2": 2.0})
+    reaper.tick()
+    assert states == [("r1", "idle")]
+    assert set(backend.mounts) == {"r0", "r2"}
+
+
+def test_keep_and_forget_policies(backend_factory):
+    backend = backend_factory()
+    backend.mount_now("r0")
+    backend.mount_now("r1")
+    reaper, metrics, states = reaper_for(backend, idle_after=0.1)
+    reaper.set_policy("r0", "keep")
+    reaper.set_policy("r1", "forget")
+    metrics.poll()
+    reaper.tick()
+    time.sleep(0.2)
+    reaper.tick()
+    assert states == [("r1", "forgotten")]
+    assert set(backend.mounts) == {"r0", "r1"}
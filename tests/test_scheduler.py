@@ -0,0 +1,33 @@
+import time
+
+from catmount import MountScheduler
+from catmount.readiness import read_mountinfo
+
+
+def test_mounts_in_priority_order_and_reports_failures(backend_factory, fake):
+    fake(fail=["r1"])
+    backend = backend_factory(3)
+    results = MountScheduler(backend, workers=1).run_now([("r2", 0), ("r1", 1), ("r0", 2)])
+    assert [r.name for r in results] == ["r2", "r1", "r0"]
+    assert [r.ok for r in results] == [True, False, True]
+    assert set(backend.mounts) == {"r0", "r2"}
+
+
+def test_deadline_undoes_late_mounts(backend_factory, fake):
+    fake(delay=1.0)
+    backend = backend_factory(3)
+    results = MountScheduler(backend, deadline=0.3).run_now([(f"r{i}", i) for i in range(3)])
+    assert [r.error for r in results] == ["deadline exceeded"] * 3
+    end = time.monotonic() + 10
+    while time.monotonic() < end and (backend.mounts or backend.mounting):
+        time.sleep(0.1)
+    time.sleep(0.5)
+    assert backend.mounts == {}
+    assert not read_mountinfo()
+
+
+def test_failed_remotes_are_no_longer_wanted(backend_factory, fake):
+    fake(fail=["r1"])
+    backend = backend_factory(3)
+    MountScheduler(backend).run_now([("r0", 0), ("r1", 1)])
+    assert backend.wanted == {"r0"}
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from catmount import MountSupervisor, classify
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("googleapi: Error 403: User Rate Limit Exceeded, userRateLimitExceeded", "ratelimit"),
+    ("HTTP error 429: too many requests", "ratelimit"),
+    ("dial tcp 142.250.0.1:443: i/o timeout", "network"),
+    ("Failed to create file system: HTTP 401 Unauthorized", "auth"),
+    ("couldn't fetch token: invalid_grant", "auth"),
+    ("didn't find section in config file", "config"),
+    ("403 Forbidden", "unknown"),
+])
+def test_classify_text(text, kind):
+    assert classify(None, text) == kind
+
+
+def test_classify_falls_back_to_exit_code():
+    assert classify(5) == "network"
+    assert classify(7) == "auth"
+    assert classify(2) == "unknown"
+
+
+def test_crashed_mount_comes_back_in_place(backend_factory):
+    backend = backend_factory()
+    mountpoint = backend.mount_now("r0")
+    states = []
+    supervisor = MountSupervisor(backend, on_state=lambda n, s, d: states.append(s), base_delay=0.01)
+    proc = backend.mounts["r0"][1]
+    proc.kill()
+    proc.wait()
+    supervisor.tick()
+    assert states == ["crashed"] and "r0" not in backend.mounts
+    time.sleep(0.02)
+    supervisor.tick()
+    end = time.monotonic() + 10
+    while "mounted" not in states and time.monotonic() < end:
+        time.sleep(0.05)
+    assert states == ["crashed", "restarting", "mounted"]
+    assert backend.mounts["r0"][0] == mountpoint
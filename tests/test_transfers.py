@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+from catmount import TransferQueue
+
+
+@pytest.fixture
+def queue(backend_factory, monkeypatch):
+    monkeypatch.setenv("FAKE_RCLONE_JOB_TIME", "0.3")
+    return TransferQueue(backend_factory(engine="process"), concurrency=1)
+
+
+def run_until_idle(queue, timeout=10):
+    end = time.monotonic() + timeout
+    while any(j.active for j in queue.jobs.values()) and time.monotonic() < end:
+        queue.tick()
+        time.sleep(0.05)
+
+
+def test_jobs_run_one_slot_at_a_time(queue):
+    first = queue.submit("copy", "r0:photos", "r1:backup")
+    second = queue.submit("sync", "r1:", " /tmp/mirror ")
+    queue.tick()
+    assert (first.state, second.state) == ("running", "queued")
+    assert second.dst == "/tmp/mirror"
+    run_until_idle(queue)
+    assert (first.state, second.state) == ("done", "done")
+    assert first.progress == 1.0 and first.bytes == 10 * 1024 ** 2
+    # a process-mode backend runs jobs on a private rcd, not the mounts'
+    assert queue.backend.engine is None and queue.backend.jobs_engine is not None
+
+
+def test_failed_and_retried(queue, fake):
+    fake(fail=["r2"])
+    job = queue.submit("move", "r2:gone", "r0:")
+    run_until_idle(queue)
+    assert (job.state, job.error) == ("failed", "directory not found")
+    assert queue.retry(job.id) and job.state == "queued" and job.error is None
+    queue.tick()
+    assert job.attempts == 2 and job.state == "running"
+
+
+def test_cancel_stops_the_rc_job(queue):
+    job = queue.submit("copy", "r0:", "r1:")
+    queue.tick()
+    assert queue.cancel(job.id)
+    assert not queue.cancel(job.id)
+    queue.tick()
+    assert job.state == "cancelled"
+    status = queue.backend.job_engine().client.call("job/status", jobid=job.jobid)
+    assert status["finished"] and status["error"] == "context canceled"
+
+
+def test_clear_finished_and_bad_kind(queue):
+    done = queue.submit("copy", "r0:", "r1:")
+    run_until_idle(queue)
+    waiting = queue.submit("copy", "r0:", "r1:")
+    queue.clear_finished()
+    assert list(queue.jobs) == [waiting.id] and done.id not in queue.jobs
+    with pytest.raises(ValueError):
+        queue.submit("mirror", "r0:", "r1:")
+
+
+def test_split_specs(queue):
+    assert queue.split("r0:photos/2024/") == ("r0:", "photos/2024")
+    assert queue.split("/home/me/file.txt") == ("/home/me", "file.txt")
+    assert queue.split("notaremote:x") == (".", "notaremote:x")
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from catmount import UiDispatcher
+
+
+class Loop:
+    """Just enough of Tk's after()/after_cancel() to run frames by hand"""
+
+    def __init__(self):
+        self.jobs = {}
+        self.next = 0
+
+    def after(self, ms, fn):
+        self.next += 1
+        self.jobs[self.next] = fn
+        return self.next
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+    def frame(self):
+        jobs, self.jobs = self.jobs, {}
+        for fn in jobs.values():
+            fn()
+
+
+def test_deltas_for_one_row_coalesce_into_one_update():
+    loop, batches = Loop(), []
+    ui = UiDispatcher(loop, batches.append).start()
+
+    def worker(i):
+        for k in range(100):
+            ui.post(f"r{i}", status=f"{k}")
+        ui.post(f"r{i}", probe="ok")
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    ui.post(None, message="done")
+    loop.frame()
+    expected = {f"r{i}": {"status": "99", "probe": "ok"} for i in range(8)}
+    expected[None] = {"message": "done"}
+    assert batches == [expected]
+
+
+def test_calls_run_after_the_frame_deltas():
+    loop, order = Loop(), []
+    ui = UiDispatcher(loop, lambda batch: order.append(("apply", sorted(batch)))).start()
+    ui.call(order.append, "call")
+    ui.post("r0", status="x")
+    loop.frame()
+    assert order == [("apply", ["r0"]), "call"]
+    loop.frame()
+    assert len(order) == 2
+
+
+def test_a_failing_frame_keeps_the_loop_alive():
+    loop, seen = Loop(), []
+
+    def apply(batch):
+        seen.append(batch)
+        if len(seen) == 1:
+            raise RuntimeError("widget gone")
+    ui = UiDispatcher(loop, apply).start()
+    ui.post("r0", status="a")
+    with pytest.raises(RuntimeError):
+        loop.frame()
+    ui.post("r0", status="b")
+    loop.frame()
+    assert seen[-1] == {"r0": {"status": "b"}}
+    ui.stop()
+    assert loop.jobs == {}